@@ -3,15 +3,23 @@
 import connexion
 import flask_cors
 from library import config
+from library.helpers import etag, page, server_timing
 
 app = connexion.FlaskApp(
     __name__,
     specification_dir="openapi/",
 )
 app.add_api("package.yaml", validate_responses=True)
+app.app.before_request(server_timing.start)
+app.app.after_request(server_timing.add_header)
 flask_cors.CORS(
     app.app,
     resources="*",
     origins=config.get().access_control_allow_origin,
     allow_headers=config.get().access_control_allow_headers,
+    expose_headers=[
+        page.NEXT_CURSOR_HEADER,
+        server_timing.SERVER_TIMING_HEADER,
+        etag.ETAG_HEADER,
+    ],
 )
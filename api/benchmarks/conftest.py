@@ -0,0 +1,152 @@
+"""Fixtures for the benchmarks."""
+
+import dataclasses
+import statistics
+import time
+import typing
+
+import pytest
+
+
+def pytest_addoption(parser):
+    """Add the benchmark options."""
+    group = parser.getgroup("benchmark")
+    group.addoption(
+        "--benchmark-schemas",
+        type=int,
+        default=500,
+        help="The number of schemas in the spec.",
+    )
+    group.addoption(
+        "--benchmark-rounds",
+        type=int,
+        default=5,
+        help="The number of times each function is called.",
+    )
+    group.addoption(
+        "--benchmark-s3-endpoint-url",
+        default="http://localhost:5000",
+        help="The URL of the local S3, for example, started using moto_server.",
+    )
+
+
+@dataclasses.dataclass
+class Result:
+    """
+    The outcome of benchmarking a function before and after an optimization.
+
+    Attrs:
+        before_kb: The size of the data before the optimization in KB.
+        after_kb: The size of the data after the optimization in KB.
+        before_ms: The median duration of a call before the optimization in
+            milliseconds.
+        after_ms: The median duration of a call after the optimization in
+            milliseconds.
+
+    """
+
+    before_kb: float
+    after_kb: float
+    before_ms: float
+    after_ms: float
+
+    @property
+    def speed_up(self) -> float:
+        """The factor by which the optimization is faster."""
+        return self.before_ms / self.after_ms
+
+
+_RESULTS: typing.Dict[str, Result] = {}
+
+
+def _time(func: typing.Callable[[], typing.Any], rounds: int) -> float:
+    """Calculate the median duration of calling a function in milliseconds."""
+    durations = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        func()
+        durations.append((time.perf_counter() - start) * 1000)
+    return statistics.median(durations)
+
+
+@pytest.fixture(scope="session")
+def benchmark(pytestconfig):
+    """Return a function that times a function after and before an optimization."""
+    rounds = pytestconfig.getoption("benchmark_rounds")
+
+    def run(
+        name: str,
+        func: typing.Callable[[], typing.Any],
+        *,
+        size: typing.Callable[[], int],
+        use_before: typing.Callable[[], typing.Any],
+    ) -> Result:
+        """
+        Time a function with the optimization and then without it.
+
+        Args:
+            name: The name of the benchmark.
+            func: The function to time.
+            size: Returns the size of the data the function works on in bytes.
+            use_before: Switches off the optimization.
+
+        Returns:
+            The outcome of the benchmark.
+
+        """
+        after_ms = _time(func, rounds)
+        after_kb = size() / 1024
+        use_before()
+        before_ms = _time(func, rounds)
+        result = Result(
+            before_kb=size() / 1024,
+            after_kb=after_kb,
+            before_ms=before_ms,
+            after_ms=after_ms,
+        )
+        _RESULTS[name] = result
+        return result
+
+    return run
+
+
+def pytest_terminal_summary(terminalreporter):
+    """Report the results."""
+    if not _RESULTS:
+        return
+
+    terminalreporter.section("benchmark results")
+    terminalreporter.write_line(
+        f"{'function':<24} {'before KB':>10} {'after KB':>10} {'before ms':>10} "
+        f"{'after ms':>10} {'speed-up':>9}"
+    )
+    for name, result in sorted(_RESULTS.items()):
+        terminalreporter.write_line(
+            f"{name:<24} {result.before_kb:>10.0f} {result.after_kb:>10.0f} "
+            f"{result.before_ms:>10.2f} {result.after_ms:>10.2f} "
+            f"{result.speed_up:>9.1f}"
+        )
+
+
+@pytest.fixture(scope="session")
+def spec_dict(pytestconfig):
+    """A large spec."""
+    schemas = {
+        f"Schema{idx}": {
+            "type": "object",
+            "x-tablename": f"schema_{idx}",
+            "description": f"The schema {idx} with a description of the schema.",
+            "properties": {
+                "id": {"type": "integer", "x-primary-key": True},
+                "name": {"type": "string", "maxLength": 255, "nullable": True},
+                "tags": {"type": "array", "items": {"type": "string"}},
+                "created_at": {"type": "string", "format": "date-time"},
+            },
+            "required": ["id", "name"],
+        }
+        for idx in range(pytestconfig.getoption("benchmark_schemas"))
+    }
+    return {
+        "info": {"title": "Benchmark", "version": "1.0.0"},
+        "components": {"schemas": schemas},
+    }
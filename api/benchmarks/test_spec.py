@@ -0,0 +1,42 @@
+"""Benchmarks for loading and preparing large specs."""
+
+import json
+
+import yaml
+from library.helpers import spec
+
+
+def test_load(benchmark, monkeypatch, spec_dict):
+    """
+    GIVEN large YAML spec
+    WHEN load is called with and without libyaml
+    THEN the spec is loaded faster with libyaml.
+    """
+    spec_str = yaml.dump(spec_dict)
+
+    result = benchmark(
+        "load",
+        lambda: spec.load(spec_str=spec_str, language="YAML"),
+        size=lambda: len(spec_str),
+        use_before=lambda: monkeypatch.setattr(spec, "_LOADER", yaml.SafeLoader),
+    )
+
+    assert result.speed_up > 1
+
+
+def test_prepare(benchmark, monkeypatch, spec_dict):
+    """
+    GIVEN large stored spec
+    WHEN prepare is called with and without libyaml
+    THEN the spec is prepared faster with libyaml.
+    """
+    spec_str = json.dumps(spec_dict, separators=(",", ":"))
+
+    result = benchmark(
+        "prepare",
+        lambda: spec.prepare(spec_str=spec_str, version="1.0.0"),
+        size=lambda: len(spec_str),
+        use_before=lambda: monkeypatch.setattr(spec, "_FAST_DUMPER", yaml.Dumper),
+    )
+
+    assert result.speed_up > 1
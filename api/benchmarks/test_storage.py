@@ -0,0 +1,119 @@
+"""Benchmarks for the storage."""
+
+import json
+from concurrent import futures
+
+import boto3
+import pytest
+from library.facades import storage
+from library.helpers import spec
+from open_alchemy.package_security import clients
+
+BUCKET = "benchmark"
+
+
+@pytest.fixture(scope="module")
+def s3_storage(pytestconfig):
+    """S3 storage that uses the local S3."""
+    storage_instance = storage.s3.Storage(BUCKET)
+    storage_instance.client = boto3.client(
+        "s3", endpoint_url=pytestconfig.getoption("benchmark_s3_endpoint_url")
+    )
+    storage_instance.client.create_bucket(Bucket=BUCKET)
+    return storage_instance
+
+
+def test_get(benchmark, s3_storage, spec_dict):
+    """
+    GIVEN large prepared spec stored with and without compression
+    WHEN get is called
+    THEN less data is transferred with compression.
+    """
+    key = "user/benchmark/1.0.0-spec.yaml"
+    value = spec.prepare(
+        spec_str=json.dumps(spec_dict, separators=(",", ":")), version="1.0.0"
+    )
+    s3_storage.set(key=key, value=value, compress=True)
+
+    result = benchmark(
+        "s3 get compressed",
+        lambda: s3_storage.get(key=key),
+        size=lambda: s3_storage.client.head_object(Bucket=BUCKET, Key=key)[
+            "ContentLength"
+        ],
+        use_before=lambda: s3_storage.set(key=key, value=value),
+    )
+
+    assert result.after_kb < result.before_kb
+
+
+def test_get_concurrent(benchmark, s3_storage, pytestconfig):
+    """
+    GIVEN spec stored and clients with the shared and the default configuration
+    WHEN get is called concurrently
+    THEN the durations are reported.
+    """
+    key = "user/benchmark/1.0.0-spec.json"
+    value = "spec str " * 1024
+    s3_storage.set(key=key, value=value)
+    endpoint_url = pytestconfig.getoption("benchmark_s3_endpoint_url")
+    s3_storage.client = boto3.client(
+        "s3", endpoint_url=endpoint_url, config=clients.CONFIG
+    )
+
+    def get_concurrent():
+        """Get the spec many times using more threads than the default pool size."""
+        with futures.ThreadPoolExecutor(
+            max_workers=clients.CONFIG.max_pool_connections
+        ) as executor:
+            return list(executor.map(lambda _: s3_storage.get(key=key), range(256)))
+
+    def use_default_client():
+        """Switch to a client with the default configuration."""
+        s3_storage.client = boto3.client("s3", endpoint_url=endpoint_url)
+
+    # Without TLS the local S3 is mostly limited by the server, the difference is
+    # larger against S3 where each discarded connection has to be set up again
+    assert get_concurrent() == [value] * 256
+    benchmark(
+        "s3 get concurrent",
+        get_concurrent,
+        size=lambda: len(value),
+        use_before=use_default_client,
+    )
+
+
+def test_memory_list(benchmark):
+    """
+    GIVEN memory storage with many specs
+    WHEN list is called with the prefix of a spec
+    THEN the index is faster than filtering every key.
+    """
+    storage_instance = storage.memory.Storage()
+    for user_idx in range(100):
+        for spec_idx in range(100):
+            for version_idx in range(5):
+                storage_instance.set(
+                    key=f"user {user_idx}/spec{spec_idx}/{version_idx}-spec.json",
+                    value="",
+                )
+    prefix = "user 50/spec50/"
+    list_prefix = [lambda: storage_instance.list(prefix=prefix, suffix="-spec.json")]
+
+    def use_filter():
+        """Filter every key which is how the keys were found before the index."""
+        list_prefix[0] = lambda: [
+            key
+            for key in storage_instance.storage
+            if key.startswith(prefix) and key.endswith("-spec.json")
+        ]
+
+    assert len(list_prefix[0]()) == 5
+    result = benchmark(
+        "memory list prefix",
+        lambda: list_prefix[0](),
+        size=lambda: sum(len(key) for key in storage_instance.storage),
+        use_before=use_filter,
+    )
+
+    assert result.after_ms < result.before_ms
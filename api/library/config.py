@@ -27,6 +27,7 @@ class TConfig:
         access_control_allow_origin: The CORS origin response.
         access_control_allow_headers: The CORS headers response.
         free_tier_model_count: The number of models allowed in the free tier.
+        spec_max_size: The maximum size of an uploaded spec in bytes.
 
     """
 
@@ -36,6 +37,7 @@ class TConfig:
     _access_control_allow_headers: typing.Optional[str] = None
     _default_credentials_id: typing.Optional[str] = None
     _free_tier_model_count: typing.Optional[int] = None
+    _spec_max_size: typing.Optional[int] = None
 
     @staticmethod
     def _get_env(key: str) -> str:
@@ -142,6 +144,27 @@ class TConfig:
         """Set the free_tier_model_count."""
         self._free_tier_model_count = value
 
+    @property
+    def spec_max_size(self) -> int:
+        """Retrieve the spec_max_size configuration."""
+        if self._spec_max_size is None:
+            spec_max_size_key = "SPEC_MAX_SIZE"
+            spec_max_size_str = self._get_env(spec_max_size_key)
+            try:
+                self._spec_max_size = int(spec_max_size_str)
+            except ValueError as exc:
+                raise AssertionError(
+                    f"the {spec_max_size_key} environment variable value must be an "
+                    f"integer, {spec_max_size_str=}"
+                ) from exc
+
+        return self._spec_max_size
+
+    @spec_max_size.setter
+    def spec_max_size(self, value: int) -> None:
+        """Set the spec_max_size."""
+        self._spec_max_size = value
+
 
 def _construct() -> TConfig:
     """Construct the configuration."""
@@ -6,7 +6,7 @@ from packaging import utils
 
 from ... import config
 from ... import types as library_types
-from . import exceptions, memory, s3, types
+from . import batch, encoding, exceptions, memory, s3, types
 
 
 def _construct_storage() -> types.TStorage:
@@ -30,6 +30,9 @@ class TCache(typing.TypedDict, total=True):
 
 _CACHE: TCache = {"storage": None}
 
+_SPEC_SUFFIX = "-spec.json"
+_PREPARED_SPEC_SUFFIX = "-spec.yaml"
+
 
 def get_storage() -> types.TStorage:
     """Return a facade for the storage."""
@@ -47,6 +50,48 @@ class _StorageFacade:
         """Calculate the id of a spec."""
         return utils.canonicalize_name(name)
 
+    @staticmethod
+    def _calc_prefix(
+        *, user: library_types.TUser, id_: library_types.TSpecId
+    ) -> types.TPrefix:
+        """Calculate the prefix of all objects of a spec, including the packages."""
+        return f"{user}/{id_}/"
+
+    @classmethod
+    def _calc_specs_prefix(
+        cls, *, user: library_types.TUser, id_: library_types.TSpecId
+    ) -> types.TPrefix:
+        """Calculate the prefix of the objects of a spec, excluding the packages."""
+        return f"{cls._calc_prefix(user=user, id_=id_)}specs/"
+
+    @classmethod
+    def _get_spec_object(
+        cls,
+        *,
+        user: library_types.TUser,
+        id_: library_types.TSpecId,
+        version: library_types.TSpecVersion,
+        suffix: types.TSuffix,
+    ) -> library_types.TSpecValue:
+        """
+        Retrieve an object of a version of a spec.
+
+        Raises ObjectNotFoundError if the object does not exist.
+
+        Args:
+            user: The user that owns the spec.
+            id_: The id of the spec.
+            version: The version of the spec.
+            suffix: The suffix of the object.
+
+        Returns:
+            The value of the object.
+
+        """
+        return get_storage().get(
+            key=f"{cls._calc_specs_prefix(user=user, id_=id_)}{version}{suffix}"
+        )
+
     @classmethod
     def create_update_spec(
         cls,
@@ -55,20 +100,35 @@ class _StorageFacade:
         name: library_types.TSpecName,
         version: library_types.TSpecVersion,
         spec_str: library_types.TSpecValue,
+        prepared_spec_str: typing.Optional[library_types.TSpecValue] = None,
     ) -> None:
         """
         Create or update a spec.
 
+        The prepared spec is stored first so that it exists once the value of the spec
+        triggers the build. It is compressed because it is only read by the API, the
+        value of the spec is read by the build which expects it to not be compressed.
+
+        Both are stored under the specs prefix.
+
         Args:
             user: The user that owns the spec.
             name: The display name of the spec.
             version: The version of the spec.
             spec_str: The value of the spec.
+            prepared_spec_str: The spec in the form that is returned to the user.
 
         """
         id_ = cls.cal_id(name)
+        specs_prefix = cls._calc_specs_prefix(user=user, id_=id_)
+        if prepared_spec_str is not None:
+            get_storage().set(
+                key=f"{specs_prefix}{version}{_PREPARED_SPEC_SUFFIX}",
+                value=prepared_spec_str,
+                compress=True,
+            )
         get_storage().set(
-            key=f"{user}/{id_}/{version}-spec.json",
+            key=f"{specs_prefix}{version}{_SPEC_SUFFIX}",
             value=spec_str,
         )
 
@@ -89,8 +149,35 @@ class _StorageFacade:
             version: The version of the spec.
 
         """
-        id_ = cls.cal_id(name)
-        return get_storage().get(key=f"{user}/{id_}/{version}-spec.json")
+        return cls._get_spec_object(
+            user=user, id_=cls.cal_id(name), version=version, suffix=_SPEC_SUFFIX
+        )
+
+    @classmethod
+    def get_prepared_spec(
+        cls,
+        *,
+        user: library_types.TUser,
+        name: library_types.TSpecName,
+        version: library_types.TSpecVersion,
+    ) -> library_types.TSpecValue:
+        """
+        Retrieve the spec in the form that is returned to the user.
+
+        Raises ObjectNotFoundError if the prepared spec was not stored.
+
+        Args:
+            user: The user that owns the spec.
+            name: The display name of the spec.
+            version: The version of the spec.
+
+        """
+        return cls._get_spec_object(
+            user=user,
+            id_=cls.cal_id(name),
+            version=version,
+            suffix=_PREPARED_SPEC_SUFFIX,
+        )
 
     @classmethod
     def delete_spec(
@@ -108,7 +195,7 @@ class _StorageFacade:
 
         """
         id_ = cls.cal_id(name)
-        delete_keys = get_storage().list(prefix=f"{user}/{id_}")
+        delete_keys = get_storage().list(prefix=cls._calc_prefix(user=user, id_=id_))
         if not delete_keys:
             raise exceptions.StorageError("no keys to delete")
         get_storage().delete_all(keys=delete_keys)
@@ -131,16 +218,17 @@ class _StorageFacade:
 
         """
         id_ = cls.cal_id(name)
-        prefix = f"{user}/{id_}/"
-        suffix = "-spec.json"
-        keys = get_storage().list(prefix=prefix, suffix=suffix)
+        specs_prefix = cls._calc_specs_prefix(user=user, id_=id_)
+        keys = get_storage().list(
+            prefix=specs_prefix, suffix=_SPEC_SUFFIX, delimiter="/"
+        )
 
         if not keys:
             raise exceptions.ObjectNotFoundError(
                 f"the spec with {id_=}, {name=} was not found"
             )
 
-        return list(map(lambda key: key[len(prefix) : -len(suffix)], keys))
+        return list(map(lambda key: key[len(specs_prefix) : -len(_SPEC_SUFFIX)], keys))
 
 
 _FACADE = _StorageFacade()
@@ -0,0 +1,54 @@
+"""Deletion of many objects in batches for the storage facade."""
+
+import typing
+from concurrent import futures
+
+from . import types
+
+# S3 accepts at most 1000 keys for each call to delete objects
+MAX_KEYS = 1000
+# The number of batches that are deleted at the same time
+MAX_WORKERS = 8
+
+
+def split(keys: types.TKeys) -> typing.List[types.TKeys]:
+    """
+    Split keys into batches that can be deleted with a single call.
+
+    Args:
+        keys: The keys to split.
+
+    Returns:
+        The batches with at most MAX_KEYS keys each.
+
+    """
+    return [keys[idx : idx + MAX_KEYS] for idx in range(0, len(keys), MAX_KEYS)]
+
+
+def delete_all(
+    *, keys: types.TKeys, delete_batch: typing.Callable[[types.TKeys], None]
+) -> None:
+    """
+    Delete the objects behind the keys in concurrent batches.
+
+    Any error raised whilst deleting a batch is raised after the other batches have
+    been deleted.
+
+    Args:
+        keys: The keys of the objects to delete.
+        delete_batch: Deletes the objects behind at most MAX_KEYS keys.
+
+    """
+    batches = split(keys)
+    if not batches:
+        return
+    if len(batches) == 1:
+        delete_batch(batches[0])
+        return
+
+    with futures.ThreadPoolExecutor(
+        max_workers=min(MAX_WORKERS, len(batches))
+    ) as executor:
+        batch_futures = [executor.submit(delete_batch, batch) for batch in batches]
+    for batch_future in batch_futures:
+        batch_future.result()
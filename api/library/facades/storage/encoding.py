@@ -0,0 +1,67 @@
+"""Encoding of the values of objects for the storage facade."""
+
+import gzip
+import typing
+
+from . import exceptions, types
+
+GZIP = "gzip"
+
+
+class TEncodedValue(typing.NamedTuple):
+    """
+    The value of an object as it is stored.
+
+    Attrs:
+        data: The encoded value.
+        content_encoding: The compression of the data, None if it is not compressed.
+
+    """
+
+    data: bytes
+    content_encoding: typing.Optional[str]
+
+
+def encode(*, value: types.TValue, compress: bool) -> TEncodedValue:
+    """
+    Encode a value to store it.
+
+    Args:
+        value: The value to encode.
+        compress: Whether to compress the value using gzip.
+
+    Returns:
+        The encoded value.
+
+    """
+    data = value.encode()
+    if not compress:
+        return TEncodedValue(data=data, content_encoding=None)
+    # The modification time is fixed so that the same value is always compressed to
+    # the same data
+    return TEncodedValue(
+        data=gzip.compress(data, compresslevel=6, mtime=0), content_encoding=GZIP
+    )
+
+
+def decode(*, data: bytes, content_encoding: typing.Optional[str]) -> types.TValue:
+    """
+    Decode a stored value.
+
+    Values that were stored without compression have no content encoding.
+
+    Raises StorageError if the content encoding is not supported.
+
+    Args:
+        data: The stored value.
+        content_encoding: The compression of the data.
+
+    Returns:
+        The decoded value.
+
+    """
+    if content_encoding is None:
+        return data.decode()
+    if content_encoding == GZIP:
+        return gzip.decompress(data).decode()
+    raise exceptions.StorageError(f"unsupported content encoding {content_encoding}")
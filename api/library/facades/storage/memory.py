@@ -1,8 +1,10 @@
 """Memory implementation for the storage facade."""
 
+import bisect
+import threading
 import typing
 
-from . import exceptions, types
+from . import batch, encoding, exceptions, types
 
 
 class Storage:
@@ -10,32 +12,53 @@ class Storage:
 
     def __init__(self) -> None:
         """Construct."""
-        self.storage: typing.Dict[types.TKey, types.TValue] = {}
+        self.storage: typing.Dict[types.TKey, encoding.TEncodedValue] = {}
+        # The keys in sorted order so that the keys with a prefix can be found using a
+        # binary search, kept consistent with the storage by set and delete
+        self._sorted_keys: types.TKeys = []
+        # The batches of delete_all are deleted concurrently
+        self._lock = threading.Lock()
 
     def list(
         self,
         prefix: typing.Optional[types.TPrefix] = None,
         suffix: typing.Optional[types.TSuffix] = None,
+        *,
+        delimiter: typing.Optional[types.TDelimiter] = None,
     ) -> types.TKeys:
         """
-        List available objects.
+        List available objects in sorted order.
+
+        The keys are returned in the same order as S3. Finding the keys with a prefix
+        takes O(log n + k) where n is the number of keys and k is the number of keys
+        with the prefix.
 
         Args:
             prefix: The prefix any keys must match.
             suffix: The suffix any keys must match.
+            delimiter: Keys that contain the delimiter after the prefix are not
+                returned, for example, to only list the keys in a folder.
 
         Returns:
-            All keys that match the prefix and suffix if they were supplied.
+            All keys that match the prefix, suffix and delimiter if they were
+            supplied.
 
         """
-        all_keys = self.storage.keys()
-        prefix_match_keys = filter(
-            lambda key: prefix is None or key.startswith(prefix), all_keys
-        )
-        prefix_suffix_match_keys = filter(
-            lambda key: suffix is None or key.endswith(suffix), prefix_match_keys
-        )
-        return list(prefix_suffix_match_keys)
+        prefix = prefix if prefix is not None else ""
+        with self._lock:
+            sorted_keys = self._sorted_keys
+            start = bisect.bisect_left(sorted_keys, prefix)
+            end = start
+            while end < len(sorted_keys) and sorted_keys[end].startswith(prefix):
+                end += 1
+            prefix_match_keys = sorted_keys[start:end]
+
+        return [
+            key
+            for key in prefix_match_keys
+            if (suffix is None or key.endswith(suffix))
+            and (delimiter is None or delimiter not in key[len(prefix) :])
+        ]
 
     def _check_exists(self, key: types.TKey) -> None:
         """
@@ -64,18 +87,28 @@ class Storage:
 
         """
         self._check_exists(key)
-        return self.storage[key]
+        encoded_value = self.storage[key]
+        return encoding.decode(
+            data=encoded_value.data, content_encoding=encoded_value.content_encoding
+        )
 
-    def set(self, *, key: types.TKey, value: types.TValue) -> None:
+    def set(
+        self, *, key: types.TKey, value: types.TValue, compress: bool = False
+    ) -> None:
         """
         Set the object at a key to a value.
 
         Args:
             key: The key to the object.
             value: The value to set the object to.
+            compress: Whether to store the value compressed using gzip.
 
         """
-        self.storage[key] = value
+        encoded_value = encoding.encode(value=value, compress=compress)
+        with self._lock:
+            if key not in self.storage:
+                bisect.insort(self._sorted_keys, key)
+            self.storage[key] = encoded_value
 
     def delete(self, *, key: types.TKey) -> None:
         """
@@ -87,16 +120,36 @@ class Storage:
             key: The key of the object to delete.
 
         """
-        self._check_exists(key)
-        del self.storage[key]
+        with self._lock:
+            self._check_exists(key)
+            del self.storage[key]
+            del self._sorted_keys[bisect.bisect_left(self._sorted_keys, key)]
 
-    def delete_all(self, *, keys: types.TKeys) -> None:
+    def _delete_batch(self, keys: types.TKeys) -> None:
         """
-        Delete the objects behind the keys.
+        Delete the objects behind at most batch.MAX_KEYS keys.
+
+        Raises StorageError if there are more keys, like S3 does.
 
         Args:
             keys: The keys of the objects to delete.
 
         """
+        if len(keys) > batch.MAX_KEYS:
+            raise exceptions.StorageError(
+                f"cannot delete more than {batch.MAX_KEYS} keys at once, {len(keys)=}"
+            )
         for key in keys:
             self.delete(key=key)
+
+    def delete_all(self, *, keys: types.TKeys) -> None:
+        """
+        Delete the objects behind the keys.
+
+        The keys are deleted in concurrent batches of at most batch.MAX_KEYS keys.
+
+        Args:
+            keys: The keys of the objects to delete.
+
+        """
+        batch.delete_all(keys=keys, delete_batch=self._delete_batch)
@@ -1,11 +1,23 @@
 """S3 implementation for the storage facade."""
 
+import random
+import time
 import typing
 
-import boto3
 from botocore import exceptions as botocore_exceptions
+from open_alchemy.package_security import clients
 
-from . import exceptions, types
+from . import batch, encoding, exceptions, types
+
+# The number of times deleting a key that returned an error is attempted
+DELETE_MAX_ATTEMPTS = 3
+# The upper bound in seconds of the pause before the second attempt, which is doubled
+# for every further attempt
+DELETE_BASE_BACKOFF = 0.1
+# The error codes for a key that can be resolved by deleting the key again
+DELETE_RETRYABLE_CODES = frozenset(
+    {"InternalError", "OperationAborted", "ServiceUnavailable", "SlowDown"}
+)
 
 
 class Storage:
@@ -14,39 +26,51 @@ class Storage:
     def __init__(self, bucket: str) -> None:
         """Construct."""
         self.bucket = bucket
-        self.client = boto3.client("s3")
+        self.client = clients.get("s3")
 
-    def _list_generator(self, prefix: str) -> typing.Generator[str, None, None]:
+    def _list_generator(
+        self,
+        prefix: types.TPrefix,
+        delimiter: typing.Optional[types.TDelimiter],
+    ) -> typing.Generator[str, None, None]:
         """Create key generator."""
         paginator = self.client.get_paginator("list_objects_v2")
-        for page in paginator.paginate(Bucket=self.bucket, Prefix=prefix):
-            try:
-                contents = page["Contents"]
-            except KeyError:
-                break
-
-            for obj in contents:
+        kwargs = {"Bucket": self.bucket, "Prefix": prefix}
+        if delimiter is not None:
+            kwargs["Delimiter"] = delimiter
+        for page in paginator.paginate(**kwargs):
+            # Pages can only have common prefixes when a delimiter is used
+            for obj in page.get("Contents", []):
                 yield obj["Key"]
 
     def list(
         self,
         prefix: typing.Optional[types.TPrefix] = None,
-        suffix: typing.Optional[types.TPrefix] = None,
+        suffix: typing.Optional[types.TSuffix] = None,
+        *,
+        delimiter: typing.Optional[types.TDelimiter] = None,
     ) -> types.TKeys:
         """
-        List available objects.
+        List available objects in sorted order.
+
+        The prefix and delimiter are applied by S3 so that only the pages with matching
+        keys are retrieved, the suffix is checked for those keys.
 
         Args:
             prefix: The prefix any keys must match.
             suffix: The suffix any keys must match.
+            delimiter: Keys that contain the delimiter after the prefix are not
+                returned, for example, to only list the keys in a folder.
 
         Returns:
-            All keys that match the prefix and suffix if they were supplied.
+            All keys that match the prefix, suffix and delimiter if they were
+            supplied.
 
         """
         try:
             prefix_keys = self._list_generator(
-                prefix=prefix if prefix is not None else ""
+                prefix=prefix if prefix is not None else "",
+                delimiter=delimiter,
             )
             prefix_suffix_keys = filter(
                 lambda key: suffix is None or key.endswith(suffix), prefix_keys
@@ -62,6 +86,8 @@ class Storage:
         """
         Get a seed by key.
 
+        Compressed objects are decompressed based on their content encoding.
+
         Raises ObjectNotFoundError if there is no object with that key.
 
         Args:
@@ -73,7 +99,10 @@ class Storage:
         """
         try:
             response = self.client.get_object(Bucket=self.bucket, Key=key)
-            return response["Body"].read().decode()
+            return encoding.decode(
+                data=response["Body"].read(),
+                content_encoding=response.get("ContentEncoding"),
+            )
         except botocore_exceptions.BotoCoreError as exc:
             raise exceptions.StorageError(
                 f"something went wrong when retriving key {key}"
@@ -83,17 +112,33 @@ class Storage:
                 f"could not find object at key {key}"
             ) from exc
 
-    def set(self, *, key: types.TKey, value: types.TValue) -> None:
+    def set(
+        self, *, key: types.TKey, value: types.TValue, compress: bool = False
+    ) -> None:
         """
         Set the object at a key to a value.
 
+        Compressed objects record the compression in their content encoding.
+
         Args:
             key: The key to the object.
             value: The value to set the object to.
+            compress: Whether to store the value compressed using gzip.
 
         """
+        encoded_value = encoding.encode(value=value, compress=compress)
+        content_encoding_kwargs = (
+            {"ContentEncoding": encoded_value.content_encoding}
+            if encoded_value.content_encoding is not None
+            else {}
+        )
         try:
-            self.client.put_object(Bucket=self.bucket, Key=key, Body=value.encode())
+            self.client.put_object(
+                Bucket=self.bucket,
+                Key=key,
+                Body=encoded_value.data,
+                **content_encoding_kwargs,
+            )
         except (
             botocore_exceptions.BotoCoreError,
             botocore_exceptions.ClientError,
@@ -121,22 +166,68 @@ class Storage:
                 f"could not find object at key {key}"
             ) from exc
 
+    def _delete_batch(self, keys: types.TKeys) -> None:
+        """
+        Delete the objects behind at most batch.MAX_KEYS keys.
+
+        Keys that S3 could not delete with a retryable error code are attempted again
+        after a pause with exponential backoff and full jitter.
+
+        Raises StorageError if any keys could not be deleted.
+
+        Args:
+            keys: The keys of the objects to delete.
+
+        """
+        failed_errors: typing.List[typing.Dict[str, str]] = []
+        retry_errors: typing.List[typing.Dict[str, str]] = []
+        for attempt in range(DELETE_MAX_ATTEMPTS):
+            if attempt > 0:
+                time.sleep(random.uniform(0, DELETE_BASE_BACKOFF * 2 ** (attempt - 1)))
+            try:
+                response = self.client.delete_objects(
+                    Bucket=self.bucket,
+                    Delete={"Objects": [{"Key": key} for key in keys], "Quiet": True},
+                )
+            except (
+                botocore_exceptions.BotoCoreError,
+                botocore_exceptions.ClientError,
+            ) as exc:
+                raise exceptions.StorageError(
+                    "something went wrong when deleting keys"
+                ) from exc
+
+            retry_errors = []
+            for error in response.get("Errors", []):
+                if error.get("Code") in DELETE_RETRYABLE_CODES:
+                    retry_errors.append(error)
+                else:
+                    failed_errors.append(error)
+            if not retry_errors:
+                break
+            keys = [error["Key"] for error in retry_errors]
+
+        errors = failed_errors + retry_errors
+        if not errors:
+            return
+
+        error_descriptions = ", ".join(
+            f"{error['Key']} ({error.get('Code')})" for error in errors
+        )
+        raise exceptions.StorageError(
+            f"something went wrong when deleting keys {error_descriptions}"
+        )
+
     def delete_all(self, *, keys: types.TKeys) -> None:
         """
         Delete the objects behind the keys.
 
+        The keys are deleted in concurrent batches of at most batch.MAX_KEYS keys.
+
+        Raises StorageError if any keys could not be deleted.
+
         Args:
             keys: The keys of the objects to delete.
 
         """
-        try:
-            self.client.delete_objects(
-                Bucket=self.bucket, Delete={"Objects": [{"Key": key} for key in keys]}
-            )
-        except (
-            botocore_exceptions.BotoCoreError,
-            botocore_exceptions.ClientError,
-        ) as exc:
-            raise exceptions.StorageError(
-                "something went wrong when deleting keys"
-            ) from exc
+        batch.delete_all(keys=keys, delete_batch=self._delete_batch)
@@ -5,6 +5,7 @@ import typing
 TKey = str
 TPrefix = str
 TSuffix = str
+TDelimiter = str
 TKeys = typing.List[TKey]
 TValue = str
 
@@ -16,16 +17,21 @@ class TStorage(typing.Protocol):
         self,
         prefix: typing.Optional[TPrefix] = None,
         suffix: typing.Optional[TSuffix] = None,
+        *,
+        delimiter: typing.Optional[TDelimiter] = None,
     ) -> TKeys:
         """
-        List available objects.
+        List available objects in sorted order.
 
         Args:
             prefix: The prefix any keys must match.
             suffix: The suffix any keys must match.
+            delimiter: Keys that contain the delimiter after the prefix are not
+                returned, for example, to only list the keys in a folder.
 
         Returns:
-            All keys that match the prefix and suffix if they were supplied.
+            All keys that match the prefix, suffix and delimiter if they were
+            supplied.
 
         """
         ...
@@ -45,13 +51,14 @@ class TStorage(typing.Protocol):
         """
         ...
 
-    def set(self, *, key: TKey, value: TValue) -> None:
+    def set(self, *, key: TKey, value: TValue, compress: bool = False) -> None:
         """
         Set the object at a key to a value.
 
         Args:
             key: The key to the object.
             value: The value to set the object to.
+            compress: Whether to store the value compressed using gzip.
 
         """
         ...
@@ -72,6 +79,10 @@ class TStorage(typing.Protocol):
         """
         Delete the objects behind the keys.
 
+        The keys are deleted in concurrent batches of at most batch.MAX_KEYS keys.
+
+        Raises StorageError if any keys could not be deleted.
+
         Args:
             keys: The keys of the objects to delete.
 
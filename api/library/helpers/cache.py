@@ -0,0 +1,79 @@
+"""In-process cache that is retained across requests by a warm container."""
+
+import collections
+import typing
+
+TKey = typing.TypeVar("TKey")
+TValue = typing.TypeVar("TValue")
+
+
+class LRUCache(typing.Generic[TKey, TValue]):
+    """
+    Least recently used cache with a maximum number of entries.
+
+    Attrs:
+        maxsize: The maximum number of entries in the cache.
+        hits: The number of lookups that returned a value.
+        misses: The number of lookups that did not return a value.
+        evictions: The number of entries removed to stay within maxsize.
+
+    """
+
+    def __init__(self, *, maxsize: int) -> None:
+        """Construct."""
+        assert maxsize > 0, f"maxsize must be greater than zero, {maxsize=}"
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries: "collections.OrderedDict[TKey, TValue]" = (
+            collections.OrderedDict()
+        )
+
+    def __len__(self) -> int:
+        """Return the number of entries."""
+        return len(self._entries)
+
+    def get(self, key: TKey) -> typing.Optional[TValue]:
+        """
+        Retrieve a value from the cache.
+
+        Args:
+            key: The key of the value.
+
+        Returns:
+            The value or None if it is not in the cache.
+
+        """
+        value = self._entries.get(key)
+        if value is None:
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def set(self, key: TKey, value: TValue) -> None:
+        """
+        Store a value in the cache.
+
+        Evicts the least recently used entry if the cache is full.
+
+        Args:
+            key: The key of the value.
+            value: The value to store.
+
+        """
+        self._entries[key] = value
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def clear(self) -> None:
+        """Remove all values and reset the counters."""
+        self._entries.clear()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
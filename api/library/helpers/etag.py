@@ -0,0 +1,104 @@
+"""Helper for conditional requests for specs using ETags."""
+
+import hashlib
+import typing
+
+from open_alchemy import package_database
+
+from .. import types
+from ..facades import server
+
+ETAG_HEADER = "ETag"
+IF_NONE_MATCH_HEADER = "If-None-Match"
+CACHE_CONTROL_HEADER = "Cache-Control"
+# The responses are for a particular user and a version of a spec can be updated, so
+# caches have to check whether a response is still valid using the ETag
+CACHE_CONTROL = "private, no-cache"
+
+
+def calc(
+    *, spec_info: package_database.types.TSpecInfo, version: types.TSpecVersion
+) -> str:
+    """
+    Calculate the strong ETag of a response with a version of a spec.
+
+    The ETag changes whenever the latest version of the spec is updated, which
+    includes any version of the spec being updated. The content hash is included
+    because specs can be updated more than once in the same second.
+
+    Args:
+        spec_info: The information about the latest version of the spec.
+        version: The version of the spec in the response.
+
+    Returns:
+        The ETag including the quotes.
+
+    """
+    components = (
+        version,
+        spec_info["version"],
+        str(spec_info["updated_at"]),
+        spec_info.get("content_hash", ""),
+    )
+    digest = hashlib.sha256("\0".join(components).encode()).hexdigest()
+    return f'"{digest[:32]}"'
+
+
+def get_if_none_match() -> typing.Optional[str]:
+    """Retrieve the If-None-Match header of the request, None if it is not set."""
+    return server.Request.request.headers.get(IF_NONE_MATCH_HEADER)
+
+
+def matches(*, if_none_match: str, etag: str) -> bool:
+    """
+    Check whether an If-None-Match header matches an ETag.
+
+    Uses the weak comparison, as required for If-None-Match.
+
+    Args:
+        if_none_match: The value of the If-None-Match header.
+        etag: The current ETag.
+
+    Returns:
+        Whether the ETag is one of the ETags in the header or the header is *.
+
+    """
+    if if_none_match.strip() == "*":
+        return True
+
+    def strip_weak(value: str) -> str:
+        """Remove the weak indicator from an ETag."""
+        return value[2:] if value.startswith("W/") else value
+
+    return any(strip_weak(value.strip()) == etag for value in if_none_match.split(","))
+
+
+def add_headers(response: server.Response, etag: str) -> server.Response:
+    """
+    Add the ETag and Cache-Control headers to a response.
+
+    Args:
+        response: The response to the request.
+        etag: The ETag of the response.
+
+    Returns:
+        The response with the headers.
+
+    """
+    response.headers[ETAG_HEADER] = etag
+    response.headers[CACHE_CONTROL_HEADER] = CACHE_CONTROL
+    return response
+
+
+def create_not_modified_response(etag: str) -> server.Response:
+    """
+    Create the response for when the version of the client is still valid.
+
+    Args:
+        etag: The ETag of the response.
+
+    Returns:
+        A 304 response without a body.
+
+    """
+    return add_headers(server.Response(status=304), etag)
@@ -1,5 +1,6 @@
 """Helper for managing the free tier."""
 
+import asyncio
 import typing
 
 from open_alchemy import package_database
@@ -7,34 +8,64 @@ from open_alchemy import package_database
 from .. import config, types
 
 
+async def _get_spec_model_count(
+    *, user: types.TUser, spec_name: types.TSpecName
+) -> types.TSpecModelCount:
+    """Retrieve the model count of a spec, 0 if it cannot be retrieved."""
+    try:
+        spec_info = await package_database.get_async().get_spec(
+            sub=user, name=spec_name
+        )
+        return spec_info["model_count"]
+    except package_database.exceptions.BaseError:
+        return 0
+
+
+async def _get_model_counts(
+    *, user: types.TUser, spec_name: types.TSpecName
+) -> typing.Tuple[types.TSpecModelCount, int]:
+    """Retrieve the model count of the spec and the user at the same time."""
+    spec_model_count, user_model_count = await asyncio.gather(
+        _get_spec_model_count(user=user, spec_name=spec_name),
+        package_database.get_async().count_customer_models(sub=user),
+    )
+    return spec_model_count, user_model_count
+
+
 def check_within_limit(
-    *, user: types.TUser, spec_name: types.TSpecName, model_count: types.TSpecModelCount
+    *,
+    user: types.TUser,
+    spec_name: types.TSpecName,
+    model_count: types.TSpecModelCount,
+    current_spec_model_count: typing.Optional[types.TSpecModelCount] = None,
 ) -> types.TResult:
     """
     Check whether adding a spec would exceed the free tier limit.
 
     Algorithm:
-        1. retrieve the information for the spec,
-        2. retrieve the model count for the user and
-        3. return whether the user model count plus the new model count minus the
+        1. if the existing model count of the spec is not passed, retrieve the
+            information for the spec and, at the same time, the model count for the
+            user, otherwise only retrieve the model count for the user and
+        2. return whether the user model count plus the new model count minus the
             existing model count would exceed the free tier.
 
     Args:
         user: The user to run the check for
         spec_name: The name of the spec
         model_count: The new model count of the spec
+        current_spec_model_count: The model count of the latest version of the spec
+            if the caller already retrieved it, 0 if the spec does not exist
 
     Returns:
         The result and the reason if the result is true.
 
     """
-    current_spec_model_count = 0
-    try:
-        spec_info = package_database.get().get_spec(sub=user, name=spec_name)
-        current_spec_model_count = spec_info["model_count"]
-    except package_database.exceptions.BaseError:
-        pass
-    user_model_count = package_database.get().count_customer_models(sub=user)
+    if current_spec_model_count is None:
+        current_spec_model_count, user_model_count = package_database.asynchronous.run(
+            _get_model_counts(user=user, spec_name=spec_name)
+        )
+    else:
+        user_model_count = package_database.get().count_customer_models(sub=user)
 
     new_user_model_count = user_model_count + model_count - current_spec_model_count
 
@@ -0,0 +1,33 @@
+"""Helper for responding with a page of items."""
+
+import json
+
+from open_alchemy import package_database
+
+from ..facades import server
+
+DEFAULT_LIMIT = 20
+NEXT_CURSOR_HEADER = "X-NEXT-CURSOR"
+
+
+def create_response(page: package_database.types.TSpecInfoPage) -> server.Response:
+    """
+    Create the response for a page of items.
+
+    Args:
+        page: The items and the cursor for the next page.
+
+    Returns:
+        The items as JSON with the cursor in the NEXT_CURSOR_HEADER header if there
+        is a next page.
+
+    """
+    headers = {}
+    if page.cursor is not None:
+        headers[NEXT_CURSOR_HEADER] = page.cursor
+    return server.Response(
+        json.dumps(page.items),
+        status=200,
+        mimetype="application/json",
+        headers=headers,
+    )
@@ -0,0 +1,51 @@
+"""Helper for reporting the use of the database by a request."""
+
+import json
+import logging
+
+import flask
+from open_alchemy import package_database
+
+from ..facades import server
+
+SERVER_TIMING_HEADER = "Server-Timing"
+
+_LOGGER = logging.getLogger(__name__)
+
+
+def start() -> None:
+    """Start recording the use of the database by the request."""
+    package_database.instrumentation.start_summary()
+
+
+def add_header(response: server.Response) -> server.Response:
+    """
+    Report the use of the database by the request.
+
+    The use is only recorded if the instrumentation of the database facade is
+    enabled. If it is, the summary is logged with the request and added to the
+    response in the Server-Timing header.
+
+    Args:
+        response: The response to the request.
+
+    Returns:
+        The response with the Server-Timing header if the use was recorded.
+
+    """
+    summary = package_database.instrumentation.end_summary()
+    if summary is None or not summary.methods:
+        return response
+
+    response.headers[SERVER_TIMING_HEADER] = summary.server_timing()
+    _LOGGER.info(
+        "database use %s",
+        json.dumps(
+            {
+                "method": flask.request.method,
+                "path": flask.request.path,
+                **summary.to_dict(),
+            }
+        ),
+    )
+    return response
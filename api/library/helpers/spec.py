@@ -1,28 +1,42 @@
 """Helpers for spec."""
 
 import dataclasses
+import hashlib
 import json
+import re
 import typing
 
 import open_alchemy
 import yaml
 from open_alchemy import build
 from packaging import version as packaging_version
-from yaml import parser, scanner
+from yaml import parser, reader, scanner
 
 from .. import exceptions, types
+from ..facades import storage
+from . import cache
 
 TSpec = typing.Dict[str, typing.Any]
 
+# libyaml is much faster than the pure Python implementation, PyYAML may have been
+# installed without it
+_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+_FAST_DUMPER = getattr(yaml, "CSafeDumper", yaml.Dumper)
+# libyaml breaks long double quoted strings at different positions, strings that
+# match are double quoted and empty strings are dumped differently as keys
+_DOUBLE_QUOTED_PATTERN = re.compile(r"[^\x20-\x7e\n]| \n|\n ")
 
-def load(*, spec_str: str, language: str) -> TSpec:
+
+def load(*, spec_str: typing.Union[str, bytes], language: str) -> TSpec:
     """
     Load the spec from a string using a particular language.
 
+    Bytes are loaded without decoding them first.
+
     Raises LoadSpecError if loading the spec fails.
 
     Args:
-        spec_str: The string of the spec.
+        spec_str: The string or UTF-8 encoded bytes of the spec.
         language: The language to use for loading.
 
     Returns:
@@ -31,13 +45,13 @@ def load(*, spec_str: str, language: str) -> TSpec:
     """
     if language == "YAML":
         try:
-            return yaml.safe_load(spec_str)
-        except (parser.ParserError, scanner.ScannerError) as exc:
+            return yaml.load(spec_str, Loader=_LOADER)
+        except (parser.ParserError, reader.ReaderError, scanner.ScannerError) as exc:
             raise exceptions.LoadSpecError("body must be valid YAML") from exc
     elif language == "JSON":
         try:
             return json.loads(spec_str)
-        except json.JSONDecodeError as exc:
+        except (json.JSONDecodeError, UnicodeDecodeError) as exc:
             raise exceptions.LoadSpecError("body must be valid JSON") from exc
 
     raise exceptions.LoadSpecError(
@@ -45,7 +59,24 @@ def load(*, spec_str: str, language: str) -> TSpec:
     )
 
 
-@dataclasses.dataclass
+def calc_content_hash(*, spec_bytes: bytes, language: str) -> str:
+    """
+    Calculate the hash of the content of a spec.
+
+    The language is included because it changes how the spec is processed.
+
+    Args:
+        spec_bytes: The spec as it was received.
+        language: The language of the spec.
+
+    Returns:
+        The SHA-256 hex digest of the language and the spec.
+
+    """
+    return hashlib.sha256(language.encode() + b"\0" + spec_bytes).hexdigest()
+
+
+@dataclasses.dataclass(frozen=True)
 class TSpecInfo:
     """
     Key information about a spec.
@@ -83,15 +114,69 @@ def calc_version(value: types.TSpecVersion) -> str:
         return str(int.from_bytes(value[0:5].encode(), "big"))
 
 
-def process(*, spec_str: str, language: str) -> TSpecInfo:
+def _defines_tablename(schema: TSpec) -> bool:
+    """Check whether a schema, or any schema it is composed of, has an x-tablename."""
+    return "x-tablename" in schema or any(
+        _defines_tablename(sub_schema) for sub_schema in schema.get("allOf", [])
+    )
+
+
+def calc_model_count(*, schemas: TSpec) -> int:
+    """
+    Calculate the number of models in the schemas.
+
+    A schema is a model if it defines its own table. Only the schema and the schemas in
+    its allOf are checked, references are not followed so that a schema that inherits
+    the table of its parent using x-inherits is not counted.
+
+    Args:
+        schemas: The schemas of the spec.
+
+    Returns:
+        The number of schemas that define an x-tablename.
+
+    """
+    return sum(1 for schema in schemas.values() if _defines_tablename(schema))
+
+
+# Processing is pure so the results are cached to skip validating the same spec again,
+# for example, when an upload is retried
+PROCESS_CACHE: cache.LRUCache[str, TSpecInfo] = cache.LRUCache(maxsize=32)
+
+
+def process(
+    *,
+    spec_str: typing.Union[str, bytes],
+    language: str,
+    content_hash: typing.Optional[str] = None,
+) -> TSpecInfo:
     """
     Check that the spec is valid and calculates the version.
 
+    Results are cached by the hash of the content, specs that are not valid are not
+    cached.
+
     Args:
-        spec_str: The string to process.
+        spec_str: The string or UTF-8 encoded bytes to process.
         language: The language of the spec, either YAML or JSON.
+        content_hash: The hash of the content if the caller already calculated it
+            using calc_content_hash.
 
     """
+    if content_hash is None:
+        spec_bytes = spec_str.encode() if isinstance(spec_str, str) else spec_str
+        content_hash = calc_content_hash(spec_bytes=spec_bytes, language=language)
+    cached_spec_info = PROCESS_CACHE.get(content_hash)
+    if cached_spec_info is not None:
+        return cached_spec_info
+
+    spec_info = _process(spec_str=spec_str, language=language)
+    PROCESS_CACHE.set(content_hash, spec_info)
+    return spec_info
+
+
+def _process(*, spec_str: typing.Union[str, bytes], language: str) -> TSpecInfo:
+    """Check that the spec is valid and calculates the version without the cache."""
     spec = load(spec_str=spec_str, language=language)
     try:
         schemas = build.get_schemas(spec=spec)
@@ -101,7 +186,7 @@ def process(*, spec_str: str, language: str) -> TSpecInfo:
 
     version = calc_version(spec_info.version)
 
-    model_count = spec_info.spec_str.count('"x-tablename":')
+    model_count = calc_model_count(schemas=schemas)
 
     return TSpecInfo(
         spec_str=spec_info.spec_str,
@@ -131,4 +216,61 @@ def prepare(*, spec_str: str, version: str) -> str:
     if "info" in spec:
         info = {**info, **spec["info"]}
     components = spec["components"]
-    return yaml.dump({"info": info}) + yaml.dump({"components": components})
+    dumper = _FAST_DUMPER if _is_fast_dumpable([info, components]) else yaml.Dumper
+    return yaml.dump({"info": info}, Dumper=dumper) + yaml.dump(
+        {"components": components}, Dumper=dumper
+    )
+
+
+def _is_fast_dumpable(value: typing.Any, *, is_key: bool = False) -> bool:
+    """
+    Check whether the fast dumper produces the same output as the default dumper.
+
+    Args:
+        value: The value to check, including any nested values.
+        is_key: Whether the value is the key of a dictionary.
+
+    Returns:
+        Whether none of the strings are dumped differently.
+
+    """
+    if isinstance(value, str):
+        if is_key and not value:
+            return False
+        return _DOUBLE_QUOTED_PATTERN.search(value) is None
+    if isinstance(value, dict):
+        return all(
+            _is_fast_dumpable(key, is_key=True) and _is_fast_dumpable(nested_value)
+            for key, nested_value in value.items()
+        )
+    if isinstance(value, list):
+        return all(_is_fast_dumpable(nested_value) for nested_value in value)
+    return True
+
+
+def read_prepared(
+    *, user: types.TUser, name: types.TSpecName, version: types.TSpecVersion
+) -> str:
+    """
+    Read the spec in the form that is returned to the user from the storage.
+
+    Specs that were stored without the prepared spec are prepared from the stored
+    spec.
+
+    Raises ObjectNotFoundError if the spec does not exist.
+
+    Args:
+        user: The user that owns the spec.
+        name: The display name of the spec.
+        version: The version of the spec.
+
+    Returns:
+        The spec in a user friendly form.
+
+    """
+    storage_facade = storage.get_storage_facade()
+    try:
+        return storage_facade.get_prepared_spec(user=user, name=name, version=version)
+    except storage.exceptions.ObjectNotFoundError:
+        spec_str = storage_facade.get_spec(user=user, name=name, version=version)
+        return prepare(spec_str=spec_str, version=version)
@@ -1,30 +1,56 @@
 """Handle specs endpoint."""
 
 import json
+import typing
 
 from open_alchemy import package_database
 
-from .. import exceptions, types
+from .. import config, exceptions, types
 from ..facades import server, storage
-from ..helpers import free_tier, spec
+from ..helpers import etag, free_tier, page, spec
 
 
-def list_(user: types.TUser) -> server.Response:
+def list_(
+    user: types.TUser,
+    limit: typing.Optional[int] = None,
+    cursor: typing.Optional[str] = None,
+) -> server.Response:
     """
-    Accept a spec and store it.
+    List the available specs for a user.
+
+    If neither limit nor cursor is passed, all specs are returned. Otherwise a page of
+    specs is returned and the cursor for the next page is returned in the
+    X-NEXT-CURSOR header.
 
     Args:
         user: The user from the token.
+        limit: The maximum number of specs to return.
+        cursor: The cursor returned with the previous page.
 
     Returns:
         The response to the request.
 
     """
     try:
+        if limit is None and cursor is None:
+            return server.Response(
+                json.dumps(package_database.get().list_specs(sub=user)),
+                status=200,
+                mimetype="application/json",
+            )
+
+        return page.create_response(
+            package_database.get().list_specs_page(
+                sub=user,
+                limit=limit if limit is not None else page.DEFAULT_LIMIT,
+                cursor=cursor,
+            )
+        )
+    except package_database.exceptions.InvalidCursorError:
         return server.Response(
-            json.dumps(package_database.get().list_specs(sub=user)),
-            status=200,
-            mimetype="application/json",
+            f"the cursor is not valid, {cursor=}",
+            status=400,
+            mimetype="text/plain",
         )
     except package_database.exceptions.BaseError:
         return server.Response(
@@ -38,6 +64,9 @@ def get(spec_name: types.TSpecId, user: types.TUser) -> server.Response:
     """
     Retrieve a spec for a user.
 
+    Returns 304 without reading the spec from the storage if the If-None-Match header
+    matches the ETag of the latest version of the spec.
+
     Args:
         spec_name: The id of the spec.
         user: The user from the token.
@@ -47,21 +76,30 @@ def get(spec_name: types.TSpecId, user: types.TUser) -> server.Response:
 
     """
     try:
-        version = package_database.get().get_latest_spec_version(
-            sub=user, name=spec_name
-        )
-        spec_str = storage.get_storage_facade().get_spec(
+        # The spec info includes the latest version
+        spec_info = package_database.get().get_spec(sub=user, name=spec_name)
+        version = spec_info["version"]
+
+        spec_etag = etag.calc(spec_info=spec_info, version=version)
+        if_none_match = etag.get_if_none_match()
+        if if_none_match is not None and etag.matches(
+            if_none_match=if_none_match, etag=spec_etag
+        ):
+            return etag.create_not_modified_response(spec_etag)
+
+        prepared_spec_str = spec.read_prepared(
             user=user, name=spec_name, version=version
         )
-        prepared_spec_str = spec.prepare(spec_str=spec_str, version=version)
-        spec_info = package_database.get().get_spec(sub=user, name=spec_name)
 
         response_data = json.dumps({**spec_info, "value": prepared_spec_str})
 
-        return server.Response(
-            response_data,
-            status=200,
-            mimetype="application/json",
+        return etag.add_headers(
+            server.Response(
+                response_data,
+                status=200,
+                mimetype="application/json",
+            ),
+            spec_etag,
         )
     except package_database.exceptions.NotFoundError:
         return server.Response(
@@ -89,14 +127,27 @@ def get(spec_name: types.TSpecId, user: types.TUser) -> server.Response:
         )
 
 
-def put(
-    body: bytearray, spec_name: types.TSpecId, user: types.TUser
-) -> server.Response:
+def _get_latest_spec_info(
+    *, user: types.TUser, spec_name: types.TSpecId
+) -> typing.Optional[package_database.types.TSpecInfo]:
+    """Retrieve the information about the latest version of a spec, None if missing."""
+    try:
+        return package_database.get().get_spec(sub=user, name=spec_name)
+    except package_database.exceptions.NotFoundError:
+        return None
+
+
+def put(body: bytes, spec_name: types.TSpecId, user: types.TUser) -> server.Response:
     """
     Accept a spec and store it.
 
+    If the content of the spec has not changed since the latest version, nothing is
+    done. The latest version is only read once, it is also used to check the free
+    tier and as the expected state of the spec when the database is updated.
+
     Returns 400 if the spec is not valid.
     Returns 402 if the free tier is exceeded.
+    Returns 413 if the spec is larger than the maximum size.
     Returns 500 if something went wrong.
 
     Args:
@@ -108,15 +159,40 @@ def put(
         The response to the request.
 
     """
+    # Reject large specs before doing anything else with them
+    spec_max_size = config.get().spec_max_size
+    if len(body) > spec_max_size:
+        return server.Response(
+            f"the spec is larger than the maximum of {spec_max_size} bytes",
+            status=413,
+            mimetype="text/plain",
+        )
+
     language = server.Request.request.headers["X-LANGUAGE"]
+    content_hash = spec.calc_content_hash(spec_bytes=body, language=language)
 
     try:
+        # Skip the spec if the latest version was created from the same content
+        latest_spec_info = _get_latest_spec_info(user=user, spec_name=spec_name)
+        if (
+            latest_spec_info is not None
+            and latest_spec_info.get("content_hash") == content_hash
+        ):
+            return server.Response(status=204)
+
         # Check whether spec is valid
-        spec_info = spec.process(spec_str=body.decode(), language=language)
+        spec_info = spec.process(
+            spec_str=body, language=language, content_hash=content_hash
+        )
 
         # Check that the maximum number of models hasn't been exceeded
         within_free_tier_result = free_tier.check_within_limit(
-            user=user, spec_name=spec_name, model_count=spec_info.model_count
+            user=user,
+            spec_name=spec_name,
+            model_count=spec_info.model_count,
+            current_spec_model_count=(
+                latest_spec_info["model_count"] if latest_spec_info is not None else 0
+            ),
         )
         if not within_free_tier_result.value:
             return server.Response(
@@ -131,6 +207,9 @@ def put(
             name=spec_name,
             version=spec_info.version,
             spec_str=spec_info.spec_str,
+            prepared_spec_str=spec.prepare(
+                spec_str=spec_info.spec_str, version=spec_info.version
+            ),
         )
 
         # Write an update into the database
@@ -141,6 +220,8 @@ def put(
             title=spec_info.title,
             description=spec_info.description,
             model_count=spec_info.model_count,
+            content_hash=content_hash,
+            previous_spec_info=latest_spec_info,
         )
 
         return server.Response(status=204)
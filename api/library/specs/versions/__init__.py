@@ -1,33 +1,56 @@
 """Handle specs versions endpoint."""
 
+import asyncio
 import json
+import typing
 
 from open_alchemy import package_database
 
-from ... import exceptions, types
+from ... import config, exceptions, types
 from ...facades import server, storage
-from ...helpers import free_tier, spec
+from ...helpers import etag, free_tier, page, spec
 
 
-def list_(spec_name: types.TSpecId, user: types.TUser) -> server.Response:
+def list_(
+    spec_name: types.TSpecId,
+    user: types.TUser,
+    limit: typing.Optional[int] = None,
+    cursor: typing.Optional[str] = None,
+) -> server.Response:
     """
-    List all available versions of a spec.
+    List the available versions of a spec.
+
+    If neither limit nor cursor is passed, all versions are returned. Otherwise a
+    page of versions is returned newest first and the cursor for the next page is
+    returned in the X-NEXT-CURSOR header.
 
     Args:
         spec_name: The id of the spec.
         user: The user from the token.
+        limit: The maximum number of versions to return.
+        cursor: The cursor returned with the previous page.
 
     Returns:
         The response to the request.
 
     """
     try:
-        return server.Response(
-            json.dumps(
-                package_database.get().list_spec_versions(sub=user, name=spec_name)
-            ),
-            status=200,
-            mimetype="application/json",
+        if limit is None and cursor is None:
+            return server.Response(
+                json.dumps(
+                    package_database.get().list_spec_versions(sub=user, name=spec_name)
+                ),
+                status=200,
+                mimetype="application/json",
+            )
+
+        return page.create_response(
+            package_database.get().list_spec_versions_page(
+                sub=user,
+                name=spec_name,
+                limit=limit if limit is not None else page.DEFAULT_LIMIT,
+                cursor=cursor,
+            )
         )
     except package_database.exceptions.NotFoundError:
         return server.Response(
@@ -35,6 +58,12 @@ def list_(spec_name: types.TSpecId, user: types.TUser) -> server.Response:
             status=404,
             mimetype="text/plain",
         )
+    except package_database.exceptions.InvalidCursorError:
+        return server.Response(
+            f"the cursor is not valid, {cursor=}",
+            status=400,
+            mimetype="text/plain",
+        )
     except package_database.exceptions.BaseError:
         return server.Response(
             "something went wrong whilst reading from the database",
@@ -43,12 +72,54 @@ def list_(spec_name: types.TSpecId, user: types.TUser) -> server.Response:
         )
 
 
+async def _read_spec(
+    *, user: types.TUser, spec_name: types.TSpecId, version: types.TSpecVersion
+) -> typing.Tuple[str, package_database.types.TSpecInfo]:
+    """
+    Read the prepared value of a version of a spec and the information about the spec.
+
+    The value is read from storage, on the thread pool shared with the database, at
+    the same time as the information is read from the database. If both fail, the
+    storage error is raised which is the same as reading one after the other.
+
+    Args:
+        user: The user from the token.
+        spec_name: The id of the spec.
+        version: The version of the spec.
+
+    Returns:
+        The prepared value of the version of the spec and the information about the
+        spec.
+
+    """
+    results: typing.Tuple[
+        typing.Union[str, BaseException],
+        typing.Union[package_database.types.TSpecInfo, BaseException],
+    ] = await asyncio.gather(
+        package_database.asynchronous.run_in_executor(
+            spec.read_prepared, user=user, name=spec_name, version=version
+        ),
+        package_database.get_async().get_spec(sub=user, name=spec_name),
+        return_exceptions=True,
+    )
+    prepared_spec_str, spec_info = results
+    if isinstance(prepared_spec_str, BaseException):
+        raise prepared_spec_str
+    if isinstance(spec_info, BaseException):
+        raise spec_info
+    return prepared_spec_str, spec_info
+
+
 def get(
     spec_name: types.TSpecId, version: types.TSpecVersion, user: types.TUser
 ) -> server.Response:
     """
     Retrieve a version of a spec for a user.
 
+    If the If-None-Match header is set, the database is read first and 304 is returned
+    without reading the spec from the storage if the header matches the ETag.
+    Otherwise the database and storage are read at the same time.
+
     Args:
         spec_name: The id of the spec.
         version: The version of the spec.
@@ -59,18 +130,30 @@ def get(
 
     """
     try:
-        spec_str = storage.get_storage_facade().get_spec(
-            user=user, name=spec_name, version=version
-        )
-        prepared_spec_str = spec.prepare(spec_str=spec_str, version=version)
-        spec_info = package_database.get().get_spec(sub=user, name=spec_name)
+        if_none_match = etag.get_if_none_match()
+        if if_none_match is None:
+            prepared_spec_str, spec_info = package_database.asynchronous.run(
+                _read_spec(user=user, spec_name=spec_name, version=version)
+            )
+            version_etag = etag.calc(spec_info=spec_info, version=version)
+        else:
+            spec_info = package_database.get().get_spec(sub=user, name=spec_name)
+            version_etag = etag.calc(spec_info=spec_info, version=version)
+            if etag.matches(if_none_match=if_none_match, etag=version_etag):
+                return etag.create_not_modified_response(version_etag)
+            prepared_spec_str = spec.read_prepared(
+                user=user, name=spec_name, version=version
+            )
 
         response_data = json.dumps({**spec_info, "value": prepared_spec_str})
 
-        return server.Response(
-            response_data,
-            status=200,
-            mimetype="application/json",
+        return etag.add_headers(
+            server.Response(
+                response_data,
+                status=200,
+                mimetype="application/json",
+            ),
+            version_etag,
         )
     except storage.exceptions.ObjectNotFoundError:
         return server.Response(
@@ -84,6 +167,12 @@ def get(
             status=500,
             mimetype="text/plain",
         )
+    except package_database.exceptions.NotFoundError:
+        return server.Response(
+            f"could not find the spec with id {spec_name}",
+            status=404,
+            mimetype="text/plain",
+        )
     except package_database.exceptions.BaseError:
         return server.Response(
             "something went wrong whilst reading from the database",
@@ -93,7 +182,7 @@ def get(
 
 
 def put(
-    body: bytearray,
+    body: bytes,
     spec_name: types.TSpecId,
     version: types.TSpecVersion,
     user: types.TUser,
@@ -104,6 +193,7 @@ def put(
     Returns 400 if the spec is not valid.
     Returns 400 if the requested version does not match the calculated version.
     Returns 402 if the free tier is exceeded.
+    Returns 413 if the spec is larger than the maximum size.
     Returns 500 if something went wrong.
 
     Args:
@@ -116,11 +206,23 @@ def put(
         The response to the request.
 
     """
+    # Reject large specs before doing anything else with them
+    spec_max_size = config.get().spec_max_size
+    if len(body) > spec_max_size:
+        return server.Response(
+            f"the spec is larger than the maximum of {spec_max_size} bytes",
+            status=413,
+            mimetype="text/plain",
+        )
+
     language = server.Request.request.headers["X-LANGUAGE"]
+    content_hash = spec.calc_content_hash(spec_bytes=body, language=language)
 
     try:
         # Check whether spec is valid
-        spec_info = spec.process(spec_str=body.decode(), language=language)
+        spec_info = spec.process(
+            spec_str=body, language=language, content_hash=content_hash
+        )
 
         # Check that the requested versionmatches the calculated version
         if version != spec_info.version:
@@ -148,6 +250,9 @@ def put(
             name=spec_name,
             version=spec_info.version,
             spec_str=spec_info.spec_str,
+            prepared_spec_str=spec.prepare(
+                spec_str=spec_info.spec_str, version=spec_info.version
+            ),
         )
 
         # Write an update into the database
@@ -158,6 +263,7 @@ def put(
             title=spec_info.title,
             description=spec_info.description,
             model_count=spec_info.model_count,
+            content_hash=content_hash,
         )
 
         return server.Response(status=204)
@@ -0,0 +1,148 @@
+"""
+Move the specs that are stored next to their packages to the specs folder.
+
+Specs used to be stored at {user}/{id}/{version}-spec.json next to the packages the
+build creates. They are now stored at {user}/{id}/specs/{version}-spec.json. This
+script copies any specs, and their prepared specs, that are still stored next to the
+packages to the specs folder and, with --delete-legacy, deletes them afterwards.
+
+Run it without --delete-legacy before deploying the API that reads from the specs
+folder and with --delete-legacy after the deployment, so that the specs are
+available throughout the deployment.
+
+Copying a spec triggers the build again, which creates the same packages. The specs
+are copied in batches with a pause in between so that the builds are spread out.
+Specs that were already copied with the same value are skipped.
+
+Usage:
+    python move_specs.py <bucket name> [--delete-legacy]
+
+"""
+
+import argparse
+import re
+import time
+
+from library.facades import storage
+
+_LEGACY_KEY_PATTERN = re.compile(r"^[^/]+/[^/]+/[^/]+-spec\.(json|yaml)$")
+_SUFFIX_LENGTH = len(".json")
+
+# The number of specs that are copied before pausing
+BATCH_SIZE = 20
+# The number of seconds to pause between batches
+BATCH_INTERVAL = 30.0
+
+
+def _calc_new_key(key: storage.types.TKey) -> storage.types.TKey:
+    """Calculate where an object that is stored next to the packages moves to."""
+    prefix, filename = key.rsplit("/", 1)
+    return f"{prefix}/specs/{filename}"
+
+
+def _list_legacy_keys(storage_instance: storage.types.TStorage) -> storage.types.TKeys:
+    """List the objects stored next to the packages, each prepared spec first."""
+    legacy_keys = [
+        key
+        for key in storage_instance.list()
+        if _LEGACY_KEY_PATTERN.match(key) is not None
+    ]
+    legacy_keys.sort(key=lambda key: (key[:-_SUFFIX_LENGTH], key.endswith(".json")))
+    return legacy_keys
+
+
+def _is_copied(
+    storage_instance: storage.types.TStorage,
+    *,
+    key: storage.types.TKey,
+    value: storage.types.TValue,
+) -> bool:
+    """Check whether an object was already copied with the same value."""
+    try:
+        return storage_instance.get(key=_calc_new_key(key)) == value
+    except storage.exceptions.ObjectNotFoundError:
+        return False
+
+
+def move(
+    storage_instance: storage.types.TStorage,
+    *,
+    delete_legacy: bool = False,
+    batch_size: int = BATCH_SIZE,
+    interval: float = BATCH_INTERVAL,
+) -> storage.types.TKeys:
+    """
+    Move the specs that are stored next to their packages to the specs folder.
+
+    The prepared specs are copied before their specs, the same as when a spec is
+    stored, and are compressed. After every batch_size specs the copying pauses for
+    interval seconds.
+
+    Args:
+        storage_instance: The storage with the specs.
+        delete_legacy: Whether to delete the objects stored next to the packages
+            after they were copied.
+        batch_size: The number of specs that are copied before pausing.
+        interval: The number of seconds to pause between batches.
+
+    Returns:
+        The keys that were copied.
+
+    """
+    legacy_keys = _list_legacy_keys(storage_instance)
+
+    copied_keys: storage.types.TKeys = []
+    copied_spec_count = 0
+    for key in legacy_keys:
+        value = storage_instance.get(key=key)
+        if _is_copied(storage_instance, key=key, value=value):
+            continue
+
+        is_spec = key.endswith(".json")
+        if is_spec and copied_spec_count > 0 and copied_spec_count % batch_size == 0:
+            time.sleep(interval)
+        storage_instance.set(key=_calc_new_key(key), value=value, compress=not is_spec)
+        copied_keys.append(key)
+        if is_spec:
+            copied_spec_count += 1
+
+    if delete_legacy and legacy_keys:
+        storage_instance.delete_all(keys=legacy_keys)
+
+    return copied_keys
+
+
+def main() -> None:
+    """Move the specs in the bucket."""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("bucket", help="The name of the bucket with the specs.")
+    parser.add_argument(
+        "--delete-legacy",
+        action="store_true",
+        help="Delete the specs stored next to the packages after copying them.",
+    )
+    parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=BATCH_SIZE,
+        help="The number of specs that are copied before pausing.",
+    )
+    parser.add_argument(
+        "--interval",
+        type=float,
+        default=BATCH_INTERVAL,
+        help="The number of seconds to pause between batches.",
+    )
+    args = parser.parse_args()
+
+    copied_keys = move(
+        storage.s3.Storage(args.bucket),
+        delete_legacy=args.delete_legacy,
+        batch_size=args.batch_size,
+        interval=args.interval,
+    )
+    print(f"copied {len(copied_keys)} objects")  # allow-print
+
+
+if __name__ == "__main__":
+    main()
@@ -3,6 +3,8 @@
 import pytest
 from library import config
 from library.facades import storage
+from library.helpers import spec
+from open_alchemy.package_security import clients
 
 
 def preset_config():
@@ -15,6 +17,7 @@ def preset_config():
     config_instance.access_control_allow_headers = "x-language"
     config_instance.default_credentials_id = "default"
     config_instance.free_tier_model_count = 10
+    config_instance.spec_max_size = 1024 * 1024
 
 
 @pytest.fixture(autouse=True)
@@ -27,6 +30,26 @@ def clean_storage():
     storage.get_storage().delete_all(keys=keys)
 
 
+@pytest.fixture(autouse=True)
+def clear_process_cache():
+    """Clears the cache of processed specs before and after each test."""
+    spec.PROCESS_CACHE.clear()
+
+    yield
+
+    spec.PROCESS_CACHE.clear()
+
+
+@pytest.fixture(autouse=True)
+def clear_clients():
+    """Clears the shared AWS clients so that stubs are not shared between tests."""
+    clients.clear()
+
+    yield
+
+    clients.clear()
+
+
 @pytest.fixture(autouse=True)
 def use_service_secret(_service_secret):
     """Always uses the _service_secret open-alchemy.package-security fixture."""
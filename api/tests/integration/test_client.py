@@ -121,6 +121,67 @@ def test_specs_get(client, _clean_specs_table):
     assert "updated_at" in spec_info
 
 
+@pytest.mark.integration
+def test_specs_get_server_timing(monkeypatch, client, _clean_specs_table):
+    """
+    GIVEN database with a single spec and the database facade is instrumented
+    WHEN GET /v1/specs is called with the Authorization header
+    THEN the use of the database is returned in the Server-Timing header.
+    """
+    sub = "sub 1"
+    package_database.get().create_update_spec(
+        sub=sub, name="spec1", version="1", model_count=1
+    )
+    package_database.instrumentation.install()
+    monkeypatch.setattr(
+        package_database,
+        "_DATABASE",
+        package_database.instrumentation.Database(package_database.get()),
+    )
+    token = jwt.encode({"sub": sub}, "secret 1")
+
+    response = client.get("/v1/specs", headers={"Authorization": f"Bearer {token}"})
+
+    assert response.status_code == 200
+    server_timing = response.headers["Server-Timing"]
+    assert server_timing.startswith("db;dur=")
+    assert "requests=1 " in server_timing
+    assert 'items=1"' in server_timing
+    assert "db-list_specs;dur=" in server_timing
+    assert "Server-Timing" in response.headers["Access-Control-Expose-Headers"]
+
+
+@pytest.mark.integration
+def test_specs_get_page(client, _clean_specs_table):
+    """
+    GIVEN database with multiple specs
+    WHEN GET /v1/specs is called with limit and then with the returned cursor
+    THEN the specs are returned across the pages and the cursor header is exposed.
+    """
+    sub = "sub 1"
+    for spec_name in ["spec1", "spec2"]:
+        package_database.get().create_update_spec(
+            sub=sub, name=spec_name, version="1", model_count=1
+        )
+    headers = {"Authorization": f"Bearer {jwt.encode({'sub': sub}, 'secret 1')}"}
+
+    first_response = client.get("/v1/specs?limit=1", headers=headers)
+
+    assert first_response.status_code == 200
+    assert "X-NEXT-CURSOR" in first_response.headers["Access-Control-Expose-Headers"]
+    assert [info["name"] for info in json.loads(first_response.data.decode())] == [
+        "spec1"
+    ]
+    cursor = first_response.headers["X-NEXT-CURSOR"]
+
+    second_response = client.get(f"/v1/specs?cursor={cursor}", headers=headers)
+
+    assert second_response.status_code == 200
+    assert [info["name"] for info in json.loads(second_response.data.decode())] == [
+        "spec2"
+    ]
+
+
 @pytest.mark.integration
 def test_specs_spec_name_get(client, _clean_specs_table):
     """
@@ -181,6 +242,29 @@ def test_specs_spec_name_put_invalid_name(client):
     assert response.status_code == 400
 
 
+@pytest.mark.integration
+def test_specs_spec_name_put_too_large(client, monkeypatch):
+    """
+    GIVEN spec id, data that is larger than the maximum size and token
+    WHEN PUT /v1/specs/{spec_name} is called with the Authorization header
+    THEN 413 is returned.
+    """
+    monkeypatch.setattr(config.get(), "spec_max_size", 4)
+    data = "data 1"
+    spec_name = "spec1"
+    sub = "sub 1"
+    token = jwt.encode({"sub": sub}, "secret 1")
+
+    response = client.put(
+        f"/v1/specs/{spec_name}",
+        data=data,
+        headers={"Authorization": f"Bearer {token}", "X-LANGUAGE": "JSON"},
+    )
+
+    assert response.status_code == 413
+    assert "maximum of 4 bytes" in response.data.decode()
+
+
 @pytest.mark.integration
 def test_specs_spec_name_put(client, _clean_specs_table):
     """
@@ -337,6 +421,48 @@ def test_specs_spec_name_version_version_get(client, _clean_specs_table):
     assert response_json["version"] == version
 
 
+@pytest.mark.parametrize(
+    "url",
+    [
+        pytest.param("/v1/specs/spec1", id="/specs/{spec_name}"),
+        pytest.param(
+            "/v1/specs/spec1/versions/1", id="/specs/{spec_name}/versions/{version}"
+        ),
+    ],
+)
+@pytest.mark.integration
+def test_specs_spec_name_get_not_modified(client, _clean_specs_table, url):
+    """
+    GIVEN database and storage with a single spec
+    WHEN GET is called with the Authorization header and then with the ETag in the
+        If-None-Match header
+    THEN the ETag is returned and exposed and then 304 is returned.
+    """
+    sub = "sub 1"
+    package_database.get().create_update_spec(
+        sub=sub, name="spec1", version="1", model_count=1
+    )
+    storage.get_storage_facade().create_update_spec(
+        user=sub, name="spec1", version="1", spec_str='{"components":{}}'
+    )
+    token = jwt.encode({"sub": sub}, "secret 1")
+
+    response = client.get(url, headers={"Authorization": f"Bearer {token}"})
+
+    assert response.status_code == 200
+    assert "ETag" in response.headers["Access-Control-Expose-Headers"]
+    response_etag = response.headers["ETag"]
+
+    response = client.get(
+        url,
+        headers={"Authorization": f"Bearer {token}", "If-None-Match": response_etag},
+    )
+
+    assert response.status_code == 304
+    assert response.headers["ETag"] == response_etag
+    assert response.headers["Cache-Control"] == "private, no-cache"
+
+
 @pytest.mark.integration
 def test_specs_spec_name_versions_version_put_invalid_version(client):
     """
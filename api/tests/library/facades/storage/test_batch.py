@@ -0,0 +1,96 @@
+"""Tests for deleting objects in batches."""
+
+import threading
+
+import pytest
+from library.facades import storage
+
+
+@pytest.mark.parametrize(
+    "keys, expected_batches",
+    [
+        pytest.param([], [], id="empty"),
+        pytest.param(["key 1"], [["key 1"]], id="single"),
+        pytest.param(["key 1", "key 2"], [["key 1", "key 2"]], id="multiple full"),
+        pytest.param(
+            ["key 1", "key 2", "key 3"],
+            [["key 1", "key 2"], ["key 3"]],
+            id="multiple batches partial",
+        ),
+        pytest.param(
+            ["key 1", "key 2", "key 3", "key 4"],
+            [["key 1", "key 2"], ["key 3", "key 4"]],
+            id="multiple batches full",
+        ),
+    ],
+)
+@pytest.mark.storage
+def test_split(monkeypatch, keys, expected_batches):
+    """
+    GIVEN keys and maximum number of keys
+    WHEN split is called with the keys
+    THEN the expected batches are returned.
+    """
+    monkeypatch.setattr(storage.batch, "MAX_KEYS", 2)
+
+    returned_batches = storage.batch.split(keys)
+
+    assert returned_batches == expected_batches
+
+
+@pytest.mark.parametrize(
+    "key_count, expected_batch_count",
+    [
+        pytest.param(0, 0, id="empty"),
+        pytest.param(1, 1, id="single batch"),
+        pytest.param(5, 3, id="multiple batches"),
+    ],
+)
+@pytest.mark.storage
+def test_delete_all(monkeypatch, key_count, expected_batch_count):
+    """
+    GIVEN keys and maximum number of keys
+    WHEN delete_all is called with the keys
+    THEN every key is deleted in the expected number of batches.
+    """
+    monkeypatch.setattr(storage.batch, "MAX_KEYS", 2)
+    keys = [f"key {idx}" for idx in range(key_count)]
+    deleted_batches = []
+    lock = threading.Lock()
+
+    def delete_batch(batch_keys):
+        """Record the batch."""
+        assert len(batch_keys) <= 2
+        with lock:
+            deleted_batches.append(batch_keys)
+
+    storage.batch.delete_all(keys=keys, delete_batch=delete_batch)
+
+    assert len(deleted_batches) == expected_batch_count
+    assert sorted(key for batch in deleted_batches for key in batch) == sorted(keys)
+
+
+@pytest.mark.storage
+def test_delete_all_error(monkeypatch):
+    """
+    GIVEN keys in multiple batches where deleting the first batch raises an error
+    WHEN delete_all is called with the keys
+    THEN the other batches are deleted and the error is raised.
+    """
+    monkeypatch.setattr(storage.batch, "MAX_KEYS", 2)
+    keys = ["key 1", "key 2", "key 3", "key 4", "key 5"]
+    deleted_keys = []
+    lock = threading.Lock()
+
+    def delete_batch(batch_keys):
+        """Raise an error for the first batch and record the other batches."""
+        if "key 1" in batch_keys:
+            raise storage.exceptions.StorageError("batch failed")
+        with lock:
+            deleted_keys.extend(batch_keys)
+
+    with pytest.raises(storage.exceptions.StorageError) as exc:
+        storage.batch.delete_all(keys=keys, delete_batch=delete_batch)
+
+    assert "batch failed" in str(exc)
+    assert sorted(deleted_keys) == ["key 3", "key 4", "key 5"]
@@ -0,0 +1,60 @@
+"""Tests for the encoding of the values of objects."""
+
+import gzip
+
+import pytest
+from library.facades import storage
+
+
+@pytest.mark.parametrize(
+    "compress, expected_content_encoding",
+    [
+        pytest.param(False, None, id="not compressed"),
+        pytest.param(True, "gzip", id="compressed"),
+    ],
+)
+@pytest.mark.storage
+def test_encode_decode(compress, expected_content_encoding):
+    """
+    GIVEN value
+    WHEN encode is called with the value and then decode with the encoded value
+    THEN the value is returned.
+    """
+    value = '{"key": "value"}' * 10
+
+    encoded_value = storage.encoding.encode(value=value, compress=compress)
+
+    assert encoded_value.content_encoding == expected_content_encoding
+    returned_value = storage.encoding.decode(
+        data=encoded_value.data, content_encoding=encoded_value.content_encoding
+    )
+    assert returned_value == value
+
+
+@pytest.mark.storage
+def test_encode_compress():
+    """
+    GIVEN repetitive value
+    WHEN encode is called with the value twice with compress
+    THEN the same gzip data is returned which is smaller than the value.
+    """
+    value = '{"key": "value"}' * 10
+
+    encoded_value = storage.encoding.encode(value=value, compress=True)
+
+    assert gzip.decompress(encoded_value.data) == value.encode()
+    assert len(encoded_value.data) < len(value)
+    assert storage.encoding.encode(value=value, compress=True) == encoded_value
+
+
+@pytest.mark.storage
+def test_decode_unsupported():
+    """
+    GIVEN data with an unsupported content encoding
+    WHEN decode is called
+    THEN StorageError is raised.
+    """
+    with pytest.raises(storage.exceptions.StorageError) as exc:
+        storage.encoding.decode(data=b"data 1", content_encoding="br")
+
+    assert "br" in str(exc.value)
@@ -41,6 +41,24 @@ def test_set_get(class_):
     assert returned_value == value
 
 
+@pytest.mark.parametrize("class_", CLASSES)
+@pytest.mark.storage
+def test_set_compress_get(class_):
+    """
+    GIVEN storage class
+    WHEN it is constructed and set with compress and then get is called
+    THEN the value that set was called with is returned.
+    """
+    key = "key 1"
+    value = "value 1"
+    storage_instance = class_()
+
+    storage_instance.set(key=key, value=value, compress=True)
+    returned_value = storage_instance.get(key=key)
+
+    assert returned_value == value
+
+
 @pytest.mark.parametrize("class_", CLASSES)
 @pytest.mark.storage
 def test_delete_no_set(class_):
@@ -292,3 +310,110 @@ def test_delete_all(class_, set_args, delete_keys, expected_keys):
     returned_keys = storage_instance.list()
 
     assert returned_keys == expected_keys
+
+
+@pytest.mark.parametrize("class_", CLASSES)
+@pytest.mark.storage
+def test_delete_all_batches(monkeypatch, class_):
+    """
+    GIVEN storage class, maximum number of keys and more objects than the maximum
+    WHEN it is constructed, set is called for the objects and delete_all is called
+        with all keys
+    THEN all objects are deleted.
+    """
+    monkeypatch.setattr(storage.batch, "MAX_KEYS", 2)
+    storage_instance = class_()
+    keys = [f"key {idx}" for idx in range(5)]
+    for key in keys:
+        storage_instance.set(key=key, value="value 1")
+
+    storage_instance.delete_all(keys=keys)
+
+    assert storage_instance.list() == []
+
+
+@pytest.mark.parametrize("class_", CLASSES)
+@pytest.mark.storage
+def test_delete_batch_too_many_keys(monkeypatch, class_):
+    """
+    GIVEN storage class, maximum number of keys and more objects than the maximum
+    WHEN it is constructed, set is called for the objects and _delete_batch is called
+        with all keys
+    THEN StorageError is raised and no objects are deleted.
+    """
+    monkeypatch.setattr(storage.batch, "MAX_KEYS", 2)
+    storage_instance = class_()
+    keys = [f"key {idx}" for idx in range(3)]
+    for key in keys:
+        storage_instance.set(key=key, value="value 1")
+
+    with pytest.raises(storage.exceptions.StorageError) as exc:
+        storage_instance._delete_batch(keys)
+
+    assert "2" in str(exc)
+    assert storage_instance.list() == keys
+
+
+@pytest.mark.parametrize(
+    "kwargs, expected_keys",
+    [
+        pytest.param({}, ["a", "b/1", "b/2", "b/3", "ba", "c"], id="all"),
+        pytest.param({"prefix": "b/"}, ["b/1", "b/2", "b/3"], id="prefix middle"),
+        pytest.param({"prefix": "a"}, ["a"], id="prefix first"),
+        pytest.param({"prefix": "c"}, ["c"], id="prefix last"),
+        pytest.param(
+            {"prefix": "b"}, ["b/1", "b/2", "b/3", "ba"], id="prefix of prefix"
+        ),
+        pytest.param({"prefix": "bb"}, [], id="prefix between keys"),
+        pytest.param({"prefix": "d"}, [], id="prefix after keys"),
+        pytest.param({"prefix": "b/", "suffix": "2"}, ["b/2"], id="prefix and suffix"),
+        pytest.param({"delimiter": "/"}, ["a", "ba", "c"], id="delimiter"),
+        pytest.param(
+            {"prefix": "b", "delimiter": "/"}, ["ba"], id="prefix and delimiter"
+        ),
+        pytest.param(
+            {"prefix": "b/", "delimiter": "/"},
+            ["b/1", "b/2", "b/3"],
+            id="prefix with delimiter and delimiter",
+        ),
+    ],
+)
+@pytest.mark.parametrize("class_", CLASSES)
+@pytest.mark.storage
+def test_list_sorted(class_, kwargs, expected_keys):
+    """
+    GIVEN storage class and keys set out of order
+    WHEN it is constructed, set is called for the keys and list is called with the
+        prefix, suffix and delimiter
+    THEN the expected keys are returned in sorted order.
+    """
+    storage_instance = class_()
+    for key in ["c", "b/2", "ba", "a", "b/3", "b/1"]:
+        storage_instance.set(key=key, value="value 1")
+
+    returned_keys = storage_instance.list(**kwargs)
+
+    assert returned_keys == expected_keys
+
+
+@pytest.mark.parametrize("class_", CLASSES)
+@pytest.mark.storage
+def test_list_consistent(class_):
+    """
+    GIVEN storage class
+    WHEN it is constructed, keys are set again, deleted and deleted using delete_all
+    THEN list returns the remaining keys once each.
+    """
+    storage_instance = class_()
+    for key in ["key 3", "key 1", "key 2", "key 4"]:
+        storage_instance.set(key=key, value="value 1")
+
+    storage_instance.set(key="key 1", value="value 2")
+    assert storage_instance.list(prefix="key") == ["key 1", "key 2", "key 3", "key 4"]
+
+    storage_instance.delete(key="key 2")
+    assert storage_instance.list(prefix="key") == ["key 1", "key 3", "key 4"]
+
+    storage_instance.delete_all(keys=["key 4", "key 1"])
+    assert storage_instance.list(prefix="key") == ["key 3"]
+    assert storage_instance.get(key="key 3") == "value 1"
@@ -1,5 +1,8 @@
 """tests for s3 torage facade."""
 
+import gzip
+import random
+import time
 from unittest import mock
 
 import pytest
@@ -92,6 +95,29 @@ def test_list(response, suffix, prefix, expected_prefix, expected_keys):
     assert returned_keys == expected_keys
 
 
+@pytest.mark.storage
+def test_list_delimiter():
+    """
+    GIVEN stubbed s3 client
+    WHEN list is called with the delimiter
+    THEN it is passed to S3 and the keys are returned.
+    """
+    bucket = "bucket1"
+    s3_instance = storage.s3.Storage(bucket)
+    stubber = stub.Stubber(s3_instance.client)
+    stubber.add_response(
+        "list_objects_v2",
+        {"Contents": [{"Key": "prefix 1/key 2"}], "CommonPrefixes": []},
+        {"Bucket": bucket, "Prefix": "prefix 1/", "Delimiter": "/"},
+    )
+    stubber.activate()
+
+    returned_keys = s3_instance.list(prefix="prefix 1/", delimiter="/")
+
+    stubber.assert_no_pending_responses()
+    assert returned_keys == ["prefix 1/key 2"]
+
+
 @pytest.mark.storage
 def test_list_multi_page():
     """
@@ -137,6 +163,49 @@ def test_list_multi_page():
     assert returned_keys == [key1, key2]
 
 
+@pytest.mark.storage
+def test_list_multi_page_common_prefixes():
+    """
+    GIVEN stubbed s3 client that has multiple pages where a page only has common
+        prefixes
+    WHEN list is called with a delimiter
+    THEN the keys of all pages are returned.
+    """
+    bucket = "bucket1"
+    s3_instance = storage.s3.Storage(bucket)
+    stubber = stub.Stubber(s3_instance.client)
+    expected_params = {"Bucket": bucket, "Prefix": "prefix 1/", "Delimiter": "/"}
+    stubber.add_response(
+        "list_objects_v2",
+        {
+            "IsTruncated": True,
+            "Contents": [{"Key": "prefix 1/key 1"}],
+            "NextContinuationToken": "token 1",
+        },
+        expected_params,
+    )
+    stubber.add_response(
+        "list_objects_v2",
+        {
+            "IsTruncated": True,
+            "CommonPrefixes": [{"Prefix": "prefix 1/folder 1/"}],
+            "NextContinuationToken": "token 2",
+        },
+        {**expected_params, "ContinuationToken": "token 1"},
+    )
+    stubber.add_response(
+        "list_objects_v2",
+        {"Contents": [{"Key": "prefix 1/key 2"}]},
+        {**expected_params, "ContinuationToken": "token 2"},
+    )
+    stubber.activate()
+
+    returned_keys = s3_instance.list(prefix="prefix 1/", delimiter="/")
+
+    stubber.assert_no_pending_responses()
+    assert returned_keys == ["prefix 1/key 1", "prefix 1/key 2"]
+
+
 @pytest.mark.storage
 def test_list_error_core():
     """
@@ -240,6 +309,31 @@ def test_get():
     assert returned_value == value
 
 
+@pytest.mark.storage
+def test_get_compressed():
+    """
+    GIVEN stubbed s3 client that returns a compressed object
+    WHEN get is called
+    THEN the decompressed value is returned.
+    """
+    bucket = "bucket1"
+    key = "key 1"
+    value = "spec 1"
+    body = mock.MagicMock()
+    body.read.return_value = gzip.compress(value.encode())
+    s3_instance = storage.s3.Storage(bucket)
+    stubber = stub.Stubber(s3_instance.client)
+    expected_params = {"Bucket": bucket, "Key": key}
+    response = {"Body": body, "ContentEncoding": "gzip"}
+    stubber.add_response("get_object", response, expected_params)
+    stubber.activate()
+
+    returned_value = s3_instance.get(key=key)
+
+    stubber.assert_no_pending_responses()
+    assert returned_value == value
+
+
 @pytest.mark.storage
 def test_set_error_core():
     """
@@ -299,6 +393,33 @@ def test_set():
     stubber.assert_no_pending_responses()
 
 
+@pytest.mark.storage
+def test_set_compress():
+    """
+    GIVEN stubbed s3 client
+    WHEN set is called with compress
+    THEN the client is called with the compressed value and content encoding.
+    """
+    bucket = "bucket1"
+    key = "key 1"
+    value = "spec 1"
+    s3_instance = storage.s3.Storage(bucket)
+    stubber = stub.Stubber(s3_instance.client)
+    expected_params = {
+        "Bucket": bucket,
+        "Key": key,
+        "Body": storage.encoding.encode(value=value, compress=True).data,
+        "ContentEncoding": "gzip",
+    }
+    response = {}
+    stubber.add_response("put_object", response, expected_params)
+    stubber.activate()
+
+    s3_instance.set(key=key, value=value, compress=True)
+
+    stubber.assert_no_pending_responses()
+
+
 @pytest.mark.storage
 def test_delete_error_core():
     """
@@ -407,7 +528,6 @@ def test_delete_all_error_client():
 @pytest.mark.parametrize(
     "keys, expected_objects",
     [
-        pytest.param([], [], id="no keys"),
         pytest.param(["key 1"], [{"Key": "key 1"}], id="single keys"),
         pytest.param(
             ["key 1", "key 2"], [{"Key": "key 1"}, {"Key": "key 2"}], id="multiple keys"
@@ -424,7 +544,10 @@ def test_delete_all(keys, expected_objects):
     bucket = "bucket1"
     s3_instance = storage.s3.Storage(bucket)
     stubber = stub.Stubber(s3_instance.client)
-    expected_params = {"Bucket": bucket, "Delete": {"Objects": expected_objects}}
+    expected_params = {
+        "Bucket": bucket,
+        "Delete": {"Objects": expected_objects, "Quiet": True},
+    }
     response = {}
     stubber.add_response("delete_objects", response, expected_params)
     stubber.activate()
@@ -432,3 +555,158 @@ def test_delete_all(keys, expected_objects):
     s3_instance.delete_all(keys=keys)
 
     stubber.assert_no_pending_responses()
+
+
+@pytest.mark.storage
+def test_delete_all_no_keys():
+    """
+    GIVEN stubbed s3 client
+    WHEN delete_all is called with no keys
+    THEN the client is not called.
+    """
+    s3_instance = storage.s3.Storage("bucket1")
+    stubber = stub.Stubber(s3_instance.client)
+    stubber.activate()
+
+    s3_instance.delete_all(keys=[])
+
+    stubber.assert_no_pending_responses()
+
+
+@pytest.mark.storage
+def test_delete_all_batches(monkeypatch):
+    """
+    GIVEN maximum number of keys and more keys than the maximum
+    WHEN delete_all is called with the keys
+    THEN the client is called once for each batch of keys.
+    """
+    monkeypatch.setattr(storage.batch, "MAX_KEYS", 2)
+    bucket = "bucket1"
+    s3_instance = storage.s3.Storage(bucket)
+    mock_delete_objects = mock.MagicMock()
+    mock_delete_objects.return_value = {}
+    monkeypatch.setattr(s3_instance.client, "delete_objects", mock_delete_objects)
+    keys = ["key 1", "key 2", "key 3"]
+
+    s3_instance.delete_all(keys=keys)
+
+    assert mock_delete_objects.call_count == 2
+    mock_delete_objects.assert_any_call(
+        Bucket=bucket,
+        Delete={"Objects": [{"Key": "key 1"}, {"Key": "key 2"}], "Quiet": True},
+    )
+    mock_delete_objects.assert_any_call(
+        Bucket=bucket, Delete={"Objects": [{"Key": "key 3"}], "Quiet": True}
+    )
+
+
+@pytest.mark.storage
+def test_delete_all_key_errors_retried(monkeypatch):
+    """
+    GIVEN stubbed s3 client that returns a retryable error for a key and then
+        succeeds
+    WHEN delete_all is called
+    THEN the key with the error is deleted again after a pause.
+    """
+    mock_sleep = mock.MagicMock()
+    monkeypatch.setattr(time, "sleep", mock_sleep)
+    bucket = "bucket1"
+    s3_instance = storage.s3.Storage(bucket)
+    stubber = stub.Stubber(s3_instance.client)
+    stubber.add_response(
+        "delete_objects",
+        {"Errors": [{"Key": "key 2", "Code": "InternalError"}]},
+        {
+            "Bucket": bucket,
+            "Delete": {"Objects": [{"Key": "key 1"}, {"Key": "key 2"}], "Quiet": True},
+        },
+    )
+    stubber.add_response(
+        "delete_objects",
+        {},
+        {"Bucket": bucket, "Delete": {"Objects": [{"Key": "key 2"}], "Quiet": True}},
+    )
+    stubber.activate()
+
+    s3_instance.delete_all(keys=["key 1", "key 2"])
+
+    stubber.assert_no_pending_responses()
+    mock_sleep.assert_called_once()
+    [(pause,)] = [call.args for call in mock_sleep.call_args_list]
+    assert 0 <= pause <= storage.s3.DELETE_BASE_BACKOFF
+
+
+@pytest.mark.storage
+def test_delete_all_key_errors(monkeypatch):
+    """
+    GIVEN stubbed s3 client that always returns a retryable error for a key
+    WHEN delete_all is called
+    THEN the key is attempted the maximum number of times with exponential backoff
+        and StorageError is raised.
+    """
+    mock_sleep = mock.MagicMock()
+    monkeypatch.setattr(time, "sleep", mock_sleep)
+    monkeypatch.setattr(random, "uniform", lambda _, upper: upper)
+    bucket = "bucket1"
+    key = "key 1"
+    s3_instance = storage.s3.Storage(bucket)
+    stubber = stub.Stubber(s3_instance.client)
+    for _ in range(storage.s3.DELETE_MAX_ATTEMPTS):
+        stubber.add_response(
+            "delete_objects",
+            {"Errors": [{"Key": key, "Code": "SlowDown"}]},
+            {"Bucket": bucket, "Delete": {"Objects": [{"Key": key}], "Quiet": True}},
+        )
+    stubber.activate()
+
+    with pytest.raises(storage.exceptions.StorageError) as exc:
+        s3_instance.delete_all(keys=[key])
+
+    stubber.assert_no_pending_responses()
+    assert key in str(exc)
+    assert "SlowDown" in str(exc)
+    assert [call.args for call in mock_sleep.call_args_list] == [
+        (storage.s3.DELETE_BASE_BACKOFF * 2**attempt,)
+        for attempt in range(storage.s3.DELETE_MAX_ATTEMPTS - 1)
+    ]
+
+
+@pytest.mark.storage
+def test_delete_all_key_errors_not_retryable(monkeypatch):
+    """
+    GIVEN stubbed s3 client that returns a retryable error for a key and an error
+        that is not retryable for another key and then succeeds
+    WHEN delete_all is called
+    THEN only the key with the retryable error is deleted again and StorageError is
+        raised for the other key.
+    """
+    monkeypatch.setattr(time, "sleep", mock.MagicMock())
+    bucket = "bucket1"
+    s3_instance = storage.s3.Storage(bucket)
+    stubber = stub.Stubber(s3_instance.client)
+    stubber.add_response(
+        "delete_objects",
+        {
+            "Errors": [
+                {"Key": "key 1", "Code": "AccessDenied"},
+                {"Key": "key 2", "Code": "InternalError"},
+            ]
+        },
+        {
+            "Bucket": bucket,
+            "Delete": {"Objects": [{"Key": "key 1"}, {"Key": "key 2"}], "Quiet": True},
+        },
+    )
+    stubber.add_response(
+        "delete_objects",
+        {},
+        {"Bucket": bucket, "Delete": {"Objects": [{"Key": "key 2"}], "Quiet": True}},
+    )
+    stubber.activate()
+
+    with pytest.raises(storage.exceptions.StorageError) as exc:
+        s3_instance.delete_all(keys=["key 1", "key 2"])
+
+    stubber.assert_no_pending_responses()
+    assert "key 1 (AccessDenied)" in str(exc)
+    assert "key 2" not in str(exc)
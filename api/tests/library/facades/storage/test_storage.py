@@ -67,6 +67,49 @@ def test_get_spec():
     )
 
 
+@pytest.mark.storage
+def test_get_prepared_spec():
+    """
+    GIVEN user, name, version, spec str and prepared spec str
+    WHEN create_update_spec is called with and without the prepared spec str and then
+        get_prepared_spec is called with the user and name
+    THEN the prepared spec str is stored compressed and is returned or
+        ObjectNotFoundError is raised.
+    """
+    user = "user 1"
+    name = "name 1"
+    version_1 = "version 1"
+    prepared_spec_str = "prepared spec str 1"
+
+    storage_instance = storage.get_storage_facade()
+
+    storage_instance.create_update_spec(
+        user=user,
+        name=name,
+        version=version_1,
+        spec_str="spec str 1",
+        prepared_spec_str=prepared_spec_str,
+    )
+
+    assert (
+        storage_instance.get_prepared_spec(user=user, name=name, version=version_1)
+        == prepared_spec_str
+    )
+    assert storage_instance.get_spec_versions(user=user, name=name) == [version_1]
+    stored_prepared_spec = storage.get_storage().storage[
+        f"{user}/{name}/specs/{version_1}-spec.yaml"
+    ]
+    assert stored_prepared_spec.content_encoding == "gzip"
+
+    version_2 = "version 2"
+    storage_instance.create_update_spec(
+        user=user, name=name, version=version_2, spec_str="spec str 2"
+    )
+
+    with pytest.raises(storage.exceptions.ObjectNotFoundError):
+        storage_instance.get_prepared_spec(user=user, name=name, version=version_2)
+
+
 @pytest.mark.storage
 def test_delete_spec():
     """
@@ -150,19 +193,22 @@ def test_get_spec_versions():
 
     assert storage_instance.get_spec_versions(user=user, name=name) == [version_1]
 
+    storage.get_storage().set(
+        key=f"{user}/{name}/specs/folder 1/version 3-spec.json", value="value 1"
+    )
+
+    assert storage_instance.get_spec_versions(user=user, name=name) == [version_1]
+
     version_2 = "version 2"
 
     storage_instance.create_update_spec(
         user=user, name=name, version=version_2, spec_str=spec_str
     )
 
-    assert (
-        storage_instance.get_spec_versions(
-            user=user,
-            name=name,
-        )
-        == [version_1, version_2]
-    )
+    assert storage_instance.get_spec_versions(
+        user=user,
+        name=name,
+    ) == [version_1, version_2]
 
     with pytest.raises(storage.exceptions.ObjectNotFoundError) as exc:
         storage_instance.get_spec_versions(user="user 2", name=name)
@@ -171,3 +217,24 @@ def test_get_spec_versions():
     with pytest.raises(storage.exceptions.ObjectNotFoundError) as exc:
         storage_instance.get_spec_versions(user=user, name="name 2")
     assert "name 2" in str(exc)
+
+
+@pytest.mark.storage
+def test_delete_spec_similar_name():
+    """
+    GIVEN two specs where the id of one is the prefix of the id of the other
+    WHEN delete_spec is called for the spec with the shorter id
+    THEN the other spec is not deleted.
+    """
+    user = "user 1"
+    storage_instance = storage.get_storage_facade()
+    storage_instance.create_update_spec(
+        user=user, name="name", version="version 1", spec_str="spec str 1"
+    )
+    storage_instance.create_update_spec(
+        user=user, name="name-2", version="version 1", spec_str="spec str 2"
+    )
+
+    storage_instance.delete_spec(user=user, name="name")
+
+    assert storage_instance.get_spec_versions(user=user, name="name-2") == ["version 1"]
@@ -0,0 +1,78 @@
+"""Tests for the cache."""
+
+import pytest
+from library.helpers import cache
+
+
+@pytest.mark.helpers
+def test_get_miss():
+    """
+    GIVEN empty cache
+    WHEN get is called
+    THEN None is returned and a miss is counted.
+    """
+    cache_instance = cache.LRUCache(maxsize=2)
+
+    assert cache_instance.get("key 1") is None
+
+    assert cache_instance.hits == 0
+    assert cache_instance.misses == 1
+
+
+@pytest.mark.helpers
+def test_set_get():
+    """
+    GIVEN empty cache
+    WHEN set is called and then get is called with the same key
+    THEN the value is returned and a hit is counted.
+    """
+    cache_instance = cache.LRUCache(maxsize=2)
+
+    cache_instance.set("key 1", "value 1")
+
+    assert cache_instance.get("key 1") == "value 1"
+    assert cache_instance.hits == 1
+    assert cache_instance.misses == 0
+    assert len(cache_instance) == 1
+
+
+@pytest.mark.helpers
+def test_set_evicts_least_recently_used():
+    """
+    GIVEN full cache where the oldest entry has been retrieved
+    WHEN set is called with a new key
+    THEN the least recently used entry is evicted and an eviction is counted.
+    """
+    cache_instance = cache.LRUCache(maxsize=2)
+    cache_instance.set("key 1", "value 1")
+    cache_instance.set("key 2", "value 2")
+    cache_instance.get("key 1")
+
+    cache_instance.set("key 3", "value 3")
+
+    assert cache_instance.get("key 2") is None
+    assert cache_instance.get("key 1") == "value 1"
+    assert cache_instance.get("key 3") == "value 3"
+    assert cache_instance.evictions == 1
+    assert len(cache_instance) == 2
+
+
+@pytest.mark.helpers
+def test_clear():
+    """
+    GIVEN cache with a value and counters
+    WHEN clear is called
+    THEN the values are removed and the counters are reset.
+    """
+    cache_instance = cache.LRUCache(maxsize=1)
+    cache_instance.set("key 1", "value 1")
+    cache_instance.set("key 2", "value 2")
+    cache_instance.get("key 2")
+    cache_instance.get("key 1")
+
+    cache_instance.clear()
+
+    assert len(cache_instance) == 0
+    assert cache_instance.hits == 0
+    assert cache_instance.misses == 0
+    assert cache_instance.evictions == 0
@@ -0,0 +1,110 @@
+"""Tests for the ETag helper."""
+
+import pytest
+from library.facades import server
+from library.helpers import etag
+
+SPEC_INFO = {
+    "id": "spec-1",
+    "name": "spec 1",
+    "version": "1",
+    "updated_at": 1,
+    "model_count": 1,
+    "content_hash": "hash 1",
+}
+
+
+@pytest.mark.helpers
+def test_calc():
+    """
+    GIVEN spec info and version
+    WHEN calc is called with the spec info and version
+    THEN the same quoted ETag is returned.
+    """
+    returned_etag = etag.calc(spec_info=SPEC_INFO, version="1")
+
+    assert returned_etag.startswith('"')
+    assert returned_etag.endswith('"')
+    assert '"' not in returned_etag[1:-1]
+    assert etag.calc(spec_info={**SPEC_INFO}, version="1") == returned_etag
+
+
+@pytest.mark.parametrize(
+    "spec_info, version",
+    [
+        pytest.param(SPEC_INFO, "2", id="version"),
+        pytest.param({**SPEC_INFO, "version": "2"}, "1", id="latest version"),
+        pytest.param({**SPEC_INFO, "updated_at": 2}, "1", id="updated_at"),
+        pytest.param({**SPEC_INFO, "content_hash": "hash 2"}, "1", id="content_hash"),
+        pytest.param(
+            {key: value for key, value in SPEC_INFO.items() if key != "content_hash"},
+            "1",
+            id="content_hash missing",
+        ),
+    ],
+)
+@pytest.mark.helpers
+def test_calc_changed(spec_info, version):
+    """
+    GIVEN spec info and version that are different from SPEC_INFO and 1
+    WHEN calc is called with the spec info and version
+    THEN a different ETag is returned.
+    """
+    returned_etag = etag.calc(spec_info=spec_info, version=version)
+
+    assert returned_etag != etag.calc(spec_info=SPEC_INFO, version="1")
+
+
+@pytest.mark.parametrize(
+    "if_none_match, expected_result",
+    [
+        pytest.param('"etag 1"', True, id="single match"),
+        pytest.param('"etag 2"', False, id="single no match"),
+        pytest.param('W/"etag 1"', True, id="single weak match"),
+        pytest.param('"etag 2", "etag 1"', True, id="multiple match"),
+        pytest.param('"etag 2","etag 3"', False, id="multiple no match"),
+        pytest.param("*", True, id="any"),
+        pytest.param("etag 1", False, id="not quoted"),
+    ],
+)
+@pytest.mark.helpers
+def test_matches(if_none_match, expected_result):
+    """
+    GIVEN If-None-Match header and ETag
+    WHEN matches is called with the header and ETag
+    THEN the expected result is returned.
+    """
+    returned_result = etag.matches(if_none_match=if_none_match, etag='"etag 1"')
+
+    assert returned_result == expected_result
+
+
+@pytest.mark.helpers
+def test_create_not_modified_response():
+    """
+    GIVEN ETag
+    WHEN create_not_modified_response is called with the ETag
+    THEN a 304 response with the ETag and Cache-Control headers is returned.
+    """
+    returned_response = etag.create_not_modified_response('"etag 1"')
+
+    assert returned_response.status_code == 304
+    assert returned_response.data == b""
+    assert returned_response.headers[etag.ETAG_HEADER] == '"etag 1"'
+    assert returned_response.headers[etag.CACHE_CONTROL_HEADER] == etag.CACHE_CONTROL
+
+
+@pytest.mark.helpers
+def test_add_headers():
+    """
+    GIVEN response and ETag
+    WHEN add_headers is called with the response and ETag
+    THEN the response has the ETag and Cache-Control headers.
+    """
+    response = server.Response("data 1", status=200)
+
+    returned_response = etag.add_headers(response, '"etag 1"')
+
+    assert returned_response.data == b"data 1"
+    assert returned_response.headers[etag.ETAG_HEADER] == '"etag 1"'
+    assert returned_response.headers[etag.CACHE_CONTROL_HEADER] == etag.CACHE_CONTROL
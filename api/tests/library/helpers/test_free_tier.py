@@ -1,5 +1,7 @@
 """Tests for the free tier helper."""
 
+from unittest import mock
+
 import pytest
 from library import config
 from library.helpers import free_tier
@@ -223,3 +225,39 @@ def test_check_within_limit(
         assert str(free_tier_model_count) in returned_result.reason
         for content in expected_contents:
             assert content in returned_result.reason
+
+
+@pytest.mark.parametrize(
+    "current_spec_model_count, expected_result",
+    [
+        pytest.param(0, False, id="spec does not exist"),
+        pytest.param(5, True, id="spec exists"),
+    ],
+)
+@pytest.mark.helpers
+def test_check_within_limit_current_spec_model_count(
+    current_spec_model_count, expected_result, _clean_specs_table, monkeypatch
+):
+    """
+    GIVEN database with a spec and the model count of the spec
+    WHEN check_within_limit is called with the model count of the spec
+    THEN the spec is not retrieved again and the expected result is returned.
+    """
+    config.get().free_tier_model_count = 10
+    user = "user 1"
+    spec_name = "name 1"
+    package_database.get().create_update_spec(
+        sub=user, name=spec_name, version="version 1", model_count=5
+    )
+    mock_get_spec = mock.MagicMock()
+    monkeypatch.setattr(package_database.get(), "get_spec", mock_get_spec)
+
+    returned_result = free_tier.check_within_limit(
+        user=user,
+        spec_name=spec_name,
+        model_count=6,
+        current_spec_model_count=current_spec_model_count,
+    )
+
+    assert returned_result.value == expected_result
+    mock_get_spec.assert_not_called()
@@ -0,0 +1,35 @@
+"""Tests for the page helper."""
+
+import json
+
+import pytest
+from library.helpers import page
+from open_alchemy import package_database
+
+
+@pytest.mark.parametrize(
+    "cursor, expected_headers",
+    [
+        pytest.param(None, {}, id="last page"),
+        pytest.param("cursor 1", {page.NEXT_CURSOR_HEADER: "cursor 1"}, id="next"),
+    ],
+)
+@pytest.mark.helpers
+def test_create_response(cursor, expected_headers):
+    """
+    GIVEN page with items and cursor
+    WHEN create_response is called with the page
+    THEN the items are returned as JSON with the expected headers.
+    """
+    items = [{"id": "id 1"}]
+
+    response = page.create_response(
+        package_database.types.TSpecInfoPage(items=items, cursor=cursor)
+    )
+
+    assert response.status_code == 200
+    assert response.mimetype == "application/json"
+    assert json.loads(response.data.decode()) == items
+    for key, value in expected_headers.items():
+        assert response.headers[key] == value
+    assert (page.NEXT_CURSOR_HEADER in response.headers) == bool(expected_headers)
@@ -0,0 +1,69 @@
+"""Tests for the server timing helper."""
+
+import json
+import logging
+
+import flask
+import pytest
+from library.facades import server
+from library.helpers import server_timing
+from open_alchemy import package_database
+
+
+@pytest.mark.helpers
+def test_add_header_not_started():
+    """
+    GIVEN the recording has not been started
+    WHEN add_header is called
+    THEN the response is returned without the header.
+    """
+    response = server.Response("body 1")
+
+    returned_response = server_timing.add_header(response)
+
+    assert returned_response is response
+    assert server_timing.SERVER_TIMING_HEADER not in response.headers
+
+
+@pytest.mark.helpers
+def test_add_header_no_calls():
+    """
+    GIVEN the recording has been started but the database was not used
+    WHEN add_header is called
+    THEN the response is returned without the header and the recording is ended.
+    """
+    server_timing.start()
+    response = server.Response("body 1")
+
+    server_timing.add_header(response)
+
+    assert server_timing.SERVER_TIMING_HEADER not in response.headers
+    assert package_database.instrumentation.get_summary() is None
+
+
+@pytest.mark.helpers
+def test_add_header(caplog):
+    """
+    GIVEN the recording has been started and the database was used
+    WHEN add_header is called during a request
+    THEN the summary is added as the header and logged.
+    """
+    server_timing.start()
+    summary = package_database.instrumentation.get_summary()
+    summary.record_call(name="get_spec", duration=0.001, sub="sub 1")
+    response = server.Response("body 1")
+
+    with caplog.at_level(logging.INFO, logger=server_timing.__name__):
+        with flask.Flask(__name__).test_request_context("/specs/spec1"):
+            server_timing.add_header(response)
+
+    assert response.headers[server_timing.SERVER_TIMING_HEADER] == (
+        summary.server_timing()
+    )
+    assert package_database.instrumentation.get_summary() is None
+    (record,) = caplog.records
+    logged = json.loads(record.getMessage().split(" ", 2)[2])
+    assert logged["method"] == "GET"
+    assert logged["path"] == "/specs/spec1"
+    assert logged["subs"] == ["sub 1"]
+    assert logged["methods"]["get_spec"]["count"] == 1
@@ -1,9 +1,12 @@
 """Tests for the helpers."""
 
 import json
+from unittest import mock
 
 import pytest
+import yaml
 from library import exceptions
+from library.facades import storage
 from library.helpers import spec
 
 LOAD_ERROR_TESTS = [
@@ -35,6 +38,20 @@ LOAD_ERROR_TESTS = [
         "body must be valid YAML",
         id="invalid YAML value",
     ),
+    pytest.param(
+        "JSON",
+        b'{"key": "\xff"}',
+        exceptions.LoadSpecError,
+        "body must be valid JSON",
+        id="invalid UTF-8 JSON",
+    ),
+    pytest.param(
+        "YAML",
+        b"key: \xff",
+        exceptions.LoadSpecError,
+        "body must be valid YAML",
+        id="invalid UTF-8 YAML",
+    ),
 ]
 
 
@@ -65,6 +82,16 @@ LOAD_TESTS = [
         "key: value",
         id="YAML",
     ),
+    pytest.param(
+        "JSON",
+        b'{"key": "value"}',
+        id="JSON bytes",
+    ),
+    pytest.param(
+        "YAML",
+        b"key: value",
+        id="YAML bytes",
+    ),
 ]
 
 
@@ -105,6 +132,34 @@ def test_calc_version(value, expected_result):
     assert returned_result == expected_result
 
 
+@pytest.mark.parametrize(
+    "spec_bytes_1, language_1, spec_bytes_2, language_2, expected_equal",
+    [
+        pytest.param(b"spec 1", "JSON", b"spec 1", "JSON", True, id="same"),
+        pytest.param(b"spec 1", "JSON", b"spec 2", "JSON", False, id="spec"),
+        pytest.param(b"spec 1", "JSON", b"spec 1", "YAML", False, id="language"),
+    ],
+)
+@pytest.mark.helpers
+def test_calc_content_hash(
+    spec_bytes_1, language_1, spec_bytes_2, language_2, expected_equal
+):
+    """
+    GIVEN two specs and languages
+    WHEN calc_content_hash is called with each spec and language
+    THEN the hashes are equal only if the specs and languages are.
+    """
+    content_hash_1 = spec.calc_content_hash(
+        spec_bytes=spec_bytes_1, language=language_1
+    )
+    content_hash_2 = spec.calc_content_hash(
+        spec_bytes=spec_bytes_2, language=language_2
+    )
+
+    assert len(content_hash_1) == 64
+    assert (content_hash_1 == content_hash_2) == expected_equal
+
+
 @pytest.mark.helpers
 def test_process_invalid_str():
     """
@@ -167,6 +222,99 @@ def test_process():
     assert returned_result.model_count == 1
 
 
+@pytest.mark.helpers
+def test_process_cache(monkeypatch):
+    """
+    GIVEN spec string
+    WHEN process is called twice with the spec, with the encoded spec and then with
+        another language
+    THEN the spec is only processed once per language and the cached result is
+        returned.
+    """
+    spec_dict = {
+        "info": {"version": "1"},
+        "components": {
+            "schemas": {
+                "Schema": {
+                    "type": "object",
+                    "x-tablename": "schema",
+                    "properties": {"id": {"type": "integer"}},
+                }
+            }
+        },
+    }
+    spec_str = json.dumps(spec_dict)
+    mock_get_schemas = mock.MagicMock(wraps=spec.build.get_schemas)
+    monkeypatch.setattr(spec.build, "get_schemas", mock_get_schemas)
+
+    first_result = spec.process(spec_str=spec_str, language="JSON")
+    second_result = spec.process(spec_str=spec_str, language="JSON")
+    bytes_result = spec.process(spec_str=spec_str.encode(), language="JSON")
+
+    assert second_result is first_result
+    assert bytes_result is first_result
+    assert mock_get_schemas.call_count == 1
+    assert spec.PROCESS_CACHE.hits == 2
+    assert spec.PROCESS_CACHE.misses == 1
+
+    spec.process(spec_str=spec_str, language="YAML")
+
+    assert mock_get_schemas.call_count == 2
+    assert len(spec.PROCESS_CACHE) == 2
+
+
+@pytest.mark.helpers
+def test_process_cache_content_hash(monkeypatch):
+    """
+    GIVEN spec string and its content hash
+    WHEN process is called with the content hash and then without it
+    THEN the content hash is not calculated again and the cached result is returned.
+    """
+    spec_str = json.dumps(
+        {
+            "info": {"version": "1"},
+            "components": {
+                "schemas": {
+                    "Schema": {
+                        "type": "object",
+                        "x-tablename": "schema",
+                        "properties": {"id": {"type": "integer"}},
+                    }
+                }
+            },
+        }
+    )
+    content_hash = spec.calc_content_hash(spec_bytes=spec_str.encode(), language="JSON")
+    mock_calc_content_hash = mock.MagicMock(wraps=spec.calc_content_hash)
+    monkeypatch.setattr(spec, "calc_content_hash", mock_calc_content_hash)
+
+    first_result = spec.process(
+        spec_str=spec_str, language="JSON", content_hash=content_hash
+    )
+
+    mock_calc_content_hash.assert_not_called()
+
+    second_result = spec.process(spec_str=spec_str, language="JSON")
+
+    assert second_result is first_result
+    assert mock_calc_content_hash.call_count == 1
+    assert spec.PROCESS_CACHE.hits == 1
+
+
+@pytest.mark.helpers
+def test_process_cache_invalid():
+    """
+    GIVEN spec string that is not valid
+    WHEN process is called twice
+    THEN LoadSpecError is raised both times and nothing is cached.
+    """
+    for _ in range(2):
+        with pytest.raises(exceptions.LoadSpecError):
+            spec.process(spec_str=json.dumps({}), language="JSON")
+
+    assert len(spec.PROCESS_CACHE) == 0
+
+
 @pytest.mark.parametrize(
     "schemas, expected_model_count",
     [
@@ -249,6 +397,51 @@ def test_process():
             1,
             id="multiple x-inherits",
         ),
+        pytest.param(
+            {
+                "Schema": {
+                    "type": "object",
+                    "x-tablename": "schema",
+                    "properties": {"id": {"type": "integer"}},
+                },
+                "ChildSchema": {
+                    "allOf": [
+                        {"$ref": "#/components/schemas/Schema"},
+                        {
+                            "type": "object",
+                            "x-inherits": True,
+                            "x-tablename": "child_schema",
+                            "properties": {"child_id": {"type": "integer"}},
+                        },
+                    ]
+                },
+                "NotModel": {
+                    "type": "object",
+                    "properties": {"value": {"type": "string"}},
+                },
+            },
+            2,
+            id="x-inherits with x-tablename",
+        ),
+        pytest.param(
+            {
+                "Schema": {
+                    "type": "object",
+                    "x-tablename": "schema",
+                    "description": '"x-tablename": "schema"',
+                    "properties": {
+                        "id": {"type": "integer"},
+                        "value": {
+                            "type": "object",
+                            "x-json": True,
+                            "example": {"x-tablename": "schema"},
+                        },
+                    },
+                }
+            },
+            1,
+            id="x-tablename in values",
+        ),
     ],
 )
 @pytest.mark.helpers
@@ -320,3 +513,67 @@ def test_prepare(version, spec_dict, expected_spec_str):
     returned_spec_str = spec.prepare(spec_str=spec_str, version=version)
 
     assert returned_spec_str == expected_spec_str
+
+
+@pytest.mark.parametrize(
+    "components",
+    [
+        pytest.param({"key": "value"}, id="plain"),
+        pytest.param(
+            {"key": ["value 1", 1, 1.5, True, None, {"nested": "line 1\nline 2"}]},
+            id="nested",
+        ),
+        pytest.param({"key": "long value " * 20 + "\u00e9"}, id="unicode"),
+        pytest.param({"key": "long value \n" * 20}, id="space before line break"),
+        pytest.param({"key": "long value\n " * 20}, id="space after line break"),
+        pytest.param({"key": "long value\t" * 20}, id="tab"),
+        pytest.param({"": "value"}, id="empty key"),
+    ],
+)
+@pytest.mark.helpers
+def test_prepare_same_as_default_dumper(components):
+    """
+    GIVEN spec with components
+    WHEN prepare is called with the spec
+    THEN the spec is the same as if the default dumper was used.
+    """
+    version = "1"
+    spec_str = json.dumps({"components": components})
+
+    returned_spec_str = spec.prepare(spec_str=spec_str, version=version)
+
+    assert returned_spec_str == yaml.dump(
+        {"info": {"version": version}}, Dumper=yaml.Dumper
+    ) + yaml.dump({"components": components}, Dumper=yaml.Dumper)
+
+
+@pytest.mark.helpers
+def test_read_prepared():
+    """
+    GIVEN spec stored with and without the prepared spec
+    WHEN read_prepared is called
+    THEN the stored prepared spec is returned or the spec is prepared.
+    """
+    user = "user 1"
+    name = "name 1"
+    spec_str = json.dumps({"components": {"key": "value"}})
+    storage_facade = storage.get_storage_facade()
+    storage_facade.create_update_spec(
+        user=user,
+        name=name,
+        version="1",
+        spec_str=spec_str,
+        prepared_spec_str="prepared spec str 1",
+    )
+    storage_facade.create_update_spec(
+        user=user, name=name, version="2", spec_str=spec_str
+    )
+
+    assert (
+        spec.read_prepared(user=user, name=name, version="1") == "prepared spec str 1"
+    )
+    assert spec.read_prepared(user=user, name=name, version="2") == spec.prepare(
+        spec_str=spec_str, version="2"
+    )
+    with pytest.raises(storage.exceptions.ObjectNotFoundError):
+        spec.read_prepared(user=user, name=name, version="3")
@@ -0,0 +1,16 @@
+"""Fixtures for the specs tests."""
+
+from unittest import mock
+
+import pytest
+from library.facades import server
+
+
+@pytest.fixture(autouse=True)
+def request_headers(monkeypatch):
+    """Mocks the request so that handlers can read headers, returns the headers."""
+    mock_request = mock.MagicMock()
+    mock_request.headers = {}
+    monkeypatch.setattr(server.Request, "request", mock_request)
+
+    return mock_request.headers
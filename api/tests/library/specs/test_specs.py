@@ -4,8 +4,10 @@ import json
 from unittest import mock
 
 import pytest
-from library import specs
+from library import config, exceptions, specs
 from library.facades import server, storage
+from library.helpers import page
+from library.helpers import spec as spec_helper
 from open_alchemy import package_database
 
 
@@ -81,6 +83,51 @@ def test_list_database_error(monkeypatch):
     assert "database" in response.data.decode()
 
 
+@pytest.mark.specs
+def test_list_page(_clean_specs_table):
+    """
+    GIVEN user and database with multiple specs
+    WHEN list_ is called with the user and limit and then with the returned cursor
+    THEN the specs are returned across the pages.
+    """
+    user = "user 1"
+    for spec_name in ["spec name 1", "spec name 2"]:
+        package_database.get().create_update_spec(
+            sub=user, name=spec_name, version="1", model_count=1
+        )
+
+    first_response = specs.list_(user=user, limit=1)
+
+    assert first_response.status_code == 200
+    assert first_response.mimetype == "application/json"
+    assert [info["name"] for info in json.loads(first_response.data.decode())] == [
+        "spec name 1"
+    ]
+    cursor = first_response.headers[page.NEXT_CURSOR_HEADER]
+
+    second_response = specs.list_(user=user, cursor=cursor)
+
+    assert second_response.status_code == 200
+    assert [info["name"] for info in json.loads(second_response.data.decode())] == [
+        "spec name 2"
+    ]
+    assert page.NEXT_CURSOR_HEADER not in second_response.headers
+
+
+@pytest.mark.specs
+def test_list_page_invalid_cursor(_clean_specs_table):
+    """
+    GIVEN user and invalid cursor
+    WHEN list_ is called with the user and cursor
+    THEN a 400 is returned.
+    """
+    response = specs.list_(user="user 1", cursor="invalid")
+
+    assert response.status_code == 400
+    assert response.mimetype == "text/plain"
+    assert "cursor" in response.data.decode()
+
+
 @pytest.mark.specs
 def test_get(_clean_specs_table):
     """
@@ -114,18 +161,24 @@ def test_get(_clean_specs_table):
 
 
 @pytest.mark.specs
-def test_get_database_error(_clean_specs_table, monkeypatch):
+def test_get_single_database_read(_clean_specs_table, monkeypatch):
     """
-    GIVEN user and database that raises an error
+    GIVEN user and database and storage with a single spec
     WHEN get is called with the user and spec id
-    THEN a 500 is returned.
+    THEN the database is read once.
     """
     user = "user 1"
     spec_name = "spec name 1"
-    mock_database_get_latest_spec_version = mock.MagicMock()
-    mock_database_get_latest_spec_version.side_effect = (
-        package_database.exceptions.BaseError
+    version = "1"
+    package_database.get().create_update_spec(
+        sub=user, name=spec_name, version=version, model_count=1
+    )
+    storage.get_storage_facade().create_update_spec(
+        user=user, name=spec_name, version=version, spec_str='{"components":{}}'
     )
+    mock_database_get_spec = mock.MagicMock(wraps=package_database.get().get_spec)
+    monkeypatch.setattr(package_database.get(), "get_spec", mock_database_get_spec)
+    mock_database_get_latest_spec_version = mock.MagicMock()
     monkeypatch.setattr(
         package_database.get(),
         "get_latest_spec_version",
@@ -134,6 +187,26 @@ def test_get_database_error(_clean_specs_table, monkeypatch):
 
     response = specs.get(user=user, spec_name=spec_name)
 
+    assert response.status_code == 200
+    mock_database_get_spec.assert_called_once_with(sub=user, name=spec_name)
+    mock_database_get_latest_spec_version.assert_not_called()
+
+
+@pytest.mark.specs
+def test_get_database_error(_clean_specs_table, monkeypatch):
+    """
+    GIVEN user and database that raises an error
+    WHEN get is called with the user and spec id
+    THEN a 500 is returned.
+    """
+    user = "user 1"
+    spec_name = "spec name 1"
+    mock_database_get_spec = mock.MagicMock()
+    mock_database_get_spec.side_effect = package_database.exceptions.BaseError
+    monkeypatch.setattr(package_database.get(), "get_spec", mock_database_get_spec)
+
+    response = specs.get(user=user, spec_name=spec_name)
+
     assert response.status_code == 500
     assert response.mimetype == "text/plain"
     assert "database" in response.data.decode()
@@ -242,6 +315,9 @@ def test_put(monkeypatch, _clean_specs_table):
     assert '"Schema"' in spec_str
     assert '"x-tablename"' in spec_str
     assert '"schema"' in spec_str
+    assert storage.get_storage_facade().get_prepared_spec(
+        user=user, name=spec_name, version=version
+    ) == spec_helper.prepare(spec_str=spec_str, version=version)
 
     assert package_database.get().count_customer_models(sub=user) == 1
     spec_infos = package_database.get().list_specs(sub=user)
@@ -253,11 +329,113 @@ def test_put(monkeypatch, _clean_specs_table):
     assert spec_info["title"] == title
     assert spec_info["description"] == description
     assert spec_info["model_count"] == 1
+    assert spec_info["content_hash"] == spec_helper.calc_content_hash(
+        spec_bytes=body.encode(), language="JSON"
+    )
     assert "updated_at" in spec_info
 
     assert response.status_code == 204
 
 
+@pytest.mark.specs
+def test_put_unchanged(monkeypatch, _clean_specs_table):
+    """
+    GIVEN body, spec id and user where the spec was already stored with the body
+    WHEN put is called with the body, spec id and user
+    THEN 204 is returned without processing or storing the spec.
+    """
+    mock_request = mock.MagicMock()
+    mock_headers = {"X-LANGUAGE": "JSON"}
+    mock_request.headers = mock_headers
+    monkeypatch.setattr(server.Request, "request", mock_request)
+    body = json.dumps(
+        {
+            "info": {"version": "1"},
+            "components": {
+                "schemas": {
+                    "Schema": {
+                        "type": "object",
+                        "x-tablename": "schema",
+                        "properties": {"id": {"type": "integer"}},
+                    }
+                }
+            },
+        }
+    )
+    spec_name = "id 1"
+    user = "user 1"
+    assert (
+        specs.put(body=body.encode(), spec_name=spec_name, user=user).status_code == 204
+    )
+    mock_process = mock.MagicMock()
+    mock_process.side_effect = exceptions.LoadSpecError
+    monkeypatch.setattr(spec_helper, "process", mock_process)
+    mock_storage_create_update_spec = mock.MagicMock()
+    monkeypatch.setattr(
+        storage.get_storage_facade(),
+        "create_update_spec",
+        mock_storage_create_update_spec,
+    )
+
+    response = specs.put(body=body.encode(), spec_name=spec_name, user=user)
+
+    assert response.status_code == 204
+    mock_process.assert_not_called()
+    mock_storage_create_update_spec.assert_not_called()
+    assert len(package_database.get().list_spec_versions(sub=user, name=spec_name)) == 1
+
+    mock_headers["X-LANGUAGE"] = "YAML"
+
+    response = specs.put(body=body.encode(), spec_name=spec_name, user=user)
+
+    assert response.status_code == 400
+    mock_process.assert_called_once()
+
+
+@pytest.mark.specs
+def test_put_changed(monkeypatch, _clean_specs_table):
+    """
+    GIVEN body, spec id and user where the spec was already stored with another body
+    WHEN put is called with the body, spec id and user
+    THEN the spec is only read from the database once and the new version is stored.
+    """
+    mock_request = mock.MagicMock()
+    mock_request.headers = {"X-LANGUAGE": "JSON"}
+    monkeypatch.setattr(server.Request, "request", mock_request)
+    spec_name = "id 1"
+    user = "user 1"
+
+    def create_body(version):
+        """Create the body of a spec with a version."""
+        return json.dumps(
+            {
+                "info": {"version": version},
+                "components": {
+                    "schemas": {
+                        "Schema": {
+                            "type": "object",
+                            "x-tablename": "schema",
+                            "properties": {"id": {"type": "integer"}},
+                        }
+                    }
+                },
+            }
+        ).encode()
+
+    specs.put(body=create_body("1"), spec_name=spec_name, user=user)
+    mock_database_get_spec = mock.MagicMock(wraps=package_database.get().get_spec)
+    monkeypatch.setattr(package_database.get(), "get_spec", mock_database_get_spec)
+
+    response = specs.put(body=create_body("2"), spec_name=spec_name, user=user)
+
+    assert response.status_code == 204
+    mock_database_get_spec.assert_called_once()
+    assert (
+        package_database.get().get_latest_spec_version(sub=user, name=spec_name) == "2"
+    )
+    assert package_database.get().count_customer_models(sub=user) == 1
+
+
 @pytest.mark.specs
 def test_put_invalid_spec_error(monkeypatch):
     """
@@ -280,6 +458,28 @@ def test_put_invalid_spec_error(monkeypatch):
     assert "not valid" in response.data.decode()
 
 
+@pytest.mark.specs
+def test_put_too_large_error(monkeypatch):
+    """
+    GIVEN body that is larger than the maximum size and spec id and user
+    WHEN put is called with the body, spec id and user
+    THEN a 413 is returned without processing the spec.
+    """
+    monkeypatch.setattr(config.get(), "spec_max_size", 4)
+    mock_process = mock.MagicMock()
+    monkeypatch.setattr(spec_helper, "process", mock_process)
+    body = "body 1"
+    spec_name = "id 1"
+    user = "user 1"
+
+    response = specs.put(body=body.encode(), spec_name=spec_name, user=user)
+
+    assert response.status_code == 413
+    assert response.mimetype == "text/plain"
+    assert "maximum of 4 bytes" in response.data.decode()
+    mock_process.assert_not_called()
+
+
 @pytest.mark.specs
 def test_put_too_many_models_error(monkeypatch, _clean_specs_table):
     """
@@ -532,3 +732,69 @@ def test_delete_storage_error(monkeypatch, _clean_specs_table):
 
     assert package_database.get().count_customer_models(sub=user) == 0
     assert response.status_code == 204
+
+
+@pytest.mark.specs
+def test_get_etag(_clean_specs_table, request_headers, monkeypatch):
+    """
+    GIVEN user and database and storage with a single spec
+    WHEN get is called and then get is called with the ETag in If-None-Match
+    THEN the ETag and Cache-Control headers are returned and then 304 is returned
+        without reading the storage.
+    """
+    user = "user 1"
+    spec_name = "spec name 1"
+    version = "1"
+    package_database.get().create_update_spec(
+        sub=user, name=spec_name, version=version, model_count=1
+    )
+    storage.get_storage_facade().create_update_spec(
+        user=user, name=spec_name, version=version, spec_str='{"components":{}}'
+    )
+
+    response = specs.get(user=user, spec_name=spec_name)
+
+    assert response.status_code == 200
+    response_etag = response.headers["ETag"]
+    assert response_etag.startswith('"')
+    assert response.headers["Cache-Control"] == "private, no-cache"
+
+    mock_storage_get = mock.MagicMock()
+    monkeypatch.setattr(storage.get_storage(), "get", mock_storage_get)
+    request_headers["If-None-Match"] = response_etag
+
+    response = specs.get(user=user, spec_name=spec_name)
+
+    assert response.status_code == 304
+    assert response.data == b""
+    assert response.headers["ETag"] == response_etag
+    assert response.headers["Cache-Control"] == "private, no-cache"
+    mock_storage_get.assert_not_called()
+
+
+@pytest.mark.specs
+def test_get_etag_changed(_clean_specs_table, request_headers):
+    """
+    GIVEN user and database and storage with a single spec and If-None-Match header
+        with a different ETag
+    WHEN get is called
+    THEN the spec value is returned with the ETag.
+    """
+    user = "user 1"
+    spec_name = "spec name 1"
+    version = "1"
+    package_database.get().create_update_spec(
+        sub=user, name=spec_name, version=version, model_count=1
+    )
+    storage.get_storage_facade().create_update_spec(
+        user=user, name=spec_name, version=version, spec_str='{"components":{}}'
+    )
+    request_headers["If-None-Match"] = '"etag 1"'
+
+    response = specs.get(user=user, spec_name=spec_name)
+
+    assert response.status_code == 200
+    assert response.headers["ETag"] != '"etag 1"'
+    response_data_json = json.loads(response.data.decode())
+    assert "components: {}" in response_data_json["value"]
+    assert response_data_json["name"] == spec_name
@@ -1,10 +1,15 @@
 """Tests for the specs endpoint."""
 
 import json
+import threading
+import time
 from unittest import mock
 
 import pytest
+from library import config
 from library.facades import server, storage
+from library.helpers import page
+from library.helpers import spec as spec_helper
 from library.specs import versions
 from open_alchemy import package_database
 
@@ -55,6 +60,70 @@ def test_list_not_found(_clean_specs_table):
     assert spec_name in response.data.decode()
 
 
+@pytest.mark.specs_versions
+def test_list_page(monkeypatch, _clean_specs_table):
+    """
+    GIVEN user, spec id and database with multiple versions of the spec
+    WHEN list_ is called with the user, spec id and limit and then with the
+        returned cursor
+    THEN the versions are returned newest first across the pages.
+    """
+    mock_time = mock.MagicMock()
+    monkeypatch.setattr(time, "time", mock_time)
+    user = "user 1"
+    spec_name = "spec name 1"
+    for idx, version in enumerate(["1", "2", "3"]):
+        mock_time.return_value = 1000000 * (idx + 1)
+        package_database.get().create_update_spec(
+            sub=user, name=spec_name, version=version, model_count=1
+        )
+
+    first_response = versions.list_(user=user, spec_name=spec_name, limit=2)
+
+    assert first_response.status_code == 200
+    assert first_response.mimetype == "application/json"
+    assert [info["version"] for info in json.loads(first_response.data.decode())] == [
+        "3",
+        "2",
+    ]
+    cursor = first_response.headers[page.NEXT_CURSOR_HEADER]
+
+    second_response = versions.list_(user=user, spec_name=spec_name, cursor=cursor)
+
+    assert second_response.status_code == 200
+    assert [info["version"] for info in json.loads(second_response.data.decode())] == [
+        "1"
+    ]
+    assert page.NEXT_CURSOR_HEADER not in second_response.headers
+
+
+@pytest.mark.specs_versions
+def test_list_page_not_found(_clean_specs_table):
+    """
+    GIVEN user, spec id and empty database
+    WHEN list_ is called with the user, spec id and limit
+    THEN 404 is returned.
+    """
+    response = versions.list_(user="user 1", spec_name="spec name 1", limit=1)
+
+    assert response.status_code == 404
+    assert response.mimetype == "text/plain"
+
+
+@pytest.mark.specs_versions
+def test_list_page_invalid_cursor(_clean_specs_table):
+    """
+    GIVEN user, spec id and invalid cursor
+    WHEN list_ is called with the user, spec id and cursor
+    THEN 400 is returned.
+    """
+    response = versions.list_(user="user 1", spec_name="spec name 1", cursor="a")
+
+    assert response.status_code == 400
+    assert response.mimetype == "text/plain"
+    assert "cursor" in response.data.decode()
+
+
 @pytest.mark.specs_versions
 def test_list_database_error(monkeypatch):
     """
@@ -111,12 +180,45 @@ def test_get(_clean_specs_table):
     assert response_data_json["version"] == version
 
 
+@pytest.mark.specs_versions
+def test_get_storage_thread(_clean_specs_table, monkeypatch):
+    """
+    GIVEN user and version and database and storage with a single spec
+    WHEN get is called with the user and spec id
+    THEN the spec is read from storage on the thread pool of the database.
+    """
+    user = "user 1"
+    spec_name = "spec name 1"
+    version = "1"
+    package_database.get().create_update_spec(
+        sub=user, name=spec_name, version=version, model_count=1
+    )
+    storage.get_storage_facade().create_update_spec(
+        user=user, name=spec_name, version=version, spec_str='{"components":{}}'
+    )
+    thread_names = []
+    read_prepared = spec_helper.read_prepared
+
+    def mock_read_prepared(**kwargs):
+        """Record the name of the thread and read the spec."""
+        thread_names.append(threading.current_thread().name)
+        return read_prepared(**kwargs)
+
+    monkeypatch.setattr(spec_helper, "read_prepared", mock_read_prepared)
+
+    response = versions.get(user=user, spec_name=spec_name, version=version)
+
+    assert response.status_code == 200
+    assert len(thread_names) == 1
+    assert thread_names[0].startswith("package-database")
+
+
 @pytest.mark.specs_versions
 def test_get_database_miss():
     """
     GIVEN user and version and databasewithout and storage with a single spec
     WHEN get is called with the user and spec id
-    THEN 500 is returned.
+    THEN 404 is returned.
     """
     user = "user 1"
     spec_name = "spec name 1"
@@ -131,6 +233,26 @@ def test_get_database_miss():
 
     response = versions.get(user=user, spec_name=spec_name, version=version)
 
+    assert response.status_code == 404
+    assert response.mimetype == "text/plain"
+    assert spec_name in response.data.decode()
+
+
+@pytest.mark.specs_versions
+def test_get_database_error(monkeypatch, request_headers):
+    """
+    GIVEN user and version and database that raises an error and If-None-Match
+        header
+    WHEN get is called with the user and spec id
+    THEN 500 is returned.
+    """
+    request_headers["If-None-Match"] = '"etag 1"'
+    mock_database_get_spec = mock.MagicMock()
+    mock_database_get_spec.side_effect = package_database.exceptions.BaseError
+    monkeypatch.setattr(package_database.get(), "get_spec", mock_database_get_spec)
+
+    response = versions.get(user="user 1", spec_name="spec name 1", version="1")
+
     assert response.status_code == 500
     assert response.mimetype == "text/plain"
     assert "database" in response.data.decode()
@@ -217,6 +339,9 @@ def test_put(monkeypatch, _clean_specs_table):
     assert '"Schema"' in spec_str
     assert '"x-tablename"' in spec_str
     assert '"schema"' in spec_str
+    assert storage.get_storage_facade().get_prepared_spec(
+        user=user, name=spec_name, version=version
+    ) == spec_helper.prepare(spec_str=spec_str, version=version)
 
     assert package_database.get().count_customer_models(sub=user) == 1
     spec_infos = package_database.get().list_specs(sub=user)
@@ -228,6 +353,9 @@ def test_put(monkeypatch, _clean_specs_table):
     assert spec_info["title"] == title
     assert spec_info["description"] == description
     assert spec_info["model_count"] == 1
+    assert spec_info["content_hash"] == spec_helper.calc_content_hash(
+        spec_bytes=body.encode(), language="JSON"
+    )
     assert "updated_at" in spec_info
 
     assert response.status_code == 204
@@ -258,6 +386,31 @@ def test_put_invalid_spec_error(monkeypatch):
     assert "not valid" in response.data.decode()
 
 
+@pytest.mark.specs_versions
+def test_put_too_large_error(monkeypatch):
+    """
+    GIVEN body that is larger than the maximum size, spec id, user and version
+    WHEN put is called with the body, spec id, user and version
+    THEN a 413 is returned without processing the spec.
+    """
+    monkeypatch.setattr(config.get(), "spec_max_size", 4)
+    mock_process = mock.MagicMock()
+    monkeypatch.setattr(spec_helper, "process", mock_process)
+    body = "body 1"
+    spec_name = "id 1"
+    user = "user 1"
+    version = "1"
+
+    response = versions.put(
+        body=body.encode(), spec_name=spec_name, version=version, user=user
+    )
+
+    assert response.status_code == 413
+    assert response.mimetype == "text/plain"
+    assert "maximum of 4 bytes" in response.data.decode()
+    mock_process.assert_not_called()
+
+
 @pytest.mark.specs_versions
 def test_put_version_mismatch_error(monkeypatch):
     """
@@ -468,3 +621,107 @@ def test_put_database_update_error(monkeypatch, _clean_specs_table):
     assert response.status_code == 500
     assert response.mimetype == "text/plain"
     assert "database" in response.data.decode()
+
+
+@pytest.mark.specs_versions
+def test_get_etag(_clean_specs_table, request_headers, monkeypatch):
+    """
+    GIVEN user and database and storage with a single spec
+    WHEN get is called and then get is called with the ETag in If-None-Match
+    THEN the ETag and Cache-Control headers are returned and then 304 is returned
+        without reading the storage.
+    """
+    user = "user 1"
+    spec_name = "spec name 1"
+    version = "1"
+    package_database.get().create_update_spec(
+        sub=user, name=spec_name, version=version, model_count=1
+    )
+    storage.get_storage_facade().create_update_spec(
+        user=user, name=spec_name, version=version, spec_str='{"components":{}}'
+    )
+
+    response = versions.get(user=user, spec_name=spec_name, version=version)
+
+    assert response.status_code == 200
+    response_etag = response.headers["ETag"]
+    assert response_etag.startswith('"')
+    assert response.headers["Cache-Control"] == "private, no-cache"
+
+    mock_storage_get = mock.MagicMock()
+    monkeypatch.setattr(storage.get_storage(), "get", mock_storage_get)
+    request_headers["If-None-Match"] = response_etag
+
+    response = versions.get(user=user, spec_name=spec_name, version=version)
+
+    assert response.status_code == 304
+    assert response.data == b""
+    assert response.headers["ETag"] == response_etag
+    assert response.headers["Cache-Control"] == "private, no-cache"
+    mock_storage_get.assert_not_called()
+
+
+@pytest.mark.specs_versions
+def test_get_etag_changed(_clean_specs_table, request_headers):
+    """
+    GIVEN user and database and storage with a single spec and If-None-Match header
+        with a different ETag
+    WHEN get is called
+    THEN the spec value is returned with the ETag.
+    """
+    user = "user 1"
+    spec_name = "spec name 1"
+    version = "1"
+    package_database.get().create_update_spec(
+        sub=user, name=spec_name, version=version, model_count=1
+    )
+    storage.get_storage_facade().create_update_spec(
+        user=user, name=spec_name, version=version, spec_str='{"components":{}}'
+    )
+    request_headers["If-None-Match"] = '"etag 1"'
+
+    response = versions.get(user=user, spec_name=spec_name, version=version)
+
+    assert response.status_code == 200
+    assert response.headers["ETag"] != '"etag 1"'
+    response_data_json = json.loads(response.data.decode())
+    assert "components: {}" in response_data_json["value"]
+    assert response_data_json["name"] == spec_name
+
+
+@pytest.mark.specs_versions
+def test_get_etag_storage_miss(_clean_specs_table, request_headers):
+    """
+    GIVEN user and database with a spec and empty storage and If-None-Match header
+    WHEN get is called
+    THEN 404 is returned.
+    """
+    user = "user 1"
+    spec_name = "spec name 1"
+    version = "1"
+    package_database.get().create_update_spec(
+        sub=user, name=spec_name, version=version, model_count=1
+    )
+    request_headers["If-None-Match"] = '"etag 1"'
+
+    response = versions.get(user=user, spec_name=spec_name, version="2")
+
+    assert response.status_code == 404
+    assert response.mimetype == "text/plain"
+
+
+@pytest.mark.specs_versions
+def test_get_etag_database_miss(_clean_specs_table, request_headers):
+    """
+    GIVEN user and empty database and storage and If-None-Match header
+    WHEN get is called
+    THEN 404 is returned.
+    """
+    spec_name = "spec name 1"
+    request_headers["If-None-Match"] = '"etag 1"'
+
+    response = versions.get(user="user 1", spec_name=spec_name, version="1")
+
+    assert response.status_code == 404
+    assert response.mimetype == "text/plain"
+    assert spec_name in response.data.decode()
@@ -33,6 +33,7 @@ from library import config
             "free_tier_model_count",
             id="free_tier_model_count",
         ),
+        pytest.param("SPEC_MAX_SIZE", "spec_max_size", id="spec_max_size"),
     ],
 )
 @pytest.mark.config
@@ -58,6 +59,9 @@ def test_config_env_missing(monkeypatch, env_name, config_name):
             "free_tier_model_count",
             id="free_tier_model_count invalid",
         ),
+        pytest.param(
+            "SPEC_MAX_SIZE", "invalid", "spec_max_size", id="spec_max_size invalid"
+        ),
     ],
 )
 @pytest.mark.config
@@ -112,6 +116,7 @@ def test_config_env_invalid(monkeypatch, env_name, env_value, config_name):
             1,
             id="free_tier_model_count",
         ),
+        pytest.param("SPEC_MAX_SIZE", "1", "spec_max_size", 1, id="spec_max_size"),
     ],
 )
 @pytest.mark.config
@@ -164,6 +169,7 @@ def test_config_env_set(monkeypatch, env_name, env_value, config_name, expected_
             1,
             id="free_tier_model_count",
         ),
+        pytest.param("SPEC_MAX_SIZE", "spec_max_size", 1, id="spec_max_size"),
     ],
 )
 @pytest.mark.config
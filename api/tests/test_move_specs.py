@@ -0,0 +1,152 @@
+"""Tests for moving the specs to the specs folder."""
+
+import time
+from unittest import mock
+
+import move_specs
+import pytest
+from library.facades import storage
+
+USER = "user 1"
+NAME = "name 1"
+PACKAGE_KEY = f"{USER}/{NAME}/name_1-version_1.tar.gz"
+LEGACY_KEYS = [
+    f"{USER}/{NAME}/version 1-spec.yaml",
+    f"{USER}/{NAME}/version 1-spec.json",
+    f"{USER}/{NAME}/version 2-spec.json",
+]
+
+
+@pytest.fixture(autouse=True)
+def _legacy_specs():
+    """Store specs, a prepared spec and a package next to each other."""
+    storage.get_storage().set(
+        key=f"{USER}/{NAME}/version 1-spec.json", value="spec str 1"
+    )
+    storage.get_storage().set(
+        key=f"{USER}/{NAME}/version 1-spec.yaml", value="prepared spec str 1"
+    )
+    storage.get_storage().set(
+        key=f"{USER}/{NAME}/version 2-spec.json", value="spec str 2"
+    )
+    storage.get_storage().set(key=PACKAGE_KEY, value="package 1")
+
+
+@pytest.mark.storage
+def test_move():
+    """
+    GIVEN specs, prepared spec and package stored next to each other and a spec
+        stored in the specs folder
+    WHEN move is called
+    THEN the specs are copied to the specs folder and the package and the spec in
+        the specs folder are not copied.
+    """
+    storage_instance = storage.get_storage_facade()
+    storage_instance.create_update_spec(
+        user=USER, name=NAME, version="version 3", spec_str="spec str 3"
+    )
+
+    copied_keys = move_specs.move(storage.get_storage())
+
+    assert copied_keys == LEGACY_KEYS
+    assert storage.get_storage().list(prefix=f"{USER}/{NAME}/", delimiter="/") == [
+        PACKAGE_KEY,
+        *sorted(LEGACY_KEYS),
+    ]
+    assert storage_instance.get_spec_versions(user=USER, name=NAME) == [
+        "version 1",
+        "version 2",
+        "version 3",
+    ]
+    assert (
+        storage_instance.get_spec(user=USER, name=NAME, version="version 2")
+        == "spec str 2"
+    )
+    assert (
+        storage_instance.get_prepared_spec(user=USER, name=NAME, version="version 1")
+        == "prepared spec str 1"
+    )
+    stored_prepared_spec = storage.get_storage().storage[
+        f"{USER}/{NAME}/specs/version 1-spec.yaml"
+    ]
+    assert stored_prepared_spec.content_encoding == "gzip"
+
+
+@pytest.mark.storage
+def test_move_delete_legacy():
+    """
+    GIVEN specs, prepared spec and package stored next to each other
+    WHEN move is called with delete_legacy
+    THEN the specs are copied to the specs folder and deleted next to the package.
+    """
+    copied_keys = move_specs.move(storage.get_storage(), delete_legacy=True)
+
+    assert copied_keys == LEGACY_KEYS
+    assert storage.get_storage().list(prefix=f"{USER}/{NAME}/", delimiter="/") == [
+        PACKAGE_KEY
+    ]
+    assert storage.get_storage_facade().get_spec_versions(user=USER, name=NAME) == [
+        "version 1",
+        "version 2",
+    ]
+
+
+@pytest.mark.storage
+def test_move_again():
+    """
+    GIVEN specs that were copied to the specs folder after which one of them was
+        changed next to the package
+    WHEN move is called again with delete_legacy
+    THEN only the changed spec is copied and the specs next to the package are
+        deleted.
+    """
+    move_specs.move(storage.get_storage())
+    storage.get_storage().set(
+        key=f"{USER}/{NAME}/version 2-spec.json", value="spec str 2 changed"
+    )
+
+    copied_keys = move_specs.move(storage.get_storage(), delete_legacy=True)
+
+    assert copied_keys == [f"{USER}/{NAME}/version 2-spec.json"]
+    assert storage.get_storage().list(prefix=f"{USER}/{NAME}/", delimiter="/") == [
+        PACKAGE_KEY
+    ]
+    assert (
+        storage.get_storage_facade().get_spec(user=USER, name=NAME, version="version 2")
+        == "spec str 2 changed"
+    )
+
+
+@pytest.mark.storage
+def test_move_batches(monkeypatch):
+    """
+    GIVEN specs stored next to the package
+    WHEN move is called with a batch size of 1
+    THEN the copying pauses for the interval between the specs but not before the
+        prepared spec is copied.
+    """
+    mock_sleep = mock.MagicMock()
+    monkeypatch.setattr(time, "sleep", mock_sleep)
+
+    copied_keys = move_specs.move(storage.get_storage(), batch_size=1, interval=2.5)
+
+    assert copied_keys == LEGACY_KEYS
+    mock_sleep.assert_called_once_with(2.5)
+
+
+@pytest.mark.storage
+def test_move_nothing():
+    """
+    GIVEN specs stored in the specs folder only
+    WHEN move is called with delete_legacy
+    THEN nothing is copied or deleted.
+    """
+    storage.get_storage().delete_all(keys=LEGACY_KEYS)
+    storage.get_storage_facade().create_update_spec(
+        user=USER, name=NAME, version="version 1", spec_str="spec str 1"
+    )
+
+    assert move_specs.move(storage.get_storage(), delete_legacy=True) == []
+    assert storage.get_storage_facade().get_spec_versions(user=USER, name=NAME) == [
+        "version 1"
+    ]
@@ -1,6 +1,7 @@
 """Main function for lambda."""
 
 import dataclasses
+import functools
 import json
 import pathlib
 import shutil
@@ -10,8 +11,20 @@ from urllib import parse
 import boto3
 import library
 from botocore import client
+from botocore import config as botocore_config
 
-S3_CLIENT = boto3.client("s3")
+# Matches the clients of the other functions, the read timeout is left at the default
+# because packages can be large
+S3_CONFIG = botocore_config.Config(
+    connect_timeout=2,
+    retries={"mode": "standard", "max_attempts": 3},
+)
+
+
+@functools.lru_cache(maxsize=None)
+def get_s3_client():
+    """Create the S3 client the first time it is used and re-use it after that."""
+    return boto3.client("s3", config=S3_CONFIG)
 
 
 def setup(directory: str) -> pathlib.Path:
@@ -223,7 +236,7 @@ def retrieve_spec(notification: Notification, build_path: pathlib.Path) -> pathl
 
     """
     spec_path = build_path / "spec.json"
-    S3_CLIENT.download_file(
+    get_s3_client().download_file(
         notification.bucket_name,
         notification.object_key,
         str(spec_path),
@@ -241,7 +254,7 @@ def upload_packages(notification: Notification, packages: library.PackageList) -
 
     """
     for package in packages:
-        S3_CLIENT.upload_file(
+        get_s3_client().upload_file(
             str(package.path), notification.bucket_name, package.storage_location
         )
 
@@ -257,7 +270,7 @@ def spec_exists(notification: Notification) -> bool:
         Whether the spec file in the SNS notification exists.
 
     """
-    response = S3_CLIENT.list_objects_v2(
+    response = get_s3_client().list_objects_v2(
         Bucket=notification.bucket_name, Prefix=notification.object_key
     )
 
@@ -289,7 +302,7 @@ def delete_packages_if_spec_deleted(
     if spec_exists_result:
         return
 
-    S3_CLIENT.delete_objects(
+    get_s3_client().delete_objects(
         Bucket=notification.bucket_name,
         Delete={"Objects": [{"Key": package.storage_location} for package in packages]},
     )
@@ -28,6 +28,9 @@ def parse_spec_storage_location(location: str) -> SpecStorageLocation:
     """
     Parse the spec storage location into components.
 
+    Specs are stored in the specs folder of the spec, specs that were stored before
+    that are stored next to the packages.
+
     Args:
         location: The spec storage location to parse.
 
@@ -35,7 +38,7 @@ def parse_spec_storage_location(location: str) -> SpecStorageLocation:
         The parsed spec storage location.
 
     """
-    sub, spec_id, filename = location.split("/")
+    sub, spec_id, *_, filename = location.split("/")
     version = filename[: -len("-spec.json")]
     return SpecStorageLocation(sub, spec_id, version)
 
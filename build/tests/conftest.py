@@ -8,7 +8,7 @@ from botocore import stub
 @pytest.fixture
 def stubbed_s3_client():
     """Stubs the S3 client."""
-    stubber = stub.Stubber(app.S3_CLIENT)
+    stubber = stub.Stubber(app.get_s3_client())
 
     yield stubber
 
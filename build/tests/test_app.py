@@ -330,6 +330,19 @@ def test_parse_event():
     assert returned_notification.object_key == "key 1"
 
 
+def test_get_s3_client():
+    """
+    GIVEN
+    WHEN get_s3_client is called multiple times
+    THEN the same client is returned which uses the S3 configuration.
+    """
+    s3_client = app.get_s3_client()
+
+    assert s3_client.meta.config.connect_timeout == app.S3_CONFIG.connect_timeout
+    assert s3_client.meta.config.retries == app.S3_CONFIG.retries
+    assert app.get_s3_client() is s3_client
+
+
 def test_retrieve_spec(tmp_path, monkeypatch):
     """
     GIVEN notification, build path and stubbed s3 download_file
@@ -342,7 +355,7 @@ def test_retrieve_spec(tmp_path, monkeypatch):
     notification = app.Notification(bucket_name=bucket_name, object_key=object_key)
     spec_path = tmp_path / "spec.json"
     mock_download_file = mock.MagicMock()
-    monkeypatch.setattr(app.S3_CLIENT, "download_file", mock_download_file)
+    monkeypatch.setattr(app.get_s3_client(), "download_file", mock_download_file)
 
     returned_path = app.retrieve_spec(notification, tmp_path)
 
@@ -371,7 +384,7 @@ def test_upload_packages(monkeypatch):
         ),
     ]
     mock_upload_file = mock.MagicMock()
-    monkeypatch.setattr(app.S3_CLIENT, "upload_file", mock_upload_file)
+    monkeypatch.setattr(app.get_s3_client(), "upload_file", mock_upload_file)
 
     app.upload_packages(notification, packages)
 
@@ -404,7 +417,7 @@ def test_spec_exists_error(monkeypatch, response):
 
     mock_list_objects_v2 = mock.MagicMock()
     mock_list_objects_v2.return_value = response
-    monkeypatch.setattr(app.S3_CLIENT, "list_objects_v2", mock_list_objects_v2)
+    monkeypatch.setattr(app.get_s3_client(), "list_objects_v2", mock_list_objects_v2)
 
     with pytest.raises(AssertionError):
         app.spec_exists(notification)
@@ -459,7 +472,7 @@ def test_delete_packages_if_spec_deleted_mocked(
     packages = []
 
     mock_delete_objects = mock.MagicMock()
-    monkeypatch.setattr(app.S3_CLIENT, "delete_objects", mock_delete_objects)
+    monkeypatch.setattr(app.get_s3_client(), "delete_objects", mock_delete_objects)
 
     app.delete_packages_if_spec_deleted(spec_exists_result, notification, packages)
 
@@ -7,7 +7,14 @@ import library
 import pytest
 
 
-def test_parse_spec_storage_location():
+@pytest.mark.parametrize(
+    "folder",
+    [
+        pytest.param("", id="next to packages"),
+        pytest.param("specs/", id="specs folder"),
+    ],
+)
+def test_parse_spec_storage_location(folder):
     """
     GIVEN spec storage location
     WHEN parse_spec_storage_location is called
@@ -16,7 +23,7 @@ def test_parse_spec_storage_location():
     sub = "sub 1"
     spec_id = "spec id 1"
     version = "version 1"
-    spec_storage_location = f"{sub}/{spec_id}/{version}-spec.json"
+    spec_storage_location = f"{sub}/{spec_id}/{folder}{version}-spec.json"
 
     returned_location = library.parse_spec_storage_location(spec_storage_location)
 
@@ -0,0 +1,368 @@
+"""Fixtures for the database benchmarks."""
+
+import dataclasses
+import json
+import pathlib
+import statistics
+import time
+import typing
+
+import pytest
+from open_alchemy.package_database import factory, instrumentation, models, types
+
+pytest_plugins = [
+    "open_alchemy.package_database.pytest_plugin",
+]
+
+BASELINES_FILE = pathlib.Path(__file__).parent / "baselines.json"
+
+
+def pytest_addoption(parser):
+    """Add the benchmark options."""
+    group = parser.getgroup("benchmark")
+    group.addoption(
+        "--benchmark-customers",
+        type=int,
+        default=3,
+        help="The number of customers to seed.",
+    )
+    group.addoption(
+        "--benchmark-specs",
+        type=int,
+        default=10,
+        help="The number of specs to seed for each customer.",
+    )
+    group.addoption(
+        "--benchmark-versions",
+        type=int,
+        default=5,
+        help="The number of versions to seed for each spec.",
+    )
+    group.addoption(
+        "--benchmark-rounds",
+        type=int,
+        default=20,
+        help="The number of times each method is called.",
+    )
+    group.addoption(
+        "--benchmark-tolerance",
+        type=float,
+        default=2.0,
+        help=(
+            "The factor by which the p50 latency relative to reading a single item "
+            "may exceed the baseline."
+        ),
+    )
+    group.addoption(
+        "--benchmark-save-baselines",
+        action="store_true",
+        help="Store the results as the new baselines instead of comparing with them.",
+    )
+
+
+@dataclasses.dataclass
+class Parameters:
+    """
+    The size of the seeded data and how often each method is called.
+
+    Attrs:
+        customers: The number of customers.
+        specs: The number of specs of each customer.
+        versions: The number of versions of each spec.
+        rounds: The number of times each method is called.
+
+    """
+
+    customers: int
+    specs: int
+    versions: int
+    rounds: int
+
+
+@dataclasses.dataclass
+class Result:
+    """
+    The outcome of benchmarking a method.
+
+    Attrs:
+        p50_ms: The median duration of a call in milliseconds.
+        p99_ms: The 99th percentile duration of a call in milliseconds.
+        p50_relative: The median duration of a call divided by the median duration
+            of reading a single item in the same rounds.
+        capacity_units: The mean consumed capacity units of a call.
+        requests: The mean number of requests to the database of a call.
+
+    """
+
+    p50_ms: float
+    p99_ms: float
+    p50_relative: float
+    capacity_units: float
+    requests: float
+
+
+@dataclasses.dataclass
+class Dataset:
+    """
+    The seeded data.
+
+    Attrs:
+        subs: The customers.
+        spec_names: The names of the specs of each customer.
+        public_keys: The public key of the credentials of each customer.
+
+    """
+
+    subs: typing.List[types.TSub]
+    spec_names: typing.List[types.TSpecName]
+    public_keys: typing.List[types.TCredentialsPublicKey]
+
+
+_RESULTS: typing.Dict[str, Result] = {}
+
+
+class Benchmark:
+    """
+    Time a method and compare the result with the baseline.
+
+    The duration is compared relative to the duration of reading a single item,
+    which is timed in each round as well, so that the comparison does not depend
+    on how fast the machine and the database are.
+
+    """
+
+    def __init__(
+        self,
+        *,
+        parameters: Parameters,
+        baselines: typing.Dict[str, typing.Dict[str, float]],
+        tolerance: float,
+        reference: typing.Callable[[], typing.Any],
+    ) -> None:
+        """Construct."""
+        self._parameters = parameters
+        self._baselines = baselines
+        self._tolerance = tolerance
+        self._reference = reference
+
+    def __call__(
+        self,
+        name: str,
+        func: typing.Callable[[int], typing.Any],
+        *,
+        setup: typing.Optional[typing.Callable[[int], typing.Any]] = None,
+    ) -> Result:
+        """
+        Call a function for each round and record the outcome.
+
+        Args:
+            name: The name of the benchmark.
+            func: Called with the round, the call is measured.
+            setup: Called with the round before func, the call is not measured.
+
+        Returns:
+            The outcome of the benchmark.
+
+        """
+        durations: typing.List[float] = []
+        reference_durations: typing.List[float] = []
+        capacity_units: typing.List[float] = []
+        requests: typing.List[int] = []
+        for round_ in range(self._parameters.rounds):
+            if setup is not None:
+                setup(round_)
+            summary = instrumentation.start_summary()
+            start = time.perf_counter()
+            func(round_)
+            durations.append((time.perf_counter() - start) * 1000)
+            instrumentation.end_summary()
+            capacity_units.append(
+                summary.read_capacity_units + summary.write_capacity_units
+            )
+            requests.append(summary.requests)
+
+            start = time.perf_counter()
+            self._reference()
+            reference_durations.append((time.perf_counter() - start) * 1000)
+
+        p50_ms = statistics.median(durations)
+        result = Result(
+            p50_ms=p50_ms,
+            p99_ms=statistics.quantiles(durations, n=100, method="inclusive")[98],
+            p50_relative=p50_ms / statistics.median(reference_durations),
+            capacity_units=statistics.mean(capacity_units),
+            requests=statistics.mean(requests),
+        )
+        _RESULTS[name] = result
+
+        baseline = self._baselines.get(name)
+        if baseline is None:
+            return result
+        # The baselines are stored rounded to 2 decimals
+        assert round(result.capacity_units, 2) <= baseline["capacity_units"], (
+            f"{name} consumed more capacity than the baseline, "
+            f"{result.capacity_units=}, {baseline['capacity_units']=}"
+        )
+        assert round(result.requests, 2) <= baseline["requests"], (
+            f"{name} made more requests than the baseline, "
+            f"{result.requests=}, {baseline['requests']=}"
+        )
+        assert result.p50_relative <= baseline["p50_relative"] * self._tolerance, (
+            f"{name} is slower than the baseline, "
+            f"{result.p50_relative=}, {baseline['p50_relative']=}, {self._tolerance=}"
+        )
+        return result
+
+
+def _read_baselines(parameters: Parameters) -> typing.Dict[str, typing.Dict]:
+    """Read the baselines recorded with the same parameters."""
+    if not BASELINES_FILE.exists():
+        return {}
+    baselines = json.loads(BASELINES_FILE.read_text())
+    if baselines["parameters"] != dataclasses.asdict(parameters):
+        return {}
+    return baselines["results"]
+
+
+def _get_parameters(config) -> Parameters:
+    """Read the parameters from the options."""
+    return Parameters(
+        customers=config.getoption("benchmark_customers"),
+        specs=config.getoption("benchmark_specs"),
+        versions=config.getoption("benchmark_versions"),
+        rounds=config.getoption("benchmark_rounds"),
+    )
+
+
+def _write_baselines(parameters: Parameters) -> None:
+    """Store the results, keeping the baselines of methods that were not run."""
+    results = _read_baselines(parameters)
+    for name, result in _RESULTS.items():
+        results[name] = {
+            key: round(value, 2) for key, value in dataclasses.asdict(result).items()
+        }
+    baselines = {
+        "parameters": dataclasses.asdict(parameters),
+        "results": dict(sorted(results.items())),
+    }
+    BASELINES_FILE.write_text(json.dumps(baselines, indent=2) + "\n")
+
+
+@pytest.fixture(scope="session")
+def parameters(pytestconfig) -> Parameters:
+    """The size of the seeded data and how often each method is called."""
+    return _get_parameters(pytestconfig)
+
+
+def _read_reference_item() -> None:
+    """Read a single item, used as the reference for the durations."""
+    try:
+        models.CustomerModelCount.get(
+            hash_key="benchmark reference sub",
+            range_key=models.CustomerModelCount.UPDATED_AT_ID,
+        )
+    except models.CustomerModelCount.DoesNotExist:
+        pass
+
+
+@pytest.fixture(scope="session")
+def benchmark(pytestconfig, parameters, _specs_table) -> Benchmark:
+    """Time methods and compare the results with the baselines."""
+    instrumentation.install()
+    save = pytestconfig.getoption("benchmark_save_baselines")
+    return Benchmark(
+        parameters=parameters,
+        baselines={} if save else _read_baselines(parameters),
+        tolerance=pytestconfig.getoption("benchmark_tolerance"),
+        reference=_read_reference_item,
+    )
+
+
+@pytest.fixture(scope="session")
+def seed_specs(_specs_table):
+    """Return a function that seeds the specs of a customer."""
+
+    def seed(
+        sub: types.TSub, *, spec_names: typing.List[types.TSpecName], versions: int
+    ) -> None:
+        """Seed the versions of each spec and the latest version."""
+        with models.Spec.batch_write() as batch:
+            for name in spec_names:
+                id_ = models.Spec.calc_id(name)
+                for version_idx in range(versions):
+                    updated_at = str(version_idx + 1)
+                    item_updated_ats = [updated_at]
+                    if version_idx == versions - 1:
+                        item_updated_ats.append(models.Spec.UPDATED_AT_LATEST)
+                    for item_updated_at in item_updated_ats:
+                        index_values = models.Spec.calc_index_values(
+                            updated_at=item_updated_at, id_=id_
+                        )
+                        batch.save(
+                            factory.SpecFactory(
+                                sub=sub,
+                                id=id_,
+                                name=name,
+                                updated_at=updated_at,
+                                version=f"{version_idx}.0.0",
+                                updated_at_id=index_values.updated_at_id,
+                                id_updated_at=index_values.id_updated_at,
+                            )
+                        )
+        models.Spec.reconcile_customer_model_count(sub=sub)
+
+    return seed
+
+
+@pytest.fixture(scope="session")
+def seed_credentials(_credentials_table):
+    """Return a function that seeds the credentials of a customer."""
+
+    def seed(
+        sub: types.TSub, *, count: int
+    ) -> typing.List[types.TCredentialsPublicKey]:
+        """Seed credentials and return their public keys."""
+        items = [
+            typing.cast(models.Credentials, factory.CredentialsFactory(sub=sub))
+            for _ in range(count)
+        ]
+        with models.Credentials.batch_write() as batch:
+            for item in items:
+                batch.save(item)
+        return [item.public_key for item in items]
+
+    return seed
+
+
+@pytest.fixture(scope="session")
+def dataset(parameters, seed_specs, seed_credentials) -> Dataset:
+    """Seed the customers with specs, versions and credentials."""
+    subs = [f"benchmark sub {idx}" for idx in range(parameters.customers)]
+    spec_names = [f"benchmark spec {idx}" for idx in range(parameters.specs)]
+    public_keys = []
+    for sub in subs:
+        seed_specs(sub, spec_names=spec_names, versions=parameters.versions)
+        public_keys.extend(seed_credentials(sub, count=1))
+    return Dataset(subs=subs, spec_names=spec_names, public_keys=public_keys)
+
+
+def pytest_terminal_summary(terminalreporter, config):
+    """Report the results and store them as baselines if requested."""
+    if not _RESULTS:
+        return
+
+    terminalreporter.section("benchmark results")
+    terminalreporter.write_line(
+        f"{'method':<36} {'p50 ms':>9} {'p99 ms':>9} {'p50 rel':>9} "
+        f"{'capacity':>9} {'requests':>9}"
+    )
+    for name, result in sorted(_RESULTS.items()):
+        terminalreporter.write_line(
+            f"{name:<36} {result.p50_ms:>9.2f} {result.p99_ms:>9.2f} "
+            f"{result.p50_relative:>9.2f} {result.capacity_units:>9.2f} "
+            f"{result.requests:>9.2f}"
+        )
+
+    if config.getoption("benchmark_save_baselines"):
+        _write_baselines(_get_parameters(config))
+        terminalreporter.write_line(f"baselines written to {BASELINES_FILE}")
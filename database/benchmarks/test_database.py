@@ -0,0 +1,246 @@
+"""Benchmarks for the DynamoDB database facade."""
+
+import pytest
+from open_alchemy.package_database import dynamodb, exceptions
+
+DATABASE = dynamodb.Database()
+PAGE_LIMIT = 5
+
+
+def _sub(dataset, round_):
+    """Pick the customer for a round."""
+    return dataset.subs[round_ % len(dataset.subs)]
+
+
+def _name(dataset, round_):
+    """Pick the spec for a round."""
+    return dataset.spec_names[round_ % len(dataset.spec_names)]
+
+
+READ_BENCHMARKS = [
+    pytest.param(
+        lambda dataset, round_: DATABASE.count_customer_models(
+            sub=_sub(dataset, round_)
+        ),
+        id="count_customer_models",
+    ),
+    pytest.param(
+        lambda dataset, round_: DATABASE.reconcile_customer_model_count(
+            sub=_sub(dataset, round_)
+        ),
+        id="reconcile_customer_model_count",
+    ),
+    pytest.param(
+        lambda dataset, round_: DATABASE.get_latest_spec_version(
+            sub=_sub(dataset, round_), name=_name(dataset, round_)
+        ),
+        id="get_latest_spec_version",
+    ),
+    pytest.param(
+        lambda dataset, round_: DATABASE.list_specs(sub=_sub(dataset, round_)),
+        id="list_specs",
+    ),
+    pytest.param(
+        lambda dataset, round_: DATABASE.list_specs_page(
+            sub=_sub(dataset, round_), limit=PAGE_LIMIT
+        ),
+        id="list_specs_page",
+    ),
+    pytest.param(
+        lambda dataset, round_: DATABASE.get_spec(
+            sub=_sub(dataset, round_), name=_name(dataset, round_)
+        ),
+        id="get_spec",
+    ),
+    pytest.param(
+        lambda dataset, round_: DATABASE.list_spec_versions(
+            sub=_sub(dataset, round_), name=_name(dataset, round_)
+        ),
+        id="list_spec_versions",
+    ),
+    pytest.param(
+        lambda dataset, round_: DATABASE.list_spec_version_values(
+            sub=_sub(dataset, round_), name=_name(dataset, round_)
+        ),
+        id="list_spec_version_values",
+    ),
+    pytest.param(
+        lambda dataset, round_: DATABASE.list_spec_versions_page(
+            sub=_sub(dataset, round_), name=_name(dataset, round_), limit=PAGE_LIMIT
+        ),
+        id="list_spec_versions_page",
+    ),
+    pytest.param(
+        lambda dataset, round_: DATABASE.list_credentials(sub=_sub(dataset, round_)),
+        id="list_credentials",
+    ),
+    pytest.param(
+        lambda dataset, round_: DATABASE.get_user(
+            public_key=dataset.public_keys[round_ % len(dataset.public_keys)]
+        ),
+        id="get_user",
+    ),
+]
+
+
+@pytest.mark.parametrize("func", READ_BENCHMARKS)
+def test_read(request, benchmark, dataset, func):
+    """
+    GIVEN seeded customers, specs, versions and credentials
+    WHEN a method that reads is called for each round
+    THEN the result is not worse than the baseline.
+    """
+    benchmark(request.node.callspec.id, lambda round_: func(dataset, round_))
+
+
+def test_get_credentials(benchmark, seed_credentials):
+    """
+    GIVEN credentials
+    WHEN get_credentials is called for each round
+    THEN the result is not worse than the baseline.
+    """
+    sub = "benchmark get credentials sub"
+    seed_credentials(sub, count=1)
+    id_ = DATABASE.list_credentials(sub=sub)[0]["id"]
+
+    benchmark(
+        "get_credentials",
+        lambda _: DATABASE.get_credentials(sub=sub, id_=id_),
+    )
+
+
+def test_create_update_spec(benchmark, _specs_table):
+    """
+    GIVEN a customer and the spec as it was read before each round
+    WHEN create_update_spec is called for each round
+    THEN the result is not worse than the baseline.
+    """
+    sub = "benchmark create update spec sub"
+    previous_spec_infos = {}
+
+    def setup(round_):
+        """Read the spec as the API does before it is updated."""
+        try:
+            previous_spec_infos[round_] = DATABASE.get_spec(
+                sub=sub, name=f"spec {round_ % 2}"
+            )
+        except exceptions.NotFoundError:
+            previous_spec_infos[round_] = None
+
+    benchmark(
+        "create_update_spec",
+        lambda round_: DATABASE.create_update_spec(
+            sub=sub,
+            name=f"spec {round_ % 2}",
+            version=f"{round_}.0.0",
+            model_count=1,
+            previous_spec_info=previous_spec_infos[round_],
+        ),
+        setup=setup,
+    )
+
+
+def test_delete_spec(benchmark, seed_specs, parameters):
+    """
+    GIVEN a spec with versions seeded before each round
+    WHEN delete_spec is called for each round
+    THEN the result is not worse than the baseline.
+    """
+    sub = "benchmark delete spec sub"
+
+    benchmark(
+        "delete_spec",
+        lambda round_: DATABASE.delete_spec(sub=sub, name=f"spec {round_}"),
+        setup=lambda round_: seed_specs(
+            sub, spec_names=[f"spec {round_}"], versions=parameters.versions
+        ),
+    )
+
+
+def test_delete_all_specs(benchmark, dataset, seed_specs, parameters):
+    """
+    GIVEN a customer with specs and versions seeded before each round
+    WHEN delete_all_specs is called for each round
+    THEN the result is not worse than the baseline.
+    """
+    sub = "benchmark delete all specs sub"
+
+    benchmark(
+        "delete_all_specs",
+        lambda _: DATABASE.delete_all_specs(sub=sub),
+        setup=lambda _: seed_specs(
+            sub, spec_names=dataset.spec_names, versions=parameters.versions
+        ),
+    )
+
+
+def test_create_update_credentials(benchmark, _credentials_table):
+    """
+    GIVEN a customer
+    WHEN create_update_credentials is called for each round
+    THEN the result is not worse than the baseline.
+    """
+    sub = "benchmark create update credentials sub"
+
+    benchmark(
+        "create_update_credentials",
+        lambda round_: DATABASE.create_update_credentials(
+            sub=sub,
+            id_=f"id {round_ % 2}",
+            public_key=f"benchmark public key {round_}",
+            secret_key_hash=b"secret key hash",
+            salt=b"salt",
+        ),
+    )
+
+
+def test_delete_credentials(benchmark, seed_credentials):
+    """
+    GIVEN credentials seeded before each round
+    WHEN delete_credentials is called for each round
+    THEN the result is not worse than the baseline.
+    """
+    sub = "benchmark delete credentials sub"
+    ids = {}
+
+    def setup(round_):
+        """Seed the credentials to delete."""
+        seed_credentials(sub, count=1)
+        ids[round_] = DATABASE.list_credentials(sub=sub)[0]["id"]
+
+    benchmark(
+        "delete_credentials",
+        lambda round_: DATABASE.delete_credentials(sub=sub, id_=ids[round_]),
+        setup=setup,
+    )
+
+
+def test_delete_all_credentials(benchmark, seed_credentials):
+    """
+    GIVEN a customer with credentials seeded before each round
+    WHEN delete_all_credentials is called for each round
+    THEN the result is not worse than the baseline.
+    """
+    sub = "benchmark delete all credentials sub"
+
+    benchmark(
+        "delete_all_credentials",
+        lambda _: DATABASE.delete_all_credentials(sub=sub),
+        setup=lambda _: seed_credentials(sub, count=5),
+    )
+
+
+def test_delete_all(benchmark, dataset, seed_specs, seed_credentials, parameters):
+    """
+    GIVEN a customer with specs, versions and credentials seeded before each round
+    WHEN delete_all is called for each round
+    THEN the result is not worse than the baseline.
+    """
+    sub = "benchmark delete all sub"
+
+    def setup(_):
+        """Seed the items to delete."""
+        seed_specs(sub, spec_names=dataset.spec_names, versions=parameters.versions)
+        seed_credentials(sub, count=5)
+
+    benchmark("delete_all", lambda _: DATABASE.delete_all(sub=sub), setup=setup)
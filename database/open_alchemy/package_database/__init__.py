@@ -1,16 +1,36 @@
 """Package database facade."""
 
-from . import dynamodb, exceptions, types
+from . import (
+    asynchronous,
+    config,
+    dynamodb,
+    exceptions,
+    instrumentation,
+    memory,
+    types,
+)
 
 
 def _construct() -> types.TDatabase:
     """Construct the database facade."""
-    return dynamodb.Database()
+    database: types.TDatabase = dynamodb.Database()
+    if config.get().backend == config.Backend.MEMORY:
+        database = memory.Database()
+    if config.get().instrumentation:
+        instrumentation.install()
+        database = instrumentation.Database(database)
+    return database
 
 
 _DATABASE = _construct()
+_ASYNC_DATABASE = asynchronous.AsyncDatabase(_DATABASE)
 
 
 def get() -> types.TDatabase:
     """Return a facade for the database."""
     return _DATABASE
+
+
+def get_async() -> asynchronous.AsyncDatabase:
+    """Return a facade for the database where each operation can be awaited."""
+    return _ASYNC_DATABASE
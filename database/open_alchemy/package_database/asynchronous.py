@@ -0,0 +1,263 @@
+"""Asynchronous facade for the database."""
+
+import asyncio
+import contextvars
+import functools
+import threading
+import typing
+from concurrent import futures
+
+from . import types
+
+# Matches the default size of the connection pool of the pynamodb connections so
+# that the threads do not wait for a connection
+MAX_WORKERS = 10
+_EXECUTOR = futures.ThreadPoolExecutor(
+    max_workers=MAX_WORKERS, thread_name_prefix="package-database"
+)
+
+# Each thread re-uses its own event loop rather than creating one per call of run
+_LOCAL = threading.local()
+
+TResult = typing.TypeVar("TResult")
+
+
+async def run_in_executor(
+    func: typing.Callable[..., TResult], **kwargs: typing.Any
+) -> TResult:
+    """
+    Run a blocking function on the thread pool shared with the database operations.
+
+    The function runs in a copy of the context so that, for example, the
+    instrumentation summary of the caller is used.
+
+    Args:
+        func: The function to run.
+        kwargs: The keyword arguments for the function.
+
+    Returns:
+        The return value of the function.
+
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(
+        _EXECUTOR,
+        functools.partial(contextvars.copy_context().run, func, **kwargs),
+    )
+
+
+def run(coroutine: typing.Coroutine[typing.Any, typing.Any, TResult]) -> TResult:
+    """
+    Run a coroutine to completion from synchronous code.
+
+    Unlike asyncio.run, the event loop is created once for each thread and re-used
+    by later calls on the same thread.
+
+    Args:
+        coroutine: The coroutine to run.
+
+    Returns:
+        The return value of the coroutine.
+
+    """
+    loop: typing.Optional[asyncio.AbstractEventLoop] = getattr(_LOCAL, "loop", None)
+    if loop is None:
+        loop = asyncio.new_event_loop()
+        _LOCAL.loop = loop
+    return loop.run_until_complete(coroutine)
+
+
+class AsyncDatabase:
+    """
+    Interface for the database where each operation can be awaited.
+
+    Each operation runs the operation of the wrapped database on a thread pool that
+    is shared by all instances. The pynamodb connections, and their connection
+    pools, are shared by all threads. This means that independent operations, for
+    example reading information from the database and reading from storage using
+    run_in_executor, can overlap by using asyncio.gather.
+
+    Attrs:
+        database: The database that executes the operations.
+
+    """
+
+    def __init__(self, database: types.TDatabase) -> None:
+        """Construct."""
+        self.database = database
+
+    async def count_customer_models(self, *, sub: types.TSub) -> int:
+        """See TDatabase.count_customer_models."""
+        return await run_in_executor(self.database.count_customer_models, sub=sub)
+
+    async def reconcile_customer_model_count(self, *, sub: types.TSub) -> int:
+        """See TDatabase.reconcile_customer_model_count."""
+        return await run_in_executor(
+            self.database.reconcile_customer_model_count, sub=sub
+        )
+
+    async def create_update_spec(
+        self,
+        *,
+        sub: types.TSub,
+        name: types.TSpecName,
+        version: types.TSpecVersion,
+        model_count: types.TSpecModelCount,
+        title: types.TOptSpecTitle = None,
+        description: types.TOptSpecDescription = None,
+        content_hash: types.TOptSpecContentHash = None,
+        previous_spec_info: typing.Optional[types.TSpecInfo] = None
+    ) -> None:
+        """See TDatabase.create_update_spec."""
+        return await run_in_executor(
+            self.database.create_update_spec,
+            sub=sub,
+            name=name,
+            version=version,
+            model_count=model_count,
+            title=title,
+            description=description,
+            content_hash=content_hash,
+            previous_spec_info=previous_spec_info,
+        )
+
+    async def get_latest_spec_version(
+        self, *, sub: types.TSub, name: types.TSpecName
+    ) -> types.TSpecVersion:
+        """See TDatabase.get_latest_spec_version."""
+        return await run_in_executor(
+            self.database.get_latest_spec_version, sub=sub, name=name
+        )
+
+    async def list_specs(self, *, sub: types.TSub) -> types.TSpecInfoList:
+        """See TDatabase.list_specs."""
+        return await run_in_executor(self.database.list_specs, sub=sub)
+
+    async def list_specs_page(
+        self,
+        *,
+        sub: types.TSub,
+        limit: int,
+        cursor: typing.Optional[types.TCursor] = None
+    ) -> types.TSpecInfoPage:
+        """See TDatabase.list_specs_page."""
+        return await run_in_executor(
+            self.database.list_specs_page, sub=sub, limit=limit, cursor=cursor
+        )
+
+    async def get_spec(
+        self, *, sub: types.TSub, name: types.TSpecName
+    ) -> types.TSpecInfo:
+        """See TDatabase.get_spec."""
+        return await run_in_executor(self.database.get_spec, sub=sub, name=name)
+
+    async def delete_spec(self, *, sub: types.TSub, name: types.TSpecName) -> None:
+        """See TDatabase.delete_spec."""
+        return await run_in_executor(self.database.delete_spec, sub=sub, name=name)
+
+    async def list_spec_versions(
+        self, *, sub: types.TSub, name: types.TSpecName
+    ) -> types.TSpecInfoList:
+        """See TDatabase.list_spec_versions."""
+        return await run_in_executor(
+            self.database.list_spec_versions, sub=sub, name=name
+        )
+
+    async def list_spec_version_values(
+        self, *, sub: types.TSub, name: types.TSpecName
+    ) -> types.TSpecVersionList:
+        """See TDatabase.list_spec_version_values."""
+        return await run_in_executor(
+            self.database.list_spec_version_values, sub=sub, name=name
+        )
+
+    async def list_spec_versions_page(
+        self,
+        *,
+        sub: types.TSub,
+        name: types.TSpecName,
+        limit: int,
+        cursor: typing.Optional[types.TCursor] = None
+    ) -> types.TSpecInfoPage:
+        """See TDatabase.list_spec_versions_page."""
+        return await run_in_executor(
+            self.database.list_spec_versions_page,
+            sub=sub,
+            name=name,
+            limit=limit,
+            cursor=cursor,
+        )
+
+    async def delete_all_specs(
+        self,
+        *,
+        sub: types.TSub,
+        progress: typing.Optional[types.TDeleteProgress] = None
+    ) -> int:
+        """See TDatabase.delete_all_specs."""
+        return await run_in_executor(
+            self.database.delete_all_specs, sub=sub, progress=progress
+        )
+
+    async def list_credentials(self, *, sub: types.TSub) -> types.TCredentialsInfoList:
+        """See TDatabase.list_credentials."""
+        return await run_in_executor(self.database.list_credentials, sub=sub)
+
+    async def create_update_credentials(
+        self,
+        *,
+        sub: types.TSub,
+        id_: types.TCredentialsId,
+        public_key: types.TCredentialsPublicKey,
+        secret_key_hash: types.TCredentialsSecretKeyHash,
+        salt: types.TCredentialsSalt
+    ) -> None:
+        """See TDatabase.create_update_credentials."""
+        return await run_in_executor(
+            self.database.create_update_credentials,
+            sub=sub,
+            id_=id_,
+            public_key=public_key,
+            secret_key_hash=secret_key_hash,
+            salt=salt,
+        )
+
+    async def get_credentials(
+        self, *, sub: types.TSub, id_: types.TCredentialsId
+    ) -> typing.Optional[types.TCredentialsInfo]:
+        """See TDatabase.get_credentials."""
+        return await run_in_executor(self.database.get_credentials, sub=sub, id_=id_)
+
+    async def get_user(
+        self, *, public_key: types.TCredentialsPublicKey
+    ) -> typing.Optional[types.CredentialsAuthInfo]:
+        """See TDatabase.get_user."""
+        return await run_in_executor(self.database.get_user, public_key=public_key)
+
+    async def delete_credentials(
+        self, *, sub: types.TSub, id_: types.TCredentialsId
+    ) -> None:
+        """See TDatabase.delete_credentials."""
+        return await run_in_executor(self.database.delete_credentials, sub=sub, id_=id_)
+
+    async def delete_all_credentials(
+        self,
+        *,
+        sub: types.TSub,
+        progress: typing.Optional[types.TDeleteProgress] = None
+    ) -> int:
+        """See TDatabase.delete_all_credentials."""
+        return await run_in_executor(
+            self.database.delete_all_credentials, sub=sub, progress=progress
+        )
+
+    async def delete_all(
+        self,
+        *,
+        sub: types.TSub,
+        progress: typing.Optional[types.TDeleteProgress] = None
+    ) -> int:
+        """See TDatabase.delete_all."""
+        return await run_in_executor(
+            self.database.delete_all, sub=sub, progress=progress
+        )
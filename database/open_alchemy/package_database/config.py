@@ -15,6 +15,17 @@ class Stage(str, enum.Enum):
 _STAGES = {item.value for item in Stage}
 
 
+class Backend(str, enum.Enum):
+    """Where the data is stored."""
+
+    DYNAMODB = "DYNAMODB"
+    MEMORY = "MEMORY"
+
+
+_BACKENDS = {item.value for item in Backend}
+_BOOLEANS = {"true": True, "false": False}
+
+
 @dataclasses.dataclass
 class TConfig:
     """
@@ -22,8 +33,12 @@ class TConfig:
 
     Attrs:
         stage: The stage the application is running in
+        backend: Where the data is stored
+        instrumentation: Whether each call to the database is recorded
         specs_table_name: The name of the specs table
         specs_local_secondary_index_name: The name of the specs local secondary index
+        specs_version_global_secondary_index_name: The name of the specs global
+            secondary index that only projects the version
         credentials_table_name: The name of the credentials table
         credentials_local_secondary_index_name: The name of the credentials global
             secondary index
@@ -31,8 +46,11 @@ class TConfig:
     """
 
     stage: Stage
+    backend: Backend
+    instrumentation: bool
     specs_table_name: str
     specs_local_secondary_index_name: str
+    specs_version_global_secondary_index_name: str
     credentials_table_name: str
     credentials_global_secondary_index_name: str
 
@@ -47,16 +65,36 @@ def _get() -> TConfig:
     ), f"{stage_key} environment variable must be one of {_STAGES=}, {stage_str=}"
     stage = Stage[stage_str]
 
+    backend_key = "DATABASE_BACKEND"
+    backend_str = os.getenv(backend_key, Backend.DYNAMODB.value)
+    assert (
+        backend_str in _BACKENDS
+    ), f"{backend_key} environment variable must be one of {_BACKENDS=}, {backend_str=}"
+    backend = Backend[backend_str]
+
+    instrumentation_key = "DATABASE_INSTRUMENTATION"
+    instrumentation_str = os.getenv(instrumentation_key, "false")
+    assert (
+        instrumentation_str in _BOOLEANS
+    ), f"{instrumentation_key} environment variable must be one of {set(_BOOLEANS)=}"
+    instrumentation = _BOOLEANS[instrumentation_str]
+
     specs_table_name = "package.specs"
     specs_local_secondary_index_name = "idUpdatedAt"
+    specs_version_global_secondary_index_name = "idUpdatedAtVersion"
 
     credentials_table_name = "package.credentials"
     credentials_global_secondary_index_name = "publicKey"
 
     return TConfig(
         stage=stage,
+        backend=backend,
+        instrumentation=instrumentation,
         specs_table_name=specs_table_name,
         specs_local_secondary_index_name=specs_local_secondary_index_name,
+        specs_version_global_secondary_index_name=(
+            specs_version_global_secondary_index_name
+        ),
         credentials_table_name=credentials_table_name,
         credentials_global_secondary_index_name=credentials_global_secondary_index_name,
     )
@@ -22,6 +22,20 @@ class Database:
         """
         return models.Spec.count_customer_models(sub=sub)
 
+    @staticmethod
+    def reconcile_customer_model_count(*, sub: types.TSub) -> int:
+        """
+        Rebuild the stored number of models of a customer from the latest specs.
+
+        Args:
+            sub: Unique identifier for a cutsomer.
+
+        Returns:
+            The number of models the customer has stored.
+
+        """
+        return models.Spec.reconcile_customer_model_count(sub=sub)
+
     @staticmethod
     def create_update_spec(
         *,
@@ -31,6 +45,8 @@ class Database:
         model_count: types.TSpecModelCount,
         title: types.TOptSpecTitle = None,
         description: types.TOptSpecDescription = None,
+        content_hash: types.TOptSpecContentHash = None,
+        previous_spec_info: typing.Optional[types.TSpecInfo] = None,
     ) -> None:
         """
         Create or update a spec.
@@ -42,6 +58,9 @@ class Database:
             model_count: The number of models in the spec.
             title: The title of a spec.
             description: The description of a spec.
+            content_hash: The hash of the content the spec was created from.
+            previous_spec_info: The information about the latest version of the
+                spec as it was last read, None if the spec is expected not to exist.
 
         """
         models.Spec.create_update_item(
@@ -51,6 +70,8 @@ class Database:
             model_count=model_count,
             title=title,
             description=description,
+            content_hash=content_hash,
+            previous_spec_info=previous_spec_info,
         )
 
     @staticmethod
@@ -86,6 +107,29 @@ class Database:
         """
         return models.Spec.list_(sub=sub)
 
+    @staticmethod
+    def list_specs_page(
+        *,
+        sub: types.TSub,
+        limit: int,
+        cursor: typing.Optional[types.TCursor] = None,
+    ) -> types.TSpecInfoPage:
+        """
+        List a page of the available specs for a customer.
+
+        Raises InvalidCursorError if the cursor is not valid.
+
+        Args:
+            sub: Unique identifier for a cutsomer.
+            limit: The maximum number of specs to return.
+            cursor: The cursor returned with the previous page.
+
+        Returns:
+            The page of specs and the cursor for the next page.
+
+        """
+        return models.Spec.list_page(sub=sub, limit=limit, cursor=cursor)
+
     @staticmethod
     def get_spec(*, sub: types.TSub, name: types.TSpecName) -> types.TSpecInfo:
         """
@@ -93,6 +137,9 @@ class Database:
 
         Raises NotFoundError if the spec does not exist.
 
+        The information includes the latest version of the spec so that it does not
+        have to be retrieved separately.
+
         Args:
             sub: Unique identifier for a cutsomer.
             name: The display name of the spec.
@@ -138,15 +185,79 @@ class Database:
         return spec_infos
 
     @staticmethod
-    def delete_all_specs(*, sub: types.TSub) -> None:
+    def list_spec_version_values(
+        *, sub: types.TSub, name: types.TSpecName
+    ) -> types.TSpecVersionList:
+        """
+        List the values of all available versions for a spec for a customer.
+
+        Only reads the version of each item which makes it cheaper than
+        list_spec_versions when no other information is needed.
+
+        Raises NotFoundError if the spec has no versions.
+
+        Args:
+            sub: Unique identifier for a cutsomer.
+            name: The display name of the spec.
+
+        Returns:
+            List of all versions of a spec for the customer.
+
+        """
+        versions = models.Spec.list_version_values(sub=sub, name=name)
+        if not versions:
+            raise exceptions.NotFoundError(f"could not find spec id {name}")
+        return versions
+
+    @staticmethod
+    def list_spec_versions_page(
+        *,
+        sub: types.TSub,
+        name: types.TSpecName,
+        limit: int,
+        cursor: typing.Optional[types.TCursor] = None,
+    ) -> types.TSpecInfoPage:
+        """
+        List a page of the available versions for a spec for a customer, newest first.
+
+        Raises NotFoundError if the spec has no versions and no cursor is passed.
+        Raises InvalidCursorError if the cursor is not valid.
+
+        Args:
+            sub: Unique identifier for a cutsomer.
+            name: The display name of the spec.
+            limit: The maximum number of versions to return.
+            cursor: The cursor returned with the previous page.
+
+        Returns:
+            The page of versions and the cursor for the next page.
+
+        """
+        page = models.Spec.list_versions_page(
+            sub=sub, name=name, limit=limit, cursor=cursor
+        )
+        if cursor is None and not page.items:
+            raise exceptions.NotFoundError(f"could not find spec id {name}")
+        return page
+
+    @staticmethod
+    def delete_all_specs(
+        *,
+        sub: types.TSub,
+        progress: typing.Optional[types.TDeleteProgress] = None,
+    ) -> int:
         """
         Delete all the specs for a user.
 
         Args:
             sub: Unique identifier for a cutsomer.
+            progress: Called with the number of items deleted so far.
+
+        Returns:
+            The number of items that were deleted.
 
         """
-        models.Spec.delete_all(sub=sub)
+        return models.Spec.delete_all(sub=sub, progress=progress)
 
     @staticmethod
     def list_credentials(*, sub: types.TSub) -> types.TCredentialsInfoList:
@@ -238,24 +349,53 @@ class Database:
         models.Credentials.delete_item(sub=sub, id_=id_)
 
     @staticmethod
-    def delete_all_credentials(*, sub: types.TSub) -> None:
+    def delete_all_credentials(
+        *,
+        sub: types.TSub,
+        progress: typing.Optional[types.TDeleteProgress] = None,
+    ) -> int:
         """
         Delete all the credentials for a user.
 
         Args:
             sub: Unique identifier for a cutsomer.
+            progress: Called with the number of items deleted so far.
+
+        Returns:
+            The number of items that were deleted.
 
         """
-        models.Credentials.delete_all(sub=sub)
+        return models.Credentials.delete_all(sub=sub, progress=progress)
 
     @classmethod
-    def delete_all(cls, *, sub: types.TSub) -> None:
+    def delete_all(
+        cls,
+        *,
+        sub: types.TSub,
+        progress: typing.Optional[types.TDeleteProgress] = None,
+    ) -> int:
         """
         Delete all the items for a user.
 
+        If deleting is interrupted, for example by a timeout, calling it again
+        deletes the items that remain.
+
         Args:
             sub: Unique identifier for a cutsomer.
+            progress: Called with the number of items deleted so far across specs
+                and credentials.
+
+        Returns:
+            The number of items that were deleted.
 
         """
-        cls.delete_all_specs(sub=sub)
-        cls.delete_all_credentials(sub=sub)
+        specs_deleted = cls.delete_all_specs(sub=sub, progress=progress)
+
+        def credentials_progress(deleted: int) -> None:
+            """Report progress including the deleted specs."""
+            if progress is not None:
+                progress(specs_deleted + deleted)
+
+        return specs_deleted + cls.delete_all_credentials(
+            sub=sub, progress=credentials_progress
+        )
@@ -7,3 +7,11 @@ class BaseError(Exception):
 
 class NotFoundError(BaseError):
     """When an item was not found in the database."""
+
+
+class ConflictError(BaseError):
+    """When an item could not be written due to concurrent updates."""
+
+
+class InvalidCursorError(BaseError):
+    """When a cursor for retrieving a page is not valid."""
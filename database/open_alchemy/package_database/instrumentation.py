@@ -0,0 +1,437 @@
+"""Instrumentation for the database facade."""
+
+import contextvars
+import dataclasses
+import functools
+import threading
+import time
+import typing
+
+from pynamodb.connection import base
+
+from . import types
+
+READ_OPERATIONS = frozenset(
+    {"BatchGetItem", "GetItem", "Query", "Scan", "TransactGetItems"}
+)
+SERVER_TIMING_NAME = "db"
+
+
+@dataclasses.dataclass
+class TMethodSummary:
+    """
+    The calls to a method of the database facade.
+
+    Attrs:
+        count: The number of calls.
+        duration: The total duration of the calls in seconds.
+
+    """
+
+    count: int = 0
+    duration: float = 0.0
+
+
+def _count_items(data: typing.Dict[str, typing.Any]) -> int:
+    """Count the items that were read by a request."""
+    if "Count" in data:
+        return int(data["Count"])
+    if "Item" in data:
+        return 1
+    responses = data.get("Responses")
+    if isinstance(responses, list):
+        return sum(1 for response in responses if response.get("Item") is not None)
+    return 0
+
+
+class Summary:
+    """
+    The use of the database, usually during a request.
+
+    Attrs:
+        methods: The calls to each method of the database facade.
+        subs: The customers that were passed to the methods.
+        requests: The number of requests that were sent to the database.
+        read_capacity_units: The consumed read capacity units.
+        write_capacity_units: The consumed write capacity units.
+        items: The number of items that were read.
+
+    """
+
+    def __init__(self) -> None:
+        """Construct."""
+        self._lock = threading.Lock()
+        self.methods: typing.Dict[str, TMethodSummary] = {}
+        self.subs: typing.Set[types.TSub] = set()
+        self.requests = 0
+        self.read_capacity_units = 0.0
+        self.write_capacity_units = 0.0
+        self.items = 0
+
+    @property
+    def duration(self) -> float:
+        """The total duration of the calls to the database facade in seconds."""
+        return sum(method.duration for method in self.methods.values())
+
+    def record_call(
+        self, *, name: str, duration: float, sub: typing.Optional[types.TSub]
+    ) -> None:
+        """
+        Record a call to a method of the database facade.
+
+        Args:
+            name: The name of the method.
+            duration: How long the call took in seconds.
+            sub: The customer that was passed to the method, if any.
+
+        """
+        with self._lock:
+            method = self.methods.setdefault(name, TMethodSummary())
+            method.count += 1
+            method.duration += duration
+            if sub is not None:
+                self.subs.add(sub)
+
+    def record_response(
+        self,
+        *,
+        operation_name: str,
+        data: typing.Optional[typing.Dict[str, typing.Any]],
+    ) -> None:
+        """
+        Record the response of a request to the database.
+
+        The consumed capacity is only returned if ReturnConsumedCapacity is set which
+        pynamodb does for all requests that read or write items. If the consumed
+        capacity is not split into read and write capacity, the operation determines
+        which it is.
+
+        Args:
+            operation_name: The name of the DynamoDB operation.
+            data: The response of the request.
+
+        """
+        data = data or {}
+        consumed = data.get("ConsumedCapacity") or []
+        if isinstance(consumed, dict):
+            consumed = [consumed]
+
+        read_capacity_units = 0.0
+        write_capacity_units = 0.0
+        for capacity in consumed:
+            if "ReadCapacityUnits" in capacity or "WriteCapacityUnits" in capacity:
+                read_capacity_units += capacity.get("ReadCapacityUnits", 0.0)
+                write_capacity_units += capacity.get("WriteCapacityUnits", 0.0)
+            elif operation_name in READ_OPERATIONS:
+                read_capacity_units += capacity.get("CapacityUnits", 0.0)
+            else:
+                write_capacity_units += capacity.get("CapacityUnits", 0.0)
+
+        with self._lock:
+            self.requests += 1
+            self.read_capacity_units += read_capacity_units
+            self.write_capacity_units += write_capacity_units
+            self.items += _count_items(data)
+
+    def server_timing(self) -> str:
+        """
+        Calculate the value of the Server-Timing header.
+
+        The first metric is the total for the database and is followed by a metric
+        for each method of the database facade that was called.
+
+        Returns:
+            The value for the header.
+
+        """
+        metrics = [
+            f"{SERVER_TIMING_NAME};dur={self.duration * 1000:.2f};"
+            f'desc="requests={self.requests} rcu={self.read_capacity_units:g} '
+            f'wcu={self.write_capacity_units:g} items={self.items}"'
+        ]
+        metrics.extend(
+            f"{SERVER_TIMING_NAME}-{name};dur={method.duration * 1000:.2f};"
+            f'desc="calls={method.count}"'
+            for name, method in sorted(self.methods.items())
+        )
+        return ", ".join(metrics)
+
+    def to_dict(self) -> typing.Dict[str, typing.Any]:
+        """Convert to a dictionary that can be logged as JSON."""
+        return {
+            "duration_ms": round(self.duration * 1000, 2),
+            "requests": self.requests,
+            "read_capacity_units": self.read_capacity_units,
+            "write_capacity_units": self.write_capacity_units,
+            "items": self.items,
+            "subs": sorted(self.subs),
+            "methods": {
+                name: {
+                    "count": method.count,
+                    "duration_ms": round(method.duration * 1000, 2),
+                }
+                for name, method in sorted(self.methods.items())
+            },
+        }
+
+
+_SUMMARY: "contextvars.ContextVar[typing.Optional[Summary]]" = contextvars.ContextVar(
+    "package_database_summary", default=None
+)
+
+
+def start_summary() -> Summary:
+    """
+    Start recording the use of the database in the current context.
+
+    Threads started by the database facade record into the same summary.
+
+    Returns:
+        The summary that is recorded into.
+
+    """
+    summary = Summary()
+    _SUMMARY.set(summary)
+    return summary
+
+
+def get_summary() -> typing.Optional[Summary]:
+    """Retrieve the summary of the current context, if any."""
+    return _SUMMARY.get()
+
+
+def end_summary() -> typing.Optional[Summary]:
+    """
+    Stop recording the use of the database in the current context.
+
+    Returns:
+        The summary that was recorded into, if any.
+
+    """
+    summary = _SUMMARY.get()
+    _SUMMARY.set(None)
+    return summary
+
+
+def install() -> None:
+    """
+    Record the response of every request to the database into the current summary.
+
+    Wraps the dispatch of the pynamodb connections. Installing more than once has no
+    effect.
+
+    """
+    dispatch = base.Connection.dispatch
+    if getattr(dispatch, "instrumented", False):
+        return
+
+    @functools.wraps(dispatch)
+    def instrumented_dispatch(
+        self: base.Connection,
+        operation_name: str,
+        *args: typing.Any,
+        **kwargs: typing.Any,
+    ) -> typing.Dict:
+        """Dispatch the request and record the response."""
+        data = dispatch(self, operation_name, *args, **kwargs)
+        summary = _SUMMARY.get()
+        if summary is not None:
+            summary.record_response(operation_name=operation_name, data=data)
+        return data
+
+    instrumented_dispatch.instrumented = True  # type: ignore
+    base.Connection.dispatch = instrumented_dispatch  # type: ignore
+
+
+class Database:
+    """
+    Interface for the database that records each call into the current summary.
+
+    Records the number of calls, the duration and the customer of each call to the
+    wrapped database. Combined with install, the requests, consumed capacity and
+    items read are also recorded.
+
+    Attrs:
+        database: The database that executes the operations.
+
+    """
+
+    def __init__(self, database: types.TDatabase) -> None:
+        """Construct."""
+        self.database = database
+
+    def _call(self, method: str, /, **kwargs: typing.Any) -> typing.Any:
+        """
+        Call a method of the wrapped database and record the call.
+
+        Args:
+            method: The name of the method.
+            kwargs: The keyword arguments for the method.
+
+        Returns:
+            The return value of the method.
+
+        """
+        start = time.perf_counter()
+        try:
+            return getattr(self.database, method)(**kwargs)
+        finally:
+            summary = _SUMMARY.get()
+            if summary is not None:
+                summary.record_call(
+                    name=method,
+                    duration=time.perf_counter() - start,
+                    sub=kwargs.get("sub"),
+                )
+
+    def count_customer_models(self, *, sub: types.TSub) -> int:
+        """See TDatabase.count_customer_models."""
+        return self._call("count_customer_models", sub=sub)
+
+    def reconcile_customer_model_count(self, *, sub: types.TSub) -> int:
+        """See TDatabase.reconcile_customer_model_count."""
+        return self._call("reconcile_customer_model_count", sub=sub)
+
+    def create_update_spec(
+        self,
+        *,
+        sub: types.TSub,
+        name: types.TSpecName,
+        version: types.TSpecVersion,
+        model_count: types.TSpecModelCount,
+        title: types.TOptSpecTitle = None,
+        description: types.TOptSpecDescription = None,
+        content_hash: types.TOptSpecContentHash = None,
+        previous_spec_info: typing.Optional[types.TSpecInfo] = None,
+    ) -> None:
+        """See TDatabase.create_update_spec."""
+        return self._call(
+            "create_update_spec",
+            sub=sub,
+            name=name,
+            version=version,
+            model_count=model_count,
+            title=title,
+            description=description,
+            content_hash=content_hash,
+            previous_spec_info=previous_spec_info,
+        )
+
+    def get_latest_spec_version(
+        self, *, sub: types.TSub, name: types.TSpecName
+    ) -> types.TSpecVersion:
+        """See TDatabase.get_latest_spec_version."""
+        return self._call("get_latest_spec_version", sub=sub, name=name)
+
+    def list_specs(self, *, sub: types.TSub) -> types.TSpecInfoList:
+        """See TDatabase.list_specs."""
+        return self._call("list_specs", sub=sub)
+
+    def list_specs_page(
+        self,
+        *,
+        sub: types.TSub,
+        limit: int,
+        cursor: typing.Optional[types.TCursor] = None,
+    ) -> types.TSpecInfoPage:
+        """See TDatabase.list_specs_page."""
+        return self._call("list_specs_page", sub=sub, limit=limit, cursor=cursor)
+
+    def get_spec(self, *, sub: types.TSub, name: types.TSpecName) -> types.TSpecInfo:
+        """See TDatabase.get_spec."""
+        return self._call("get_spec", sub=sub, name=name)
+
+    def delete_spec(self, *, sub: types.TSub, name: types.TSpecName) -> None:
+        """See TDatabase.delete_spec."""
+        return self._call("delete_spec", sub=sub, name=name)
+
+    def list_spec_versions(
+        self, *, sub: types.TSub, name: types.TSpecName
+    ) -> types.TSpecInfoList:
+        """See TDatabase.list_spec_versions."""
+        return self._call("list_spec_versions", sub=sub, name=name)
+
+    def list_spec_version_values(
+        self, *, sub: types.TSub, name: types.TSpecName
+    ) -> types.TSpecVersionList:
+        """See TDatabase.list_spec_version_values."""
+        return self._call("list_spec_version_values", sub=sub, name=name)
+
+    def list_spec_versions_page(
+        self,
+        *,
+        sub: types.TSub,
+        name: types.TSpecName,
+        limit: int,
+        cursor: typing.Optional[types.TCursor] = None,
+    ) -> types.TSpecInfoPage:
+        """See TDatabase.list_spec_versions_page."""
+        return self._call(
+            "list_spec_versions_page", sub=sub, name=name, limit=limit, cursor=cursor
+        )
+
+    def delete_all_specs(
+        self,
+        *,
+        sub: types.TSub,
+        progress: typing.Optional[types.TDeleteProgress] = None,
+    ) -> int:
+        """See TDatabase.delete_all_specs."""
+        return self._call("delete_all_specs", sub=sub, progress=progress)
+
+    def list_credentials(self, *, sub: types.TSub) -> types.TCredentialsInfoList:
+        """See TDatabase.list_credentials."""
+        return self._call("list_credentials", sub=sub)
+
+    def create_update_credentials(
+        self,
+        *,
+        sub: types.TSub,
+        id_: types.TCredentialsId,
+        public_key: types.TCredentialsPublicKey,
+        secret_key_hash: types.TCredentialsSecretKeyHash,
+        salt: types.TCredentialsSalt,
+    ) -> None:
+        """See TDatabase.create_update_credentials."""
+        return self._call(
+            "create_update_credentials",
+            sub=sub,
+            id_=id_,
+            public_key=public_key,
+            secret_key_hash=secret_key_hash,
+            salt=salt,
+        )
+
+    def get_credentials(
+        self, *, sub: types.TSub, id_: types.TCredentialsId
+    ) -> typing.Optional[types.TCredentialsInfo]:
+        """See TDatabase.get_credentials."""
+        return self._call("get_credentials", sub=sub, id_=id_)
+
+    def get_user(
+        self, *, public_key: types.TCredentialsPublicKey
+    ) -> typing.Optional[types.CredentialsAuthInfo]:
+        """See TDatabase.get_user."""
+        return self._call("get_user", public_key=public_key)
+
+    def delete_credentials(self, *, sub: types.TSub, id_: types.TCredentialsId) -> None:
+        """See TDatabase.delete_credentials."""
+        return self._call("delete_credentials", sub=sub, id_=id_)
+
+    def delete_all_credentials(
+        self,
+        *,
+        sub: types.TSub,
+        progress: typing.Optional[types.TDeleteProgress] = None,
+    ) -> int:
+        """See TDatabase.delete_all_credentials."""
+        return self._call("delete_all_credentials", sub=sub, progress=progress)
+
+    def delete_all(
+        self,
+        *,
+        sub: types.TSub,
+        progress: typing.Optional[types.TDeleteProgress] = None,
+    ) -> int:
+        """See TDatabase.delete_all."""
+        return self._call("delete_all", sub=sub, progress=progress)
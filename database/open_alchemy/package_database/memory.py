@@ -0,0 +1,639 @@
+"""Memory implementation for the database facade."""
+
+import bisect
+import dataclasses
+import threading
+import time
+import typing
+
+from . import exceptions, models, types
+
+
+@dataclasses.dataclass
+class _SpecPartition:
+    """
+    The spec items of a customer.
+
+    Attrs:
+        items: The information of each item by updated_at_id.
+        updated_at_ids: All updated_at_id values in sorted order.
+        id_updated_ats: All id_updated_at values in sorted order.
+        id_updated_at_to_updated_at_id: Maps id_updated_at to updated_at_id.
+        model_count: The model count of the customer or None if it is not stored.
+
+    """
+
+    items: typing.Dict[str, types.TSpecInfo] = dataclasses.field(default_factory=dict)
+    updated_at_ids: typing.List[str] = dataclasses.field(default_factory=list)
+    id_updated_ats: typing.List[str] = dataclasses.field(default_factory=list)
+    id_updated_at_to_updated_at_id: typing.Dict[str, str] = dataclasses.field(
+        default_factory=dict
+    )
+    model_count: typing.Optional[int] = None
+
+
+@dataclasses.dataclass
+class _Credentials:
+    """Credentials of a customer."""
+
+    public_key: types.TCredentialsPublicKey
+    secret_key_hash: types.TCredentialsSecretKeyHash
+    salt: types.TCredentialsSalt
+
+
+def _prefix_range(keys: typing.List[str], prefix: str) -> typing.Tuple[int, int]:
+    """Calculate the start and end index of sorted keys that start with the prefix."""
+    start = bisect.bisect_left(keys, prefix)
+    end = start
+    while end < len(keys) and keys[end].startswith(prefix):
+        end += 1
+    return start, end
+
+
+class Database:
+    """
+    Interface for the database stored in memory.
+
+    Mirrors the behaviour of the DynamoDB database, including the latest item of a
+    spec, the ordering of the versions and looking up credentials by public key. All
+    operations are protected by a lock so that they can be called from multiple
+    threads.
+
+    """
+
+    def __init__(self) -> None:
+        """Construct."""
+        self._lock = threading.RLock()
+        self._specs: typing.Dict[types.TSub, _SpecPartition] = {}
+        self._credentials: typing.Dict[
+            types.TSub, typing.Dict[types.TCredentialsId, _Credentials]
+        ] = {}
+        self._public_keys: typing.Dict[
+            types.TCredentialsPublicKey,
+            typing.Tuple[types.TSub, types.TCredentialsId],
+        ] = {}
+
+    def _spec_partition(self, sub: types.TSub) -> _SpecPartition:
+        """Retrieve the spec items of a customer, creating them if needed."""
+        return self._specs.setdefault(sub, _SpecPartition())
+
+    @staticmethod
+    def _latest_updated_at_id(id_: types.TSpecId) -> str:
+        """Calculate the updated_at_id of the latest item of a spec."""
+        return models.Spec.calc_index_values(
+            updated_at=models.Spec.UPDATED_AT_LATEST, id_=id_
+        ).updated_at_id
+
+    def _put_spec_item(
+        self,
+        *,
+        partition: _SpecPartition,
+        updated_at: types.TSpecUpdatedAt,
+        info: types.TSpecInfo,
+    ) -> None:
+        """Store a spec item and add it to the indexes."""
+        index_values = models.Spec.calc_index_values(
+            updated_at=updated_at, id_=info["id"]
+        )
+        if index_values.updated_at_id not in partition.items:
+            bisect.insort(partition.updated_at_ids, index_values.updated_at_id)
+            bisect.insort(partition.id_updated_ats, index_values.id_updated_at)
+        partition.items[index_values.updated_at_id] = info
+        partition.id_updated_at_to_updated_at_id[
+            index_values.id_updated_at
+        ] = index_values.updated_at_id
+
+    def _version_infos(
+        self, *, sub: types.TSub, id_: types.TSpecId
+    ) -> typing.List[types.TSpecInfo]:
+        """Retrieve the information of the versions of a spec in ascending order."""
+        partition = self._specs.get(sub)
+        if partition is None:
+            return []
+
+        length = models.UPDATED_AT_LENGTH
+        start = bisect.bisect_left(partition.id_updated_ats, f"{id_}#{'0' * length}")
+        end = bisect.bisect_right(partition.id_updated_ats, f"{id_}#{'9' * length}")
+        return [
+            partition.items[partition.id_updated_at_to_updated_at_id[id_updated_at]]
+            for id_updated_at in partition.id_updated_ats[start:end]
+        ]
+
+    def count_customer_models(self, *, sub: types.TSub) -> int:
+        """
+        Count the number of models a customer has stored.
+
+        Args:
+            sub: Unique identifier for a cutsomer.
+
+        Returns:
+            The number of models the customer has stored.
+
+        """
+        with self._lock:
+            model_count = self._spec_partition(sub).model_count
+            if model_count is None:
+                return self.reconcile_customer_model_count(sub=sub)
+            return model_count
+
+    def reconcile_customer_model_count(self, *, sub: types.TSub) -> int:
+        """
+        Rebuild the stored number of models of a customer from the latest specs.
+
+        Args:
+            sub: Unique identifier for a cutsomer.
+
+        Returns:
+            The number of models the customer has stored.
+
+        """
+        with self._lock:
+            partition = self._spec_partition(sub)
+            start, end = _prefix_range(
+                partition.updated_at_ids, f"{models.Spec.UPDATED_AT_LATEST}#"
+            )
+            partition.model_count = sum(
+                partition.items[updated_at_id]["model_count"]
+                for updated_at_id in partition.updated_at_ids[start:end]
+            )
+            return partition.model_count
+
+    def create_update_spec(
+        self,
+        *,
+        sub: types.TSub,
+        name: types.TSpecName,
+        version: types.TSpecVersion,
+        model_count: types.TSpecModelCount,
+        title: types.TOptSpecTitle = None,
+        description: types.TOptSpecDescription = None,
+        content_hash: types.TOptSpecContentHash = None,
+        previous_spec_info: typing.Optional[types.TSpecInfo] = None,
+    ) -> None:
+        """
+        Create or update a spec.
+
+        Args:
+            sub: Unique identifier for a cutsomer.
+            name: The display name of the spec.
+            version: The version of the spec.
+            model_count: The number of models in the spec.
+            title: The title of a spec.
+            description: The description of a spec.
+            content_hash: The hash of the content the spec was created from.
+            previous_spec_info: Not used since the latest version of the spec is
+                read whilst holding the lock.
+
+        """
+        id_ = models.Spec.calc_id(name)
+        updated_at = str(int(time.time()))
+        info: types.TSpecInfo = {
+            "name": name,
+            "id": id_,
+            "updated_at": int(updated_at),
+            "version": version,
+            "model_count": model_count,
+        }
+        if title is not None:
+            info["title"] = title
+        if description is not None:
+            info["description"] = description
+        if content_hash is not None:
+            info["content_hash"] = content_hash
+
+        with self._lock:
+            partition = self._spec_partition(sub)
+            self._put_spec_item(partition=partition, updated_at=updated_at, info=info)
+
+            latest = partition.items.get(self._latest_updated_at_id(id_))
+            if latest is not None and latest["updated_at"] > info["updated_at"]:
+                return
+
+            partition.model_count = (
+                self.count_customer_models(sub=sub)
+                + model_count
+                - (latest["model_count"] if latest is not None else 0)
+            )
+            self._put_spec_item(
+                partition=partition,
+                updated_at=models.Spec.UPDATED_AT_LATEST,
+                info=info.copy(),
+            )
+
+    def get_latest_spec_version(
+        self, *, sub: types.TSub, name: types.TSpecName
+    ) -> types.TSpecVersion:
+        """
+        Get the latest version for a spec.
+
+        Raises NotFoundError if the spec is not found in the database.
+
+        Args:
+            sub: Unique identifier for a cutsomer.
+            name: The display name of the spec.
+
+        Returns:
+            The latest version of the spec.
+
+        """
+        return self.get_spec(sub=sub, name=name)["version"]
+
+    def list_specs(self, *, sub: types.TSub) -> types.TSpecInfoList:
+        """
+        List all available specs for a customer.
+
+        Args:
+            sub: Unique identifier for a cutsomer.
+
+        Returns:
+            List of information for all specs for the customer.
+
+        """
+        with self._lock:
+            partition = self._spec_partition(sub)
+            start, end = _prefix_range(
+                partition.updated_at_ids, f"{models.Spec.UPDATED_AT_LATEST}#"
+            )
+            return [
+                partition.items[updated_at_id].copy()
+                for updated_at_id in partition.updated_at_ids[start:end]
+            ]
+
+    def list_specs_page(
+        self,
+        *,
+        sub: types.TSub,
+        limit: int,
+        cursor: typing.Optional[types.TCursor] = None,
+    ) -> types.TSpecInfoPage:
+        """
+        List a page of the available specs for a customer.
+
+        Raises InvalidCursorError if the cursor is not valid.
+
+        Args:
+            sub: Unique identifier for a cutsomer.
+            limit: The maximum number of specs to return.
+            cursor: The cursor returned with the previous page.
+
+        Returns:
+            The page of specs and the cursor for the next page.
+
+        """
+        prefix = f"{models.Spec.UPDATED_AT_LATEST}#"
+        with self._lock:
+            partition = self._spec_partition(sub)
+            start, end = _prefix_range(partition.updated_at_ids, prefix)
+            if cursor is not None:
+                start = bisect.bisect_right(
+                    partition.updated_at_ids,
+                    models.decode_cursor(cursor, prefix=prefix),
+                    lo=start,
+                    hi=end,
+                )
+
+            updated_at_ids = partition.updated_at_ids[start : min(start + limit, end)]
+            next_cursor = None
+            if start + limit < end:
+                next_cursor = models.encode_cursor(updated_at_ids[-1])
+            return types.TSpecInfoPage(
+                items=[
+                    partition.items[updated_at_id].copy()
+                    for updated_at_id in updated_at_ids
+                ],
+                cursor=next_cursor,
+            )
+
+    def get_spec(self, *, sub: types.TSub, name: types.TSpecName) -> types.TSpecInfo:
+        """
+        Retrieve a spec from the database.
+
+        Raises NotFoundError if the spec was not found.
+
+        Args:
+            sub: Unique identifier for a cutsomer.
+            name: The display name of the spec.
+
+        Returns:
+            Information about the spec
+
+        """
+        with self._lock:
+            info = self._spec_partition(sub).items.get(
+                self._latest_updated_at_id(models.Spec.calc_id(name))
+            )
+            if info is None:
+                raise exceptions.NotFoundError(
+                    f"could not find spec {name=} for user {sub=} in the database"
+                )
+            return info.copy()
+
+    def delete_spec(self, *, sub: types.TSub, name: types.TSpecName) -> None:
+        """
+        Delete a spec from the database.
+
+        Args:
+            sub: Unique identifier for a cutsomer.
+            name: The display name of the spec.
+
+        """
+        id_ = models.Spec.calc_id(name)
+        with self._lock:
+            partition = self._spec_partition(sub)
+            latest = partition.items.get(self._latest_updated_at_id(id_))
+            if latest is not None:
+                partition.model_count = (
+                    self.count_customer_models(sub=sub) - latest["model_count"]
+                )
+
+            start, end = _prefix_range(partition.id_updated_ats, f"{id_}#")
+            for id_updated_at in partition.id_updated_ats[start:end]:
+                updated_at_id = partition.id_updated_at_to_updated_at_id.pop(
+                    id_updated_at
+                )
+                del partition.items[updated_at_id]
+                partition.updated_at_ids.remove(updated_at_id)
+            del partition.id_updated_ats[start:end]
+
+    def list_spec_versions(
+        self, *, sub: types.TSub, name: types.TSpecName
+    ) -> types.TSpecInfoList:
+        """
+        List all available versions for a spec for a customer.
+
+        Raises NotFoundError if the spec has no versions.
+
+        Args:
+            sub: Unique identifier for a cutsomer.
+            name: The display name of the spec.
+
+        Returns:
+            List of information for all versions of a spec for the customer.
+
+        """
+        with self._lock:
+            infos = [
+                info.copy()
+                for info in self._version_infos(sub=sub, id_=models.Spec.calc_id(name))
+            ]
+        if not infos:
+            raise exceptions.NotFoundError(f"could not find spec id {name}")
+        return infos
+
+    def list_spec_version_values(
+        self, *, sub: types.TSub, name: types.TSpecName
+    ) -> types.TSpecVersionList:
+        """
+        List the values of all available versions for a spec for a customer.
+
+        Raises NotFoundError if the spec has no versions.
+
+        Args:
+            sub: Unique identifier for a cutsomer.
+            name: The display name of the spec.
+
+        Returns:
+            List of all versions of a spec for the customer.
+
+        """
+        return [info["version"] for info in self.list_spec_versions(sub=sub, name=name)]
+
+    def list_spec_versions_page(
+        self,
+        *,
+        sub: types.TSub,
+        name: types.TSpecName,
+        limit: int,
+        cursor: typing.Optional[types.TCursor] = None,
+    ) -> types.TSpecInfoPage:
+        """
+        List a page of the available versions for a spec for a customer, newest first.
+
+        Raises NotFoundError if the spec has no versions and no cursor is passed.
+        Raises InvalidCursorError if the cursor is not valid.
+
+        Args:
+            sub: Unique identifier for a cutsomer.
+            name: The display name of the spec.
+            limit: The maximum number of versions to return.
+            cursor: The cursor returned with the previous page.
+
+        Returns:
+            The page of versions and the cursor for the next page.
+
+        """
+        id_ = models.Spec.calc_id(name)
+        with self._lock:
+            infos = self._version_infos(sub=sub, id_=id_)[::-1]
+
+        start = 0
+        if cursor is not None:
+            updated_at = models.decode_cursor(cursor, prefix=f"{id_}#")[len(id_) + 1 :]
+            if len(updated_at) != models.UPDATED_AT_LENGTH or not updated_at.isdigit():
+                raise exceptions.InvalidCursorError(f"invalid {cursor=}")
+            start = sum(1 for info in infos if info["updated_at"] >= int(updated_at))
+        elif not infos:
+            raise exceptions.NotFoundError(f"could not find spec id {name}")
+
+        page_infos = infos[start : start + limit]
+        next_cursor = None
+        if start + limit < len(infos):
+            next_cursor = models.encode_cursor(
+                models.Spec.calc_index_values(
+                    updated_at=str(page_infos[-1]["updated_at"]), id_=id_
+                ).id_updated_at
+            )
+        return types.TSpecInfoPage(
+            items=[info.copy() for info in page_infos],
+            cursor=next_cursor,
+        )
+
+    def delete_all_specs(
+        self,
+        *,
+        sub: types.TSub,
+        progress: typing.Optional[types.TDeleteProgress] = None,
+    ) -> int:
+        """
+        Delete all the specs for a user.
+
+        Args:
+            sub: Unique identifier for a cutsomer.
+            progress: Called with the number of items deleted so far.
+
+        Returns:
+            The number of items that were deleted, including the model count item.
+
+        """
+        with self._lock:
+            partition = self._specs.pop(sub, _SpecPartition())
+        deleted = len(partition.items) + (partition.model_count is not None)
+        if progress is not None and deleted:
+            progress(deleted)
+        return deleted
+
+    def list_credentials(self, *, sub: types.TSub) -> types.TCredentialsInfoList:
+        """
+        List all available credentials for a user.
+
+        Args:
+            sub: Unique identifier for a cutsomer.
+
+        Returns:
+            List of information for all credentials of the customer.
+
+        """
+        with self._lock:
+            credentials = self._credentials.get(sub, {})
+            return [
+                {
+                    "id": id_,
+                    "public_key": credentials[id_].public_key,
+                    "salt": credentials[id_].salt,
+                }
+                for id_ in sorted(credentials)
+            ]
+
+    def create_update_credentials(
+        self,
+        *,
+        sub: types.TSub,
+        id_: types.TCredentialsId,
+        public_key: types.TCredentialsPublicKey,
+        secret_key_hash: types.TCredentialsSecretKeyHash,
+        salt: types.TCredentialsSalt,
+    ) -> None:
+        """
+        Create or update credentials.
+
+        Args:
+            sub: Unique identifier for a cutsomer.
+            id_: Unique identifier for the credentials.
+            public_key: Public identifier for the credentials.
+            secret_key_hash: Value derived from the secret key that is safe to store.
+            salt: Random value used to generate the credentials.
+
+        """
+        with self._lock:
+            self.delete_credentials(sub=sub, id_=id_)
+            self._credentials.setdefault(sub, {})[id_] = _Credentials(
+                public_key=public_key, secret_key_hash=secret_key_hash, salt=salt
+            )
+            self._public_keys[public_key] = (sub, id_)
+
+    def get_credentials(
+        self, *, sub: types.TSub, id_: types.TCredentialsId
+    ) -> typing.Optional[types.TCredentialsInfo]:
+        """
+        Retrieve credentials.
+
+        Args:
+            sub: Unique identifier for a cutsomer.
+            id_: Unique identifier for the credentials.
+
+        Returns:
+            Information about the credentials.
+
+        """
+        with self._lock:
+            credentials = self._credentials.get(sub, {}).get(id_)
+            if credentials is None:
+                return None
+            return {
+                "id": id_,
+                "public_key": credentials.public_key,
+                "salt": credentials.salt,
+            }
+
+    def get_user(
+        self, *, public_key: types.TCredentialsPublicKey
+    ) -> typing.Optional[types.CredentialsAuthInfo]:
+        """
+        Retrieve a user and information to authenticate the user.
+
+        Args:
+            public_key: Public identifier for the credentials.
+
+        Returns:
+            Information needed to authenticate the user.
+
+        """
+        with self._lock:
+            key = self._public_keys.get(public_key)
+            if key is None:
+                return None
+            sub, id_ = key
+            credentials = self._credentials[sub][id_]
+            return types.CredentialsAuthInfo(
+                sub=sub,
+                secret_key_hash=credentials.secret_key_hash,
+                salt=credentials.salt,
+            )
+
+    def delete_credentials(self, *, sub: types.TSub, id_: types.TCredentialsId) -> None:
+        """
+        Delete the credentials.
+
+        Args:
+            sub: Unique identifier for a cutsomer.
+            id_: Unique identifier for the credentials.
+
+        """
+        with self._lock:
+            credentials = self._credentials.get(sub, {}).pop(id_, None)
+            if credentials is not None:
+                del self._public_keys[credentials.public_key]
+
+    def delete_all_credentials(
+        self,
+        *,
+        sub: types.TSub,
+        progress: typing.Optional[types.TDeleteProgress] = None,
+    ) -> int:
+        """
+        Delete all the credentials for a user.
+
+        Args:
+            sub: Unique identifier for a cutsomer.
+            progress: Called with the number of items deleted so far.
+
+        Returns:
+            The number of items that were deleted.
+
+        """
+        with self._lock:
+            credentials = self._credentials.pop(sub, {})
+            for item in credentials.values():
+                del self._public_keys[item.public_key]
+        if progress is not None and credentials:
+            progress(len(credentials))
+        return len(credentials)
+
+    def delete_all(
+        self,
+        *,
+        sub: types.TSub,
+        progress: typing.Optional[types.TDeleteProgress] = None,
+    ) -> int:
+        """
+        Delete all the items for a user.
+
+        Args:
+            sub: Unique identifier for a cutsomer.
+            progress: Called with the number of items deleted so far across specs
+                and credentials.
+
+        Returns:
+            The number of items that were deleted.
+
+        """
+        specs_deleted = self.delete_all_specs(sub=sub, progress=progress)
+
+        def credentials_progress(deleted: int) -> None:
+            """Report progress including the deleted specs."""
+            if progress is not None:
+                progress(specs_deleted + deleted)
+
+        return specs_deleted + self.delete_all_credentials(
+            sub=sub, progress=credentials_progress
+        )
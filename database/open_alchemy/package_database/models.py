@@ -1,16 +1,141 @@
 """Database models."""
 
+import base64
+import binascii
+import contextvars
+import itertools
 import time
 import typing
+from concurrent import futures
 
 from packaging import utils
-from pynamodb import attributes, indexes, models
+from pynamodb import attributes, connection
+from pynamodb import exceptions as pynamodb_exceptions
+from pynamodb import indexes, models, transactions
+from pynamodb.expressions import condition
 
 from . import config, exceptions, types
 
 TSpecUpdatedAtId = str
 TSpecIdUpdatedAt = str
 
+TRANSACTION_ATTEMPTS = 5
+UPDATED_AT_LENGTH = 20
+SPEC_KEY_ATTRIBUTES = ["sub", "updated_at_id"]
+CREDENTIALS_KEY_ATTRIBUTES = ["sub", "id"]
+BATCH_WRITE_SIZE = 25
+DELETE_MAX_WORKERS = 8
+
+
+def encode_cursor(value: str) -> types.TCursor:
+    """
+    Encode the value of a sort key as a cursor.
+
+    Args:
+        value: The value of the sort key.
+
+    Returns:
+        The cursor.
+
+    """
+    return base64.urlsafe_b64encode(value.encode()).decode()
+
+
+def decode_cursor(cursor: types.TCursor, *, prefix: str) -> str:
+    """
+    Decode a cursor to the value of a sort key.
+
+    Raises InvalidCursorError if the cursor cannot be decoded or the value does not
+    start with the prefix.
+
+    Args:
+        cursor: The cursor to decode.
+        prefix: The prefix the value of the sort key must start with.
+
+    Returns:
+        The value of the sort key.
+
+    """
+    try:
+        value = base64.urlsafe_b64decode(cursor.encode()).decode()
+    except (binascii.Error, UnicodeDecodeError) as exc:
+        raise exceptions.InvalidCursorError(f"could not decode {cursor=}") from exc
+    if not value.startswith(prefix):
+        raise exceptions.InvalidCursorError(f"invalid {cursor=}")
+    return value
+
+
+TModel = typing.TypeVar("TModel", bound=models.Model)
+
+
+def delete_items(
+    *,
+    model: typing.Type[TModel],
+    items: typing.Iterable[TModel],
+    progress: typing.Optional[types.TDeleteProgress] = None,
+) -> int:
+    """
+    Delete items in batches that are written in parallel.
+
+    The items are split into chunks of BATCH_WRITE_SIZE which are deleted by at most
+    DELETE_MAX_WORKERS threads. Unprocessed items of a batch are retried with
+    exponential backoff by the batch write. At most twice as many chunks as there
+    are threads are read from items ahead of the deletes so that the memory used does
+    not depend on the number of items.
+
+    Args:
+        model: The model of the items.
+        items: The items to delete, only the keys need to be retrieved.
+        progress: Called with the number of items deleted so far after each chunk.
+
+    Returns:
+        The number of items that were deleted.
+
+    """
+
+    def delete_chunk(chunk: typing.List[TModel]) -> int:
+        """Delete a chunk of items."""
+        with model.batch_write() as batch:
+            for item in chunk:
+                batch.delete(item)
+        return len(chunk)
+
+    items_iter = iter(items)
+    chunks = iter(lambda: list(itertools.islice(items_iter, BATCH_WRITE_SIZE)), [])
+
+    deleted = 0
+
+    def record(done: typing.Iterable["futures.Future[int]"]) -> None:
+        """Add the items deleted by the futures and report progress."""
+        nonlocal deleted
+        for future in done:
+            deleted += future.result()
+            if progress is not None:
+                progress(deleted)
+
+    with futures.ThreadPoolExecutor(max_workers=DELETE_MAX_WORKERS) as executor:
+        pending: typing.Set["futures.Future[int]"] = set()
+        for chunk in chunks:
+            pending.add(
+                executor.submit(contextvars.copy_context().run, delete_chunk, chunk)
+            )
+            if len(pending) >= 2 * DELETE_MAX_WORKERS:
+                done, pending = futures.wait(
+                    pending, return_when=futures.FIRST_COMPLETED
+                )
+                record(done)
+        record(futures.as_completed(pending))
+
+    return deleted
+
+
+def _is_condition_failure(exc: pynamodb_exceptions.TransactWriteError) -> bool:
+    """Check whether a transaction was cancelled because a condition failed."""
+    return any(
+        reason is not None and reason.code == "ConditionalCheckFailed"
+        for reason in exc.cancellation_reasons
+    )
+
 
 class TSpecIndexValues(typing.NamedTuple):
     """The index values for Spec."""
@@ -35,6 +160,59 @@ class IdUpdatedAtIndex(indexes.LocalSecondaryIndex):
     id_updated_at = attributes.UnicodeAttribute(range_key=True)
 
 
+class IdUpdatedAtVersionIndex(indexes.GlobalSecondaryIndex):
+    """Global secondary index for listing the versions of a spec."""
+
+    class Meta:
+        """Meta class."""
+
+        projection = indexes.IncludeProjection(["version"])
+        index_name = config.get().specs_version_global_secondary_index_name
+
+        read_capacity_units = 1
+        write_capacity_units = 1
+
+        if config.get().stage == config.Stage.TEST:
+            host = "http://localhost:8000"
+
+    sub = attributes.UnicodeAttribute(hash_key=True)
+    id_updated_at = attributes.UnicodeAttribute(range_key=True)
+
+
+class CustomerModelCount(models.Model):
+    """
+    The number of models across the latest version of all specs of a customer.
+
+    Stored in the specs table in the partition of the customer so that it is deleted
+    together with the specs of the customer.
+
+    Attrs:
+        UPDATED_AT_ID: The value of the sort key of the item
+
+        sub: Unique identifier for a customer
+        updated_at_id: The sort key, always set to UPDATED_AT_ID
+        model_count: The sum of the model_count of the latest version of each spec
+        sequence: Incremented every time model_count is changed so that a rebuild
+            can detect any change, even one that leaves model_count the same
+
+    """
+
+    UPDATED_AT_ID = "model_count"
+
+    class Meta:
+        """Meta class."""
+
+        table_name = config.get().specs_table_name
+
+        if config.get().stage == config.Stage.TEST:
+            host = "http://localhost:8000"
+
+    sub = attributes.UnicodeAttribute(hash_key=True)
+    updated_at_id = attributes.UnicodeAttribute(range_key=True, default=UPDATED_AT_ID)
+    model_count = attributes.NumberAttribute(default=0)
+    sequence = attributes.NumberAttribute(null=True)
+
+
 class Spec(models.Model):
     """
     Information about a spec.
@@ -53,12 +231,15 @@ class Spec(models.Model):
         version: The version of a spec for a package
         title: The title of a spec
         description: The description of a spec
-        model_count: The number of 'x-tablename' and 'x-inherits' in a spec
+        content_hash: The hash of the content the spec was created from
+        model_count: The number of schemas in a spec that define an 'x-tablename'
 
         updated_at_id: Combination of 'updated_at' and 'id' separeted with #
         id_updated_at: Combination of 'id' and 'updated_at' separeted with #
 
         id_updated_at_index: Index for querying id_updated_at efficiently
+        id_updated_at_version_index: Index for querying id_updated_at that only
+            projects the version
 
     """
 
@@ -80,20 +261,54 @@ class Spec(models.Model):
     version = attributes.UnicodeAttribute()
     title = attributes.UnicodeAttribute(null=True)
     description = attributes.UnicodeAttribute(null=True)
+    content_hash = attributes.UnicodeAttribute(null=True)
     model_count = attributes.NumberAttribute()
 
     updated_at_id = attributes.UnicodeAttribute(range_key=True)
     id_updated_at = attributes.UnicodeAttribute()
 
     id_updated_at_index = IdUpdatedAtIndex()
+    id_updated_at_version_index = IdUpdatedAtVersionIndex()
 
     @classmethod
     def count_customer_models(cls, *, sub: types.TSub) -> int:
         """
         Count the number of models on the latest specs for a customer.
 
+        Retrieves the model count item for the customer. If it does not exist, it is
+        created based on the latest specs.
+
+        Args:
+            sub: Unique identifier for the customer.
+
+        Returns:
+            The sum of the model count on the latest version of each unique spec for
+            the customer.
+
+        """
+        try:
+            item = CustomerModelCount.get(
+                hash_key=sub, range_key=CustomerModelCount.UPDATED_AT_ID
+            )
+            return int(item.model_count)
+        except CustomerModelCount.DoesNotExist:
+            return cls.reconcile_customer_model_count(sub=sub)
+
+    @classmethod
+    def reconcile_customer_model_count(cls, *, sub: types.TSub) -> int:
+        """
+        Rebuild the model count item of a customer from the latest specs.
+
         Filters for a particular customer and updated_at_id to start with
-        'latest#' and sums over model_count.
+        'latest#' only retrieving model_count, sums over model_count and stores the
+        result.
+
+        The result is only stored if the sequence of the model count item has not
+        changed since before the specs were queried so that concurrent updates of the
+        model count are not overwritten, even if they leave the model count the same.
+        The rebuild is retried if it has changed.
+
+        Raises ConflictError if the model count keeps changing.
 
         Args:
             sub: Unique identifier for the customer.
@@ -103,16 +318,186 @@ class Spec(models.Model):
             the customer.
 
         """
-        return sum(
-            map(
-                lambda item: int(item.model_count),
-                cls.query(
-                    sub,
-                    cls.updated_at_id.startswith(f"{cls.UPDATED_AT_LATEST}#"),
-                ),
+        for _ in range(TRANSACTION_ATTEMPTS):
+            previous_sequence: typing.Optional[int] = None
+            try:
+                previous_item = CustomerModelCount.get(
+                    hash_key=sub,
+                    range_key=CustomerModelCount.UPDATED_AT_ID,
+                    consistent_read=True,
+                )
+                if previous_item.sequence is not None:
+                    previous_sequence = int(previous_item.sequence)
+            except CustomerModelCount.DoesNotExist:
+                pass
+            unchanged_condition: condition.Condition = (
+                CustomerModelCount.sequence.does_not_exist()
             )
+            if previous_sequence is not None:
+                unchanged_condition = CustomerModelCount.sequence == previous_sequence
+
+            model_count = sum(
+                map(
+                    lambda item: int(item.model_count),
+                    cls.query(
+                        sub,
+                        cls.updated_at_id.startswith(f"{cls.UPDATED_AT_LATEST}#"),
+                        consistent_read=True,
+                        attributes_to_get=["model_count"],
+                    ),
+                )
+            )
+            try:
+                CustomerModelCount(
+                    hash_key=sub,
+                    range_key=CustomerModelCount.UPDATED_AT_ID,
+                    model_count=model_count,
+                    sequence=(previous_sequence or 0) + 1,
+                ).save(condition=unchanged_condition)
+                return model_count
+            except pynamodb_exceptions.PutError as exc:
+                if exc.cause_response_code != "ConditionalCheckFailedException":
+                    raise
+
+        raise exceptions.ConflictError(
+            f"could not reconcile the model count for customer {sub=} due to "
+            "concurrent updates"
+        )
+
+    @classmethod
+    def reconcile_all_customer_model_counts(cls) -> int:
+        """
+        Rebuild the model count item of every customer from the latest specs.
+
+        Scans the specs table for the latest specs and model count items, only
+        retrieving sub, and rebuilds the model count of each customer once. Customers
+        with a model count item but without specs are included so that their model
+        count is reset.
+
+        Returns:
+            The number of customers whose model count was rebuilt.
+
+        """
+        items = CustomerModelCount.scan(
+            CustomerModelCount.updated_at_id.startswith(f"{cls.UPDATED_AT_LATEST}#")
+            | (CustomerModelCount.updated_at_id == CustomerModelCount.UPDATED_AT_ID),
+            attributes_to_get=["sub"],
+        )
+        subs: typing.Set[types.TSub] = set()
+        for item in items:
+            if item.sub in subs:
+                continue
+            subs.add(item.sub)
+            cls.reconcile_customer_model_count(sub=item.sub)
+        return len(subs)
+
+    @classmethod
+    def _get_latest_item(
+        cls, *, sub: types.TSub, id_: types.TSpecId
+    ) -> typing.Tuple[typing.Optional["Spec"], bool]:
+        """
+        Retrieve the latest item for a spec and check whether the model count exists.
+
+        The latest item and the model count item are retrieved in a single request.
+
+        Args:
+            sub: Unique identifier for a cutsomer.
+            id_: Unique identifier for the spec.
+
+        Returns:
+            The latest item for the spec or None if it does not exist and whether the
+            model count item of the customer exists.
+
+        """
+        with transactions.TransactGet(
+            connection=_TRANSACTION_CONNECTION
+        ) as transaction:
+            latest_future = transaction.get(
+                cls,
+                sub,
+                cls.calc_index_values(
+                    updated_at=cls.UPDATED_AT_LATEST, id_=id_
+                ).updated_at_id,
+            )
+            count_future = transaction.get(
+                CustomerModelCount, sub, CustomerModelCount.UPDATED_AT_ID
+            )
+
+        item_latest: typing.Optional["Spec"] = None
+        try:
+            item_latest = latest_future.get()
+        except cls.DoesNotExist:
+            pass
+
+        try:
+            count_future.get()
+        except CustomerModelCount.DoesNotExist:
+            return item_latest, False
+
+        return item_latest, True
+
+    @classmethod
+    def _write_items(
+        cls,
+        *,
+        item: typing.Optional["Spec"],
+        item_latest: typing.Optional["Spec"],
+        item_latest_previous: typing.Optional["Spec"],
+        sub: types.TSub,
+    ) -> None:
+        """
+        Write the items and update the model count in a single transaction.
+
+        The transaction fails if the latest item was changed since it was read or if
+        the model count item no longer exists.
+
+        Args:
+            item: The new version item, None to not write a version item.
+            item_latest: The new latest item, None to delete the latest item.
+            item_latest_previous: The latest item as it was read before the update.
+            sub: Unique identifier for a cutsomer.
+
+        """
+        new_model_count = 0 if item_latest is None else int(item_latest.model_count)
+        previous_model_count = (
+            0 if item_latest_previous is None else int(item_latest_previous.model_count)
         )
 
+        with transactions.TransactWrite(
+            connection=_TRANSACTION_CONNECTION
+        ) as transaction:
+            if item is not None:
+                transaction.save(item)
+
+            if item_latest_previous is None:
+                assert item_latest is not None
+                transaction.save(
+                    item_latest, condition=cls.updated_at_id.does_not_exist()
+                )
+            else:
+                latest_unchanged_condition = (
+                    cls.updated_at == item_latest_previous.updated_at
+                ) & (cls.model_count == previous_model_count)
+                if item_latest is None:
+                    transaction.delete(
+                        item_latest_previous, condition=latest_unchanged_condition
+                    )
+                else:
+                    transaction.save(item_latest, condition=latest_unchanged_condition)
+
+            transaction.update(
+                CustomerModelCount(
+                    hash_key=sub, range_key=CustomerModelCount.UPDATED_AT_ID
+                ),
+                actions=[
+                    CustomerModelCount.model_count.add(
+                        new_model_count - previous_model_count
+                    ),
+                    CustomerModelCount.sequence.add(1),
+                ],
+                condition=CustomerModelCount.model_count.exists(),
+            )
+
     @staticmethod
     def calc_id(name: types.TSpecName) -> types.TSpecId:
         """Calculate the id based on the name."""
@@ -135,7 +520,7 @@ class Spec(models.Model):
         """
         # Zero pad updated_at if it is not latest
         if updated_at != cls.UPDATED_AT_LATEST:
-            updated_at = updated_at.zfill(20)
+            updated_at = updated_at.zfill(UPDATED_AT_LENGTH)
 
         return TSpecIndexValues(
             updated_at_id=f"{updated_at}#{id_}",
@@ -150,8 +535,10 @@ class Spec(models.Model):
         name: types.TSpecName,
         version: types.TSpecVersion,
         model_count: types.TSpecModelCount,
-        title: types.TSpecTitle = None,
-        description: types.TSpecDescription = None,
+        title: types.TOptSpecTitle = None,
+        description: types.TOptSpecDescription = None,
+        content_hash: types.TOptSpecContentHash = None,
+        previous_spec_info: typing.Optional[types.TSpecInfo] = None,
     ) -> None:
         """
         Create or update an item.
@@ -161,6 +548,13 @@ class Spec(models.Model):
         'latest'. Also computes the sort key updated_at_id based on updated_at and
         id.
 
+        Both items are written in a single transaction with an update of the model
+        count of the customer. The transaction is first written on the condition that
+        the latest item is as described by previous_spec_info, so that it does not
+        have to be read beforehand. The latest item is only read if the condition
+        fails, after which the transaction is retried. If the latest item is newer
+        than the item being written, only the version item is written.
+
         Args:
             sub: Unique identifier for a cutsomer.
             name: The display name of the spec.
@@ -168,6 +562,9 @@ class Spec(models.Model):
             model_count: The number of models in the spec.
             title: The title of a spec
             description: The description of a spec
+            content_hash: The hash of the content the spec was created from
+            previous_spec_info: The information about the latest version of the spec
+                as it was last read, None if the spec is expected not to exist.
 
         """
         id_ = cls.calc_id(name)
@@ -183,11 +580,11 @@ class Spec(models.Model):
             version=version,
             title=title,
             description=description,
+            content_hash=content_hash,
             model_count=model_count,
             updated_at_id=index_values.updated_at_id,
             id_updated_at=index_values.id_updated_at,
         )
-        item.save()
 
         # Write latest item
         updated_at_latest = cls.UPDATED_AT_LATEST
@@ -202,11 +599,50 @@ class Spec(models.Model):
             updated_at=updated_at,
             title=title,
             description=description,
+            content_hash=content_hash,
             model_count=model_count,
             updated_at_id=index_values_latest.updated_at_id,
             id_updated_at=index_values_latest.id_updated_at,
         )
-        item_latest.save()
+        # Expected latest item
+        item_latest_previous: typing.Optional["Spec"] = None
+        if previous_spec_info is not None:
+            item_latest_previous = cls(
+                sub=sub,
+                updated_at=str(previous_spec_info["updated_at"]),
+                model_count=previous_spec_info["model_count"],
+                updated_at_id=index_values_latest.updated_at_id,
+            )
+        model_count_exists = True
+
+        for attempt in range(TRANSACTION_ATTEMPTS):
+            if attempt > 0:
+                item_latest_previous, model_count_exists = cls._get_latest_item(
+                    sub=sub, id_=id_
+                )
+            if item_latest_previous is not None and int(
+                item_latest_previous.updated_at
+            ) > int(updated_at):
+                item.save()
+                return
+            if not model_count_exists:
+                cls.reconcile_customer_model_count(sub=sub)
+            try:
+                cls._write_items(
+                    item=item,
+                    item_latest=item_latest,
+                    item_latest_previous=item_latest_previous,
+                    sub=sub,
+                )
+                return
+            except pynamodb_exceptions.TransactWriteError as exc:
+                if not _is_condition_failure(exc):
+                    raise
+
+        raise exceptions.ConflictError(
+            f"could not update the spec {name=} for customer {sub=} due to concurrent "
+            "updates"
+        )
 
     @classmethod
     def get_latest_version(
@@ -218,7 +654,8 @@ class Spec(models.Model):
         Raises NotFoundError if the spec is not found in the database.
 
         Calculates updated_at_id by setting updated_at to latest and using the
-        id. Tries to retrieve an item for a customer based on the sort key.
+        id. Tries to retrieve the version of an item for a customer based on the sort
+        key.
 
         Args:
             sub: Unique identifier for a cutsomer.
@@ -235,6 +672,7 @@ class Spec(models.Model):
                 range_key=cls.calc_index_values(
                     updated_at=cls.UPDATED_AT_LATEST, id_=id_
                 ).updated_at_id,
+                attributes_to_get=["version"],
             )
             return item.version
         except cls.DoesNotExist as exc:
@@ -256,6 +694,8 @@ class Spec(models.Model):
             info["title"] = item.title
         if item.description is not None:
             info["description"] = item.description
+        if item.content_hash is not None:
+            info["content_hash"] = item.content_hash
         return info
 
     @classmethod
@@ -282,6 +722,53 @@ class Spec(models.Model):
             )
         )
 
+    @classmethod
+    def list_page(
+        cls,
+        *,
+        sub: types.TSub,
+        limit: int,
+        cursor: typing.Optional[types.TCursor] = None,
+    ) -> types.TSpecInfoPage:
+        """
+        List a page of the available specs for a customer.
+
+        Filters for a customer and for updated_at_id to start with latest, starting
+        after the updated_at_id encoded in the cursor. The cursor for the next page
+        encodes the last evaluated updated_at_id.
+
+        Raises InvalidCursorError if the cursor is not valid.
+
+        Args:
+            sub: Unique identifier for a cutsomer.
+            limit: The maximum number of specs to return.
+            cursor: The cursor returned with the previous page.
+
+        Returns:
+            The page of specs and the cursor for the next page.
+
+        """
+        prefix = f"{cls.UPDATED_AT_LATEST}#"
+        last_evaluated_key = None
+        if cursor is not None:
+            last_evaluated_key = {
+                "sub": {"S": sub},
+                "updated_at_id": {"S": decode_cursor(cursor, prefix=prefix)},
+            }
+
+        items = cls.query(
+            sub,
+            cls.updated_at_id.startswith(prefix),
+            limit=limit,
+            last_evaluated_key=last_evaluated_key,
+        )
+        infos = list(map(cls.item_to_info, items))
+
+        next_cursor = None
+        if items.last_evaluated_key is not None:
+            next_cursor = encode_cursor(items.last_evaluated_key["updated_at_id"]["S"])
+        return types.TSpecInfoPage(items=infos, cursor=next_cursor)
+
     @classmethod
     def get_item(cls, *, sub: types.TSub, name: types.TSpecName) -> types.TSpecInfo:
         """
@@ -314,19 +801,69 @@ class Spec(models.Model):
         """
         Delete a spec from the database.
 
+        The latest item is deleted in a transaction with an update of the model count
+        of the customer before the remaining items are deleted.
+
         Args:
             sub: Unique identifier for a cutsomer.
             name: The display name of the spec.
 
         """
         id_ = cls.calc_id(name)
+
+        for _ in range(TRANSACTION_ATTEMPTS):
+            item_latest_previous, model_count_exists = cls._get_latest_item(
+                sub=sub, id_=id_
+            )
+            if item_latest_previous is None:
+                break
+            if not model_count_exists:
+                cls.reconcile_customer_model_count(sub=sub)
+            try:
+                cls._write_items(
+                    item=None,
+                    item_latest=None,
+                    item_latest_previous=item_latest_previous,
+                    sub=sub,
+                )
+                break
+            except pynamodb_exceptions.TransactWriteError as exc:
+                if not _is_condition_failure(exc):
+                    raise
+        else:
+            raise exceptions.ConflictError(
+                f"could not delete the spec {name=} for customer {sub=} due to "
+                "concurrent updates"
+            )
+
         items = cls.id_updated_at_index.query(
-            sub, cls.id_updated_at.startswith(f"{id_}#")
+            sub,
+            cls.id_updated_at.startswith(f"{id_}#"),
+            attributes_to_get=SPEC_KEY_ATTRIBUTES,
         )
         with cls.batch_write() as batch:
             for item in items:
                 batch.delete(item)
 
+    @classmethod
+    def _versions_condition(cls, *, id_: types.TSpecId) -> condition.Condition:
+        """
+        Calculate the condition on id_updated_at for the versions of a spec.
+
+        The zero padded updated_at of versions only contains digits which sort before
+        latest, so the latest item is excluded by the key condition.
+
+        Args:
+            id_: The id of the spec.
+
+        Returns:
+            The condition for the versions of the spec.
+
+        """
+        return cls.id_updated_at.between(
+            f"{id_}#{'0' * UPDATED_AT_LENGTH}", f"{id_}#{'9' * UPDATED_AT_LENGTH}"
+        )
+
     @classmethod
     def list_versions(
         cls, *, sub: types.TSub, name: types.TSpecName
@@ -334,7 +871,8 @@ class Spec(models.Model):
         """
         List all available versions for a spec for a customer.
 
-        Filters for a customer and for updated_at_id to start with latest.
+        Filters for a customer and for id_updated_at to be between the smallest and
+        largest zero padded updated_at for the spec which excludes the latest item.
 
         Args:
             sub: Unique identifier for a cutsomer.
@@ -345,29 +883,120 @@ class Spec(models.Model):
 
         """
         id_ = cls.calc_id(name)
+        items = cls.id_updated_at_index.query(sub, cls._versions_condition(id_=id_))
+        return list(map(cls.item_to_info, items))
+
+    @classmethod
+    def list_version_values(
+        cls, *, sub: types.TSub, name: types.TSpecName
+    ) -> types.TSpecVersionList:
+        """
+        List the values of all available versions for a spec for a customer.
+
+        Filters the same way as list_versions using the index that only projects the
+        version.
+
+        Args:
+            sub: Unique identifier for a cutsomer.
+            name: The display name of the spec.
+
+        Returns:
+            List of all versions of a spec for the customer.
+
+        """
+        id_ = cls.calc_id(name)
+        items = cls.id_updated_at_version_index.query(
+            sub, cls._versions_condition(id_=id_), attributes_to_get=["version"]
+        )
+        return [item.version for item in items]
+
+    @classmethod
+    def list_versions_page(
+        cls,
+        *,
+        sub: types.TSub,
+        name: types.TSpecName,
+        limit: int,
+        cursor: typing.Optional[types.TCursor] = None,
+    ) -> types.TSpecInfoPage:
+        """
+        List a page of the available versions for a spec for a customer.
+
+        Filters the same way as list_versions, newest first, starting after the
+        id_updated_at encoded in the cursor. The cursor for the next page encodes the
+        last evaluated id_updated_at.
+
+        Raises InvalidCursorError if the cursor is not valid.
+
+        Args:
+            sub: Unique identifier for a cutsomer.
+            name: The display name of the spec.
+            limit: The maximum number of versions to return.
+            cursor: The cursor returned with the previous page.
+
+        Returns:
+            The page of versions and the cursor for the next page.
+
+        """
+        id_ = cls.calc_id(name)
+
+        last_evaluated_key = None
+        if cursor is not None:
+            id_updated_at = decode_cursor(cursor, prefix=f"{id_}#")
+            updated_at = id_updated_at[len(id_) + 1 :]
+            if len(updated_at) != UPDATED_AT_LENGTH or not updated_at.isdigit():
+                raise exceptions.InvalidCursorError(f"invalid {cursor=}")
+            index_values = cls.calc_index_values(updated_at=updated_at, id_=id_)
+            last_evaluated_key = {
+                "sub": {"S": sub},
+                "updated_at_id": {"S": index_values.updated_at_id},
+                "id_updated_at": {"S": index_values.id_updated_at},
+            }
+
         items = cls.id_updated_at_index.query(
             sub,
-            cls.id_updated_at.startswith(f"{id_}#"),
-        )
-        items_no_latest = filter(
-            lambda item: not item.updated_at_id.startswith(f"{cls.UPDATED_AT_LATEST}#"),
-            items,
+            cls._versions_condition(id_=id_),
+            scan_index_forward=False,
+            limit=limit,
+            last_evaluated_key=last_evaluated_key,
         )
-        return list(map(cls.item_to_info, items_no_latest))
+        infos = list(map(cls.item_to_info, items))
+
+        next_cursor = None
+        if items.last_evaluated_key is not None:
+            next_cursor = encode_cursor(items.last_evaluated_key["id_updated_at"]["S"])
+        return types.TSpecInfoPage(items=infos, cursor=next_cursor)
 
     @classmethod
-    def delete_all(cls, *, sub: types.TSub) -> None:
+    def delete_all(
+        cls,
+        *,
+        sub: types.TSub,
+        progress: typing.Optional[types.TDeleteProgress] = None,
+    ) -> int:
         """
         Delete all the specs for a user.
 
+        Also deletes the model count item of the customer since it is stored in the
+        same partition. Only the keys of the items are retrieved and the items are
+        deleted in parallel batches.
+
         Args:
             sub: Unique identifier for a cutsomer.
+            progress: Called with the number of items deleted so far.
+
+        Returns:
+            The number of items that were deleted.
 
         """
-        items = cls.query(hash_key=sub)
-        with cls.batch_write() as batch:
-            for item in items:
-                batch.delete(item)
+        items = cls.query(hash_key=sub, attributes_to_get=SPEC_KEY_ATTRIBUTES)
+        return delete_items(model=cls, items=items, progress=progress)
+
+
+# The connection for transactions is created once, using the host of the Spec model
+# and the pynamodb settings for everything else, so that the underlying client is
+# re-used rather than created for every transaction
+_TRANSACTION_CONNECTION = connection.Connection(host=Spec.Meta.host)
 
 
 class PublicKeyIndex(indexes.GlobalSecondaryIndex):
@@ -537,15 +1166,25 @@ class Credentials(models.Model):
             pass
 
     @classmethod
-    def delete_all(cls, *, sub: types.TSub) -> None:
+    def delete_all(
+        cls,
+        *,
+        sub: types.TSub,
+        progress: typing.Optional[types.TDeleteProgress] = None,
+    ) -> int:
         """
         Delete all the credentials for a user.
 
+        Only the keys of the items are retrieved and the items are deleted in
+        parallel batches.
+
         Args:
             sub: Unique identifier for a cutsomer.
+            progress: Called with the number of items deleted so far.
+
+        Returns:
+            The number of items that were deleted.
 
         """
-        items = cls.query(hash_key=sub)
-        with cls.batch_write() as batch:
-            for item in items:
-                batch.delete(item)
+        items = cls.query(hash_key=sub, attributes_to_get=CREDENTIALS_KEY_ATTRIBUTES)
+        return delete_items(model=cls, items=items, progress=progress)
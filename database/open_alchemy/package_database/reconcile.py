@@ -0,0 +1,22 @@
+"""
+Rebuild the model count of every customer from the latest specs.
+
+The model count of a customer is updated together with the specs, this repairs any
+model count that has drifted. It is safe to run while specs are being written.
+
+Usage:
+    python -m open_alchemy.package_database.reconcile
+
+"""
+
+from . import models
+
+
+def main() -> None:
+    """Rebuild the model count of every customer."""
+    customer_count = models.Spec.reconcile_all_customer_model_counts()
+    print(f"rebuilt the model count of {customer_count} customers")  # allow-print
+
+
+if __name__ == "__main__":
+    main()
@@ -4,14 +4,18 @@ import dataclasses
 import typing
 
 TSub = str
+TDeleteProgress = typing.Callable[[int], None]
 
 TSpecId = str
 TSpecName = str
 TSpecVersion = str
+TSpecVersionList = typing.List[TSpecVersion]
 TSpecTitle = str
 TOptSpecTitle = typing.Optional[TSpecTitle]
 TSpecDescription = str
 TOptSpecDescription = typing.Optional[TSpecDescription]
+TSpecContentHash = str
+TOptSpecContentHash = typing.Optional[TSpecContentHash]
 TSpecUpdatedAt = str
 TSpecModelCount = int
 
@@ -26,6 +30,7 @@ class _TSpecInfoBase(typing.TypedDict, total=False):
 
     title: TSpecTitle
     description: TSpecDescription
+    content_hash: TSpecContentHash
 
 
 class TSpecInfo(_TSpecInfoBase, total=True):
@@ -49,6 +54,23 @@ class TSpecInfo(_TSpecInfoBase, total=True):
 
 TSpecInfoList = typing.List[TSpecInfo]
 
+TCursor = str
+
+
+@dataclasses.dataclass
+class TSpecInfoPage:
+    """
+    A page of information about specs.
+
+    Attrs:
+        items: The information about the specs on the page.
+        cursor: Pass to retrieve the next page, None if there are no more pages.
+
+    """
+
+    items: TSpecInfoList
+    cursor: typing.Optional[TCursor]
+
 
 class TCredentialsInfo(typing.TypedDict, total=True):
     """
@@ -89,8 +111,7 @@ class CredentialsAuthInfo:
 class TDatabase(typing.Protocol):
     """Interface for database."""
 
-    @staticmethod
-    def count_customer_models(*, sub: TSub) -> int:
+    def count_customer_models(self, *, sub: TSub) -> int:
         """
         Count the number of models a customer has stored.
 
@@ -103,15 +124,30 @@ class TDatabase(typing.Protocol):
         """
         ...
 
-    @staticmethod
+    def reconcile_customer_model_count(self, *, sub: TSub) -> int:
+        """
+        Rebuild the stored number of models of a customer from the latest specs.
+
+        Args:
+            sub: Unique identifier for a cutsomer.
+
+        Returns:
+            The number of models the customer has stored.
+
+        """
+        ...
+
     def create_update_spec(
+        self,
         *,
         sub: TSub,
         name: TSpecName,
         version: TSpecVersion,
         model_count: TSpecModelCount,
         title: TOptSpecTitle = None,
-        description: TSpecDescription = None
+        description: TOptSpecDescription = None,
+        content_hash: TOptSpecContentHash = None,
+        previous_spec_info: typing.Optional[TSpecInfo] = None,
     ) -> None:
         """
         Create or update a spec.
@@ -123,12 +159,14 @@ class TDatabase(typing.Protocol):
             model_count: The number of models in the spec.
             title: The title of a spec.
             description: The description of a spec.
+            content_hash: The hash of the content the spec was created from.
+            previous_spec_info: The information about the latest version of the
+                spec as it was last read, None if the spec is expected not to exist.
 
         """
         ...
 
-    @staticmethod
-    def get_latest_spec_version(*, sub: TSub, name: TSpecName) -> TSpecVersion:
+    def get_latest_spec_version(self, *, sub: TSub, name: TSpecName) -> TSpecVersion:
         """
         Get the latest version for a spec.
 
@@ -144,8 +182,7 @@ class TDatabase(typing.Protocol):
         """
         ...
 
-    @staticmethod
-    def list_specs(*, sub: TSub) -> TSpecInfoList:
+    def list_specs(self, *, sub: TSub) -> TSpecInfoList:
         """
         List all available specs for a customer.
 
@@ -158,13 +195,34 @@ class TDatabase(typing.Protocol):
         """
         ...
 
-    @staticmethod
-    def get_spec(*, sub: TSub, name: TSpecName) -> TSpecInfo:
+    def list_specs_page(
+        self, *, sub: TSub, limit: int, cursor: typing.Optional[TCursor] = None
+    ) -> TSpecInfoPage:
+        """
+        List a page of the available specs for a customer.
+
+        Raises InvalidCursorError if the cursor is not valid.
+
+        Args:
+            sub: Unique identifier for a cutsomer.
+            limit: The maximum number of specs to return.
+            cursor: The cursor returned with the previous page.
+
+        Returns:
+            The page of specs and the cursor for the next page.
+
+        """
+        ...
+
+    def get_spec(self, *, sub: TSub, name: TSpecName) -> TSpecInfo:
         """
         Retrieve a spec from the database.
 
         Raises NotFoundError if the spec does not exist.
 
+        The information includes the latest version of the spec so that it does not
+        have to be retrieved separately.
+
         Args:
             sub: Unique identifier for a cutsomer.
             name: The display name of the spec.
@@ -175,8 +233,7 @@ class TDatabase(typing.Protocol):
         """
         ...
 
-    @staticmethod
-    def delete_spec(*, sub: TSub, name: TSpecName) -> None:
+    def delete_spec(self, *, sub: TSub, name: TSpecName) -> None:
         """
         Delete a spec from the database.
 
@@ -187,8 +244,7 @@ class TDatabase(typing.Protocol):
         """
         ...
 
-    @staticmethod
-    def list_spec_versions(*, sub: TSub, name: TSpecName) -> TSpecInfoList:
+    def list_spec_versions(self, *, sub: TSub, name: TSpecName) -> TSpecInfoList:
         """
         List all available versions for a spec for a customer.
 
@@ -204,19 +260,70 @@ class TDatabase(typing.Protocol):
         """
         ...
 
-    @staticmethod
-    def delete_all_specs(*, sub: TSub) -> None:
+    def list_spec_version_values(
+        self, *, sub: TSub, name: TSpecName
+    ) -> TSpecVersionList:
+        """
+        List the values of all available versions for a spec for a customer.
+
+        Only reads the version of each item which makes it cheaper than
+        list_spec_versions when no other information is needed.
+
+        Raises NotFoundError if the spec has no versions.
+
+        Args:
+            sub: Unique identifier for a cutsomer.
+            name: The display name of the spec.
+
+        Returns:
+            List of all versions of a spec for the customer.
+
+        """
+        ...
+
+    def list_spec_versions_page(
+        self,
+        *,
+        sub: TSub,
+        name: TSpecName,
+        limit: int,
+        cursor: typing.Optional[TCursor] = None,
+    ) -> TSpecInfoPage:
+        """
+        List a page of the available versions for a spec for a customer, newest first.
+
+        Raises NotFoundError if the spec has no versions and no cursor is passed.
+        Raises InvalidCursorError if the cursor is not valid.
+
+        Args:
+            sub: Unique identifier for a cutsomer.
+            name: The display name of the spec.
+            limit: The maximum number of versions to return.
+            cursor: The cursor returned with the previous page.
+
+        Returns:
+            The page of versions and the cursor for the next page.
+
+        """
+        ...
+
+    def delete_all_specs(
+        self, *, sub: TSub, progress: typing.Optional[TDeleteProgress] = None
+    ) -> int:
         """
         Delete all the specs for a user.
 
         Args:
             sub: Unique identifier for a cutsomer.
+            progress: Called with the number of items deleted so far.
+
+        Returns:
+            The number of items that were deleted.
 
         """
         ...
 
-    @staticmethod
-    def list_credentials(*, sub: TSub) -> TCredentialsInfoList:
+    def list_credentials(self, *, sub: TSub) -> TCredentialsInfoList:
         """
         List all available credentials for a user.
 
@@ -231,14 +338,14 @@ class TDatabase(typing.Protocol):
         """
         ...
 
-    @staticmethod
     def create_update_credentials(
+        self,
         *,
         sub: TSub,
         id_: TCredentialsId,
         public_key: TCredentialsPublicKey,
         secret_key_hash: TCredentialsSecretKeyHash,
-        salt: TCredentialsSalt
+        salt: TCredentialsSalt,
     ) -> None:
         """
         Create or update a spec.
@@ -253,9 +360,8 @@ class TDatabase(typing.Protocol):
         """
         ...
 
-    @staticmethod
     def get_credentials(
-        *, sub: TSub, id_: TCredentialsId
+        self, *, sub: TSub, id_: TCredentialsId
     ) -> typing.Optional[TCredentialsInfo]:
         """
         Retrieve credentials.
@@ -270,9 +376,8 @@ class TDatabase(typing.Protocol):
         """
         ...
 
-    @staticmethod
     def get_user(
-        *, public_key: TCredentialsPublicKey
+        self, *, public_key: TCredentialsPublicKey
     ) -> typing.Optional[CredentialsAuthInfo]:
         """
         Retrieve a user and information to authenticate the user.
@@ -286,8 +391,7 @@ class TDatabase(typing.Protocol):
         """
         ...
 
-    @staticmethod
-    def delete_credentials(*, sub: TSub, id_: TCredentialsId) -> None:
+    def delete_credentials(self, *, sub: TSub, id_: TCredentialsId) -> None:
         """
         Delete the credentials.
 
@@ -298,24 +402,34 @@ class TDatabase(typing.Protocol):
         """
         ...
 
-    @staticmethod
-    def delete_all_credentials(*, sub: TSub) -> None:
+    def delete_all_credentials(
+        self, *, sub: TSub, progress: typing.Optional[TDeleteProgress] = None
+    ) -> int:
         """
         Delete all the credentials for a user.
 
         Args:
             sub: Unique identifier for a cutsomer.
+            progress: Called with the number of items deleted so far.
+
+        Returns:
+            The number of items that were deleted.
 
         """
         ...
 
-    @classmethod
-    def delete_all(cls, *, sub: TSub) -> None:
+    def delete_all(
+        self, *, sub: TSub, progress: typing.Optional[TDeleteProgress] = None
+    ) -> int:
         """
         Delete all the items for a user.
 
         Args:
             sub: Unique identifier for a cutsomer.
+            progress: Called with the number of items deleted so far.
+
+        Returns:
+            The number of items that were deleted.
 
         """
         ...
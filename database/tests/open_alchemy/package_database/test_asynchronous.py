@@ -0,0 +1,190 @@
+"""Tests for the asynchronous database facade."""
+
+import asyncio
+import contextvars
+import threading
+from unittest import mock
+
+import pytest
+from open_alchemy import package_database
+from open_alchemy.package_database import asynchronous
+
+METHOD_TESTS = [
+    pytest.param("count_customer_models", {"sub": "sub 1"}, id="count_customer_models"),
+    pytest.param(
+        "reconcile_customer_model_count",
+        {"sub": "sub 1"},
+        id="reconcile_customer_model_count",
+    ),
+    pytest.param(
+        "create_update_spec",
+        {
+            "sub": "sub 1",
+            "name": "name 1",
+            "version": "version 1",
+            "model_count": "model_count 1",
+            "title": "title 1",
+            "description": "description 1",
+            "content_hash": "content_hash 1",
+            "previous_spec_info": "previous_spec_info 1",
+        },
+        id="create_update_spec",
+    ),
+    pytest.param(
+        "get_latest_spec_version",
+        {"sub": "sub 1", "name": "name 1"},
+        id="get_latest_spec_version",
+    ),
+    pytest.param("list_specs", {"sub": "sub 1"}, id="list_specs"),
+    pytest.param(
+        "list_specs_page",
+        {"sub": "sub 1", "limit": "limit 1", "cursor": "cursor 1"},
+        id="list_specs_page",
+    ),
+    pytest.param("get_spec", {"sub": "sub 1", "name": "name 1"}, id="get_spec"),
+    pytest.param("delete_spec", {"sub": "sub 1", "name": "name 1"}, id="delete_spec"),
+    pytest.param(
+        "list_spec_versions",
+        {"sub": "sub 1", "name": "name 1"},
+        id="list_spec_versions",
+    ),
+    pytest.param(
+        "list_spec_version_values",
+        {"sub": "sub 1", "name": "name 1"},
+        id="list_spec_version_values",
+    ),
+    pytest.param(
+        "list_spec_versions_page",
+        {"sub": "sub 1", "name": "name 1", "limit": "limit 1", "cursor": "cursor 1"},
+        id="list_spec_versions_page",
+    ),
+    pytest.param(
+        "delete_all_specs",
+        {"sub": "sub 1", "progress": "progress 1"},
+        id="delete_all_specs",
+    ),
+    pytest.param("list_credentials", {"sub": "sub 1"}, id="list_credentials"),
+    pytest.param(
+        "create_update_credentials",
+        {
+            "sub": "sub 1",
+            "id_": "id_ 1",
+            "public_key": "public_key 1",
+            "secret_key_hash": "secret_key_hash 1",
+            "salt": "salt 1",
+        },
+        id="create_update_credentials",
+    ),
+    pytest.param(
+        "get_credentials", {"sub": "sub 1", "id_": "id_ 1"}, id="get_credentials"
+    ),
+    pytest.param("get_user", {"public_key": "public_key 1"}, id="get_user"),
+    pytest.param(
+        "delete_credentials", {"sub": "sub 1", "id_": "id_ 1"}, id="delete_credentials"
+    ),
+    pytest.param(
+        "delete_all_credentials",
+        {"sub": "sub 1", "progress": "progress 1"},
+        id="delete_all_credentials",
+    ),
+    pytest.param(
+        "delete_all", {"sub": "sub 1", "progress": "progress 1"}, id="delete_all"
+    ),
+]
+
+
+@pytest.mark.parametrize("name, kwargs", METHOD_TESTS)
+def test_method(name, kwargs):
+    """
+    GIVEN database and the name and arguments of a method
+    WHEN the method is awaited on the asynchronous database with the arguments
+    THEN the method of the database is called with the arguments and the return
+        value is returned.
+    """
+    mock_database = mock.MagicMock()
+    async_database = asynchronous.AsyncDatabase(mock_database)
+
+    returned_value = asyncio.run(getattr(async_database, name)(**kwargs))
+
+    getattr(mock_database, name).assert_called_once_with(**kwargs)
+    assert returned_value == getattr(mock_database, name).return_value
+
+
+def test_get_async(_clean_specs_table):
+    """
+    GIVEN spec in the database
+    WHEN get_spec and count_customer_models are awaited together on the asynchronous
+        facade
+    THEN the information of the spec and the model count are returned.
+    """
+    sub = "sub 1"
+    name = "name 1"
+    model_count = 2
+    package_database.get().create_update_spec(
+        sub=sub, name=name, version="version 1", model_count=model_count
+    )
+    async_database = package_database.get_async()
+
+    async def gather():
+        """Await the operations together."""
+        return await asyncio.gather(
+            async_database.get_spec(sub=sub, name=name),
+            async_database.count_customer_models(sub=sub),
+        )
+
+    spec_info, returned_model_count = asyncio.run(gather())
+
+    assert spec_info["name"] == name
+    assert returned_model_count == model_count
+
+
+def test_get_async_error(_clean_specs_table):
+    """
+    GIVEN empty database
+    WHEN get_spec is awaited on the asynchronous facade
+    THEN NotFoundError is raised.
+    """
+    with pytest.raises(package_database.exceptions.NotFoundError):
+        asyncio.run(package_database.get_async().get_spec(sub="sub 1", name="name 1"))
+
+
+def test_run_in_executor():
+    """
+    GIVEN function that reads a context variable and the thread it runs on
+    WHEN it is awaited using run_in_executor with a keyword argument
+    THEN it runs on the shared thread pool in a copy of the context of the caller.
+    """
+    variable: contextvars.ContextVar[str] = contextvars.ContextVar("variable")
+    variable.set("value 1")
+
+    def func(*, argument):
+        """Return the argument, the context variable and the thread name."""
+        return argument, variable.get(), threading.current_thread().name
+
+    returned_value = asyncio.run(
+        asynchronous.run_in_executor(func, argument="argument 1")
+    )
+
+    argument, value, thread_name = returned_value
+    assert argument == "argument 1"
+    assert value == "value 1"
+    assert thread_name.startswith("package-database")
+
+
+def test_run():
+    """
+    GIVEN coroutines
+    WHEN run is called with each of them on the same thread
+    THEN the return values are returned and the event loop is re-used.
+    """
+
+    async def get_loop(value):
+        """Return the value and the running event loop."""
+        return value, asyncio.get_running_loop()
+
+    value_1, loop_1 = asynchronous.run(get_loop("value 1"))
+    value_2, loop_2 = asynchronous.run(get_loop("value 2"))
+
+    assert value_1 == "value 1"
+    assert value_2 == "value 2"
+    assert loop_1 is loop_2
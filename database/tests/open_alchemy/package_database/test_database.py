@@ -5,6 +5,7 @@ from unittest import mock
 
 import pytest
 from open_alchemy import package_database
+from open_alchemy.package_database import models
 
 
 def test_count_customer_models(_clean_specs_table):
@@ -38,6 +39,28 @@ def test_count_customer_models(_clean_specs_table):
     assert database_instance.count_customer_models(sub="sub 2") == 0
 
 
+def test_reconcile_customer_model_count(_clean_specs_table):
+    """
+    GIVEN database with specs for a customer and a stale model count
+    WHEN reconcile_customer_model_count is called
+    THEN the model count is rebuilt from the specs.
+    """
+    sub = "sub 1"
+    database_instance = package_database.get()
+    database_instance.create_update_spec(
+        sub=sub, name="name 1", version="version 1", model_count=1
+    )
+    database_instance.create_update_spec(
+        sub=sub, name="name 2", version="version 2", model_count=2
+    )
+    models.CustomerModelCount(
+        sub, models.CustomerModelCount.UPDATED_AT_ID, model_count=10
+    ).save()
+
+    assert database_instance.reconcile_customer_model_count(sub=sub) == 3
+    assert database_instance.count_customer_models(sub=sub) == 3
+
+
 def test_get_latest_spec_version(_clean_specs_table):
     """
     GIVEN sub, name, version and model count
@@ -133,6 +156,31 @@ def test_list_delete_all_spec(_clean_specs_table):
     assert database_instance.list_specs(sub=sub) == []
 
 
+def test_list_specs_page(_clean_specs_table):
+    """
+    GIVEN specs in the database
+    WHEN list_specs_page is called until no cursor is returned
+    THEN all specs are returned.
+    """
+    sub = "sub 1"
+    database_instance = package_database.get()
+    for name in ["name 1", "name 2"]:
+        database_instance.create_update_spec(
+            sub=sub, name=name, version="version 1", model_count=1
+        )
+
+    first_page = database_instance.list_specs_page(sub=sub, limit=1)
+
+    assert [info["name"] for info in first_page.items] == ["name 1"]
+    assert first_page.cursor is not None
+
+    second_page = database_instance.list_specs_page(
+        sub=sub, limit=1, cursor=first_page.cursor
+    )
+
+    assert [info["name"] for info in second_page.items] == ["name 2"]
+
+
 def test_get_spec(_clean_specs_table):
     """
     GIVEN sub, name, version and model count
@@ -148,8 +196,13 @@ def test_get_spec(_clean_specs_table):
 
     version = "version 1"
     model_count = 1
+    content_hash = "content hash 1"
     database_instance.create_update_spec(
-        sub=sub, name=name, version=version, model_count=model_count
+        sub=sub,
+        name=name,
+        version=version,
+        model_count=model_count,
+        content_hash=content_hash,
     )
 
     returned_info = database_instance.get_spec(sub=sub, name=name)
@@ -158,6 +211,7 @@ def test_get_spec(_clean_specs_table):
     assert returned_info["id"] == name
     assert returned_info["version"] == version
     assert returned_info["model_count"] == model_count
+    assert returned_info["content_hash"] == content_hash
 
 
 def test_delete_spec(_clean_specs_table):
@@ -247,6 +301,63 @@ def test_list_spec_versions(monkeypatch, _clean_specs_table):
     assert "updated_at" in spec_info
 
 
+def test_list_spec_version_values(_clean_specs_table):
+    """
+    GIVEN sub, name, version and model count
+    WHEN create_update_spec is called with the spec info and list_spec_version_values
+        is called
+    THEN the version is returned or NotFoundError is raised.
+    """
+    sub = "sub 1"
+    name = "name 1"
+    version = "version 1"
+    database_instance = package_database.get()
+
+    with pytest.raises(package_database.exceptions.NotFoundError):
+        database_instance.list_spec_version_values(sub=sub, name=name)
+
+    database_instance.create_update_spec(
+        sub=sub, name=name, version=version, model_count=1
+    )
+
+    assert database_instance.list_spec_version_values(sub=sub, name=name) == [version]
+
+
+def test_list_spec_versions_page(monkeypatch, _clean_specs_table):
+    """
+    GIVEN sub, name and multiple versions of a spec
+    WHEN create_update_spec is called for each version and list_spec_versions_page
+        is called until no cursor is returned
+    THEN the versions are returned newest first or NotFoundError is raised.
+    """
+    mock_time = mock.MagicMock()
+    monkeypatch.setattr(time, "time", mock_time)
+    sub = "sub 1"
+    name = "name 1"
+    database_instance = package_database.get()
+
+    with pytest.raises(package_database.exceptions.NotFoundError):
+        database_instance.list_spec_versions_page(sub=sub, name=name, limit=1)
+
+    for idx, version in enumerate(["version 1", "version 2", "version 3"]):
+        mock_time.return_value = 1000000 * (idx + 1)
+        database_instance.create_update_spec(
+            sub=sub, name=name, version=version, model_count=1
+        )
+
+    first_page = database_instance.list_spec_versions_page(sub=sub, name=name, limit=2)
+
+    assert [info["version"] for info in first_page.items] == ["version 3", "version 2"]
+    assert first_page.cursor is not None
+
+    second_page = database_instance.list_spec_versions_page(
+        sub=sub, name=name, limit=2, cursor=first_page.cursor
+    )
+
+    assert [info["version"] for info in second_page.items] == ["version 1"]
+    assert second_page.cursor is None
+
+
 def test_create_list_delete_all_credentials(_clean_credentials_table):
     """
     GIVE multiple credentials
@@ -385,7 +496,25 @@ def test_delete_all(_clean_specs_table, _clean_credentials_table):
     assert len(database_instance.list_specs(sub=sub)) == 1
     assert len(database_instance.list_credentials(sub=sub)) == 1
 
-    database_instance.delete_all(sub=sub)
+    # Latest, version and model count items of the spec and the credentials
+    expected_count = 4
+    progress_calls = []
+
+    returned_count = database_instance.delete_all(
+        sub=sub, progress=progress_calls.append
+    )
 
+    assert returned_count == expected_count
+    assert progress_calls == [3, expected_count]
     assert len(database_instance.list_specs(sub=sub)) == 0
     assert len(database_instance.list_credentials(sub=sub)) == 0
+
+    database_instance.create_update_credentials(
+        sub=sub,
+        id_="id 1",
+        public_key="public key 1",
+        secret_key_hash=b"secret key hash 1",
+        salt=b"salt 1",
+    )
+
+    assert database_instance.delete_all(sub=sub) == 1
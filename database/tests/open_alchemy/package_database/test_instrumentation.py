@@ -0,0 +1,255 @@
+"""Tests for the instrumentation of the database facade."""
+
+import asyncio
+from unittest import mock
+
+import pytest
+from open_alchemy import package_database
+from open_alchemy.package_database import asynchronous, config, instrumentation
+
+from .test_asynchronous import METHOD_TESTS
+
+
+@pytest.fixture()
+def summary():
+    """Start a summary and end it after the test."""
+    yield instrumentation.start_summary()
+
+    instrumentation.end_summary()
+
+
+@pytest.mark.parametrize("name, kwargs", METHOD_TESTS)
+def test_method(name, kwargs, summary):
+    """
+    GIVEN database and the name and arguments of a method
+    WHEN the method is called on the instrumented database with the arguments
+    THEN the method of the database is called with the arguments, the return value is
+        returned and the call is recorded.
+    """
+    mock_database = mock.MagicMock()
+    instrumented_database = instrumentation.Database(mock_database)
+
+    returned_value = getattr(instrumented_database, name)(**kwargs)
+
+    getattr(mock_database, name).assert_called_once_with(**kwargs)
+    assert returned_value == getattr(mock_database, name).return_value
+    assert list(summary.methods) == [name]
+    assert summary.methods[name].count == 1
+    assert summary.methods[name].duration >= 0
+    assert summary.subs == ({kwargs["sub"]} if "sub" in kwargs else set())
+
+
+def test_method_error(summary):
+    """
+    GIVEN database that raises an error
+    WHEN a method is called on the instrumented database
+    THEN the error is raised and the call is recorded.
+    """
+    mock_database = mock.MagicMock()
+    mock_database.get_spec.side_effect = package_database.exceptions.NotFoundError
+    instrumented_database = instrumentation.Database(mock_database)
+
+    with pytest.raises(package_database.exceptions.NotFoundError):
+        instrumented_database.get_spec(sub="sub 1", name="name 1")
+
+    assert summary.methods["get_spec"].count == 1
+
+
+def test_method_no_summary():
+    """
+    GIVEN no summary has been started
+    WHEN a method is called on the instrumented database
+    THEN the return value is returned.
+    """
+    mock_database = mock.MagicMock()
+    instrumented_database = instrumentation.Database(mock_database)
+
+    assert instrumentation.get_summary() is None
+    returned_value = instrumented_database.list_specs(sub="sub 1")
+
+    assert returned_value == mock_database.list_specs.return_value
+
+
+def test_start_get_end_summary():
+    """
+    GIVEN no summary has been started
+    WHEN start_summary, get_summary and end_summary are called
+    THEN the started summary is returned until the summary is ended.
+    """
+    assert instrumentation.get_summary() is None
+
+    summary = instrumentation.start_summary()
+
+    assert instrumentation.get_summary() is summary
+    assert instrumentation.end_summary() is summary
+    assert instrumentation.get_summary() is None
+    assert instrumentation.end_summary() is None
+
+
+@pytest.mark.parametrize(
+    "operation_name, data, expected_read, expected_write, expected_items",
+    [
+        pytest.param("DescribeTable", None, 0, 0, 0, id="no data"),
+        pytest.param("GetItem", {}, 0, 0, 0, id="no item"),
+        pytest.param(
+            "GetItem",
+            {"Item": {}, "ConsumedCapacity": {"CapacityUnits": 0.5}},
+            0.5,
+            0,
+            1,
+            id="read",
+        ),
+        pytest.param(
+            "Query",
+            {"Count": 3, "ConsumedCapacity": {"CapacityUnits": 1.0}},
+            1.0,
+            0,
+            3,
+            id="query",
+        ),
+        pytest.param(
+            "TransactGetItems",
+            {
+                "Responses": [{"Item": {}}, {}],
+                "ConsumedCapacity": [{"CapacityUnits": 2.0}, {"CapacityUnits": 2.0}],
+            },
+            4.0,
+            0,
+            1,
+            id="transaction read",
+        ),
+        pytest.param(
+            "PutItem",
+            {"ConsumedCapacity": {"CapacityUnits": 1.0}},
+            0,
+            1.0,
+            0,
+            id="write",
+        ),
+        pytest.param(
+            "TransactWriteItems",
+            {
+                "ConsumedCapacity": [
+                    {
+                        "CapacityUnits": 5.0,
+                        "ReadCapacityUnits": 1.0,
+                        "WriteCapacityUnits": 4.0,
+                    },
+                    {"CapacityUnits": 2.0, "WriteCapacityUnits": 2.0},
+                ]
+            },
+            1.0,
+            6.0,
+            0,
+            id="split capacity",
+        ),
+        pytest.param(
+            "BatchGetItem",
+            {"Responses": {"table 1": [{}]}},
+            0,
+            0,
+            0,
+            id="batch read",
+        ),
+    ],
+)
+def test_summary_record_response(
+    operation_name, data, expected_read, expected_write, expected_items
+):
+    """
+    GIVEN operation name and the response of a request
+    WHEN record_response is called on a summary
+    THEN the consumed capacity and items read are recorded.
+    """
+    summary = instrumentation.Summary()
+
+    summary.record_response(operation_name=operation_name, data=data)
+
+    assert summary.requests == 1
+    assert summary.read_capacity_units == expected_read
+    assert summary.write_capacity_units == expected_write
+    assert summary.items == expected_items
+
+
+def test_summary_server_timing_to_dict():
+    """
+    GIVEN summary with recorded calls and responses
+    WHEN server_timing and to_dict are called
+    THEN the totals and the calls of each method are returned.
+    """
+    summary = instrumentation.Summary()
+    summary.record_call(name="list_specs", duration=0.002, sub="sub 1")
+    summary.record_call(name="get_spec", duration=0.001, sub="sub 1")
+    summary.record_call(name="get_spec", duration=0.003, sub=None)
+    summary.record_response(
+        operation_name="Query",
+        data={"Count": 2, "ConsumedCapacity": {"CapacityUnits": 1.5}},
+    )
+
+    assert summary.server_timing() == (
+        'db;dur=6.00;desc="requests=1 rcu=1.5 wcu=0 items=2", '
+        'db-get_spec;dur=4.00;desc="calls=2", '
+        'db-list_specs;dur=2.00;desc="calls=1"'
+    )
+    assert summary.to_dict() == {
+        "duration_ms": 6.0,
+        "requests": 1,
+        "read_capacity_units": 1.5,
+        "write_capacity_units": 0.0,
+        "items": 2,
+        "subs": ["sub 1"],
+        "methods": {
+            "get_spec": {"count": 2, "duration_ms": 4.0},
+            "list_specs": {"count": 1, "duration_ms": 2.0},
+        },
+    }
+
+
+def test_install(_clean_specs_table, summary):
+    """
+    GIVEN instrumentation is installed twice and spec in the database
+    WHEN the spec is retrieved, including using the asynchronous facade, and all
+        specs are deleted
+    THEN the requests, consumed capacity and items read are recorded once per
+        request.
+    """
+    instrumentation.install()
+    instrumentation.install()
+    sub = "sub 1"
+    name = "name 1"
+    database_instance = instrumentation.Database(package_database.get())
+    database_instance.create_update_spec(
+        sub=sub, name=name, version="version 1", model_count=1
+    )
+    instrumentation.start_summary()
+
+    database_instance.get_spec(sub=sub, name=name)
+    asyncio.run(
+        asynchronous.AsyncDatabase(database_instance).get_spec(sub=sub, name=name)
+    )
+    summary = instrumentation.get_summary()
+
+    assert summary.methods["get_spec"].count == 2
+    assert summary.requests == 2
+    assert summary.read_capacity_units > 0
+    assert summary.write_capacity_units == 0
+    assert summary.items == 2
+
+    database_instance.delete_all_specs(sub=sub)
+
+    assert summary.requests == 4
+    assert summary.write_capacity_units > 0
+
+
+def test_construct(monkeypatch):
+    """
+    GIVEN instrumentation is enabled in the configuration
+    WHEN the database facade is constructed
+    THEN the instrumented database is returned.
+    """
+    monkeypatch.setattr(config.get(), "instrumentation", True)
+
+    database_instance = package_database._construct()
+
+    assert isinstance(database_instance, instrumentation.Database)
+    assert isinstance(database_instance.database, package_database.dynamodb.Database)
@@ -0,0 +1,341 @@
+"""Tests for the memory database."""
+
+import time
+from unittest import mock
+
+import pytest
+from open_alchemy import package_database
+from open_alchemy.package_database import config, exceptions, memory, models
+
+
+@pytest.fixture()
+def mock_time(monkeypatch):
+    """Replace the time with a mock."""
+    mock_time = mock.MagicMock()
+    mock_time.return_value = 1000000
+    monkeypatch.setattr(time, "time", mock_time)
+    return mock_time
+
+
+def test_construct(monkeypatch):
+    """
+    GIVEN the backend is configured as memory
+    WHEN the database facade is constructed
+    THEN the memory database is returned.
+    """
+    monkeypatch.setattr(config.get(), "backend", config.Backend.MEMORY)  # type: ignore
+
+    assert isinstance(package_database._construct(), memory.Database)
+
+
+def test_count_reconcile_customer_models(mock_time):
+    """
+    GIVEN specs that are created, updated and deleted
+    WHEN count_customer_models and reconcile_customer_model_count are called
+    THEN the number of models in the latest version of each spec is returned.
+    """
+    sub = "sub 1"
+    database_instance = memory.Database()
+
+    assert database_instance.count_customer_models(sub=sub) == 0
+
+    database_instance.create_update_spec(
+        sub=sub, name="name 1", version="version 1", model_count=1
+    )
+    database_instance.create_update_spec(
+        sub=sub, name="name 2", version="version 1", model_count=2
+    )
+    assert database_instance.count_customer_models(sub=sub) == 3
+
+    mock_time.return_value = 2000000
+    database_instance.create_update_spec(
+        sub=sub, name="name 1", version="version 2", model_count=4
+    )
+    assert database_instance.count_customer_models(sub=sub) == 6
+    assert database_instance.count_customer_models(sub="sub 2") == 0
+
+    database_instance.delete_spec(sub=sub, name="name 2")
+    assert database_instance.count_customer_models(sub=sub) == 4
+    assert database_instance.reconcile_customer_model_count(sub=sub) == 4
+
+
+def test_create_update_spec_older(mock_time):
+    """
+    GIVEN a spec with a newer latest version
+    WHEN create_update_spec is called with an older version
+    THEN the older version is stored but the latest version is not replaced.
+    """
+    sub = "sub 1"
+    name = "name 1"
+    database_instance = memory.Database()
+    mock_time.return_value = 2000000
+    database_instance.create_update_spec(
+        sub=sub, name=name, version="version 2", model_count=2
+    )
+
+    mock_time.return_value = 1000000
+    database_instance.create_update_spec(
+        sub=sub, name=name, version="version 1", model_count=1
+    )
+
+    assert database_instance.get_latest_spec_version(sub=sub, name=name) == "version 2"
+    assert database_instance.count_customer_models(sub=sub) == 2
+    assert database_instance.list_spec_version_values(sub=sub, name=name) == [
+        "version 1",
+        "version 2",
+    ]
+
+
+def test_create_get_delete_spec(mock_time):
+    """
+    GIVEN a spec
+    WHEN create_update_spec, get_spec and delete_spec are called
+    THEN the spec is returned with the optional information and is then removed.
+    """
+    sub = "sub 1"
+    name = "Name 1"
+    database_instance = memory.Database()
+
+    with pytest.raises(exceptions.NotFoundError):
+        database_instance.get_spec(sub=sub, name=name)
+    with pytest.raises(exceptions.NotFoundError):
+        database_instance.get_latest_spec_version(sub=sub, name=name)
+
+    database_instance.create_update_spec(
+        sub=sub,
+        name=name,
+        version="version 1",
+        model_count=1,
+        title="title 1",
+        description="description 1",
+        content_hash="content hash 1",
+    )
+
+    assert database_instance.get_spec(sub=sub, name=name) == {
+        "name": name,
+        "id": models.Spec.calc_id(name),
+        "updated_at": 1000000,
+        "version": "version 1",
+        "model_count": 1,
+        "title": "title 1",
+        "description": "description 1",
+        "content_hash": "content hash 1",
+    }
+    assert database_instance.get_spec(sub=sub, name="NAME 1")["name"] == name
+    with pytest.raises(exceptions.NotFoundError):
+        database_instance.get_spec(sub="sub 2", name=name)
+
+    database_instance.delete_spec(sub=sub, name=name)
+    database_instance.delete_spec(sub=sub, name=name)
+
+    with pytest.raises(exceptions.NotFoundError):
+        database_instance.get_spec(sub=sub, name=name)
+    with pytest.raises(exceptions.NotFoundError):
+        database_instance.list_spec_versions(sub=sub, name=name)
+    assert database_instance.list_specs(sub=sub) == []
+
+
+def test_list_specs_page(mock_time):
+    """
+    GIVEN specs in the database
+    WHEN list_specs and list_specs_page are called following the cursor
+    THEN the latest version of every spec is returned once in id order.
+    """
+    sub = "sub 1"
+    database_instance = memory.Database()
+    names = ["name 3", "name 1", "name 2"]
+    for name in names:
+        database_instance.create_update_spec(
+            sub=sub, name=name, version="version 1", model_count=1
+        )
+    mock_time.return_value = 2000000
+    database_instance.create_update_spec(
+        sub=sub, name="name 1", version="version 2", model_count=1
+    )
+    database_instance.create_update_spec(
+        sub="sub 2", name="name 4", version="version 1", model_count=1
+    )
+
+    specs = database_instance.list_specs(sub=sub)
+    assert [spec["name"] for spec in specs] == sorted(names)
+    assert specs[0]["version"] == "version 2"
+
+    page_1 = database_instance.list_specs_page(sub=sub, limit=2)
+    assert page_1.items == specs[:2]
+    assert page_1.cursor is not None
+    page_2 = database_instance.list_specs_page(sub=sub, limit=2, cursor=page_1.cursor)
+    assert page_2.items == specs[2:]
+    assert page_2.cursor is None
+
+    with pytest.raises(exceptions.InvalidCursorError):
+        database_instance.list_specs_page(sub=sub, limit=2, cursor="invalid")
+
+
+def test_list_spec_versions_page(mock_time):
+    """
+    GIVEN multiple versions of a spec
+    WHEN list_spec_versions and list_spec_versions_page are called following the
+        cursor
+    THEN the versions are returned oldest first and newest first respectively.
+    """
+    sub = "sub 1"
+    name = "name 1"
+    database_instance = memory.Database()
+
+    with pytest.raises(exceptions.NotFoundError):
+        database_instance.list_spec_versions_page(sub=sub, name=name, limit=2)
+    with pytest.raises(exceptions.NotFoundError):
+        database_instance.list_spec_version_values(sub=sub, name=name)
+
+    for idx in range(3):
+        mock_time.return_value = 1000000 * (idx + 1)
+        database_instance.create_update_spec(
+            sub=sub, name=name, version=f"version {idx}", model_count=1
+        )
+    database_instance.create_update_spec(
+        sub=sub, name="name 10", version="version 1", model_count=1
+    )
+
+    versions = database_instance.list_spec_versions(sub=sub, name=name)
+    assert [version["version"] for version in versions] == [
+        "version 0",
+        "version 1",
+        "version 2",
+    ]
+    assert [version["updated_at"] for version in versions] == [
+        1000000,
+        2000000,
+        3000000,
+    ]
+
+    page_1 = database_instance.list_spec_versions_page(sub=sub, name=name, limit=2)
+    assert page_1.items == versions[::-1][:2]
+    assert page_1.cursor is not None
+    page_2 = database_instance.list_spec_versions_page(
+        sub=sub, name=name, limit=2, cursor=page_1.cursor
+    )
+    assert page_2.items == versions[:1]
+    assert page_2.cursor is None
+
+    assert database_instance.list_spec_versions_page(
+        sub="sub 2", name=name, limit=2, cursor=page_1.cursor
+    ) == package_database.types.TSpecInfoPage(items=[], cursor=None)
+
+
+@pytest.mark.parametrize(
+    "cursor",
+    [
+        pytest.param("invalid", id="not encoded"),
+        pytest.param(models.encode_cursor("name 2#00000000000001000000"), id="id"),
+        pytest.param(models.encode_cursor("name 1#1000000"), id="length"),
+        pytest.param(models.encode_cursor(f"name 1#{'a' * 20}"), id="digits"),
+    ],
+)
+def test_list_spec_versions_page_invalid_cursor(cursor):
+    """
+    GIVEN invalid cursor
+    WHEN list_spec_versions_page is called with the cursor
+    THEN InvalidCursorError is raised.
+    """
+    with pytest.raises(exceptions.InvalidCursorError):
+        memory.Database().list_spec_versions_page(
+            sub="sub 1", name="name 1", limit=2, cursor=cursor
+        )
+
+
+def test_credentials():
+    """
+    GIVEN credentials
+    WHEN the credentials are created, updated, retrieved and deleted
+    THEN the credentials and the user are returned until they are deleted.
+    """
+    sub = "sub 1"
+    database_instance = memory.Database()
+
+    assert database_instance.get_credentials(sub=sub, id_="id 1") is None
+    assert database_instance.get_user(public_key="public key 1") is None
+
+    database_instance.create_update_credentials(
+        sub=sub,
+        id_="id 2",
+        public_key="public key 2",
+        secret_key_hash=b"secret key hash 2",
+        salt=b"salt 2",
+    )
+    database_instance.create_update_credentials(
+        sub=sub,
+        id_="id 1",
+        public_key="public key 1",
+        secret_key_hash=b"secret key hash 1",
+        salt=b"salt 1",
+    )
+    database_instance.create_update_credentials(
+        sub=sub,
+        id_="id 1",
+        public_key="public key 3",
+        secret_key_hash=b"secret key hash 3",
+        salt=b"salt 3",
+    )
+
+    assert database_instance.list_credentials(sub=sub) == [
+        {"id": "id 1", "public_key": "public key 3", "salt": b"salt 3"},
+        {"id": "id 2", "public_key": "public key 2", "salt": b"salt 2"},
+    ]
+    assert database_instance.get_credentials(sub=sub, id_="id 1") == {
+        "id": "id 1",
+        "public_key": "public key 3",
+        "salt": b"salt 3",
+    }
+    assert database_instance.get_user(public_key="public key 1") is None
+    assert database_instance.get_user(
+        public_key="public key 3"
+    ) == package_database.types.CredentialsAuthInfo(
+        sub=sub, secret_key_hash=b"secret key hash 3", salt=b"salt 3"
+    )
+
+    database_instance.delete_credentials(sub=sub, id_="id 1")
+
+    assert database_instance.get_credentials(sub=sub, id_="id 1") is None
+    assert database_instance.get_user(public_key="public key 3") is None
+    assert len(database_instance.list_credentials(sub=sub)) == 1
+
+
+def test_delete_all(mock_time):
+    """
+    GIVEN specs and credentials for a user and another user
+    WHEN delete_all is called
+    THEN all items of the user are deleted and progress is reported.
+    """
+    sub = "sub 1"
+    database_instance = memory.Database()
+    database_instance.create_update_spec(
+        sub=sub, name="name 1", version="version 1", model_count=1
+    )
+    database_instance.create_update_spec(
+        sub="sub 2", name="name 1", version="version 1", model_count=1
+    )
+    database_instance.create_update_credentials(
+        sub=sub,
+        id_="id 1",
+        public_key="public key 1",
+        secret_key_hash=b"secret key hash 1",
+        salt=b"salt 1",
+    )
+    progress_calls = []
+
+    assert database_instance.delete_all(sub=sub, progress=progress_calls.append) == 4
+
+    assert progress_calls == [3, 4]
+    assert database_instance.list_specs(sub=sub) == []
+    assert database_instance.list_credentials(sub=sub) == []
+    assert database_instance.get_user(public_key="public key 1") is None
+    assert len(database_instance.list_specs(sub="sub 2")) == 1
+    database_instance.create_update_credentials(
+        sub=sub,
+        id_="id 1",
+        public_key="public key 1",
+        secret_key_hash=b"secret key hash 1",
+        salt=b"salt 1",
+    )
+    assert database_instance.delete_all(sub=sub) == 1
+    assert database_instance.delete_all(sub=sub) == 0
@@ -392,3 +392,27 @@ def test_delete_all(items, sub, expected_count):
     models.Credentials.delete_all(sub=sub)
 
     assert len(list(models.Credentials.scan())) == expected_count
+
+
+@pytest.mark.models
+def test_delete_all_many():
+    """
+    GIVEN database with more items for a sub than fit into a batch
+    WHEN delete_all is called with the sub and progress
+    THEN all items are deleted, the number deleted is returned and progress is
+        reported.
+    """
+    sub = "sub 1"
+    item_count = models.BATCH_WRITE_SIZE + 1
+    for _ in range(item_count):
+        factory.CredentialsFactory(sub=sub).save()
+    progress_calls = []
+
+    returned_count = models.Credentials.delete_all(
+        sub=sub, progress=progress_calls.append
+    )
+
+    assert returned_count == item_count
+    assert len(list(models.Credentials.scan())) == 0
+    assert sorted(progress_calls) == progress_calls
+    assert progress_calls[-1] == item_count
@@ -1,7 +1,11 @@
 """Tests for the models."""
 
+import typing
+from unittest import mock
+
 import pytest
-from open_alchemy.package_database import factory, models
+from open_alchemy.package_database import exceptions, factory, models
+from pynamodb import exceptions as pynamodb_exceptions
 
 COUNT_CUSTOMER_MODELS_TESTS = [
     pytest.param([], "sub 2", 0, id="empty"),
@@ -110,3 +114,245 @@ def test_count_customer_models(items, sub, expected_count):
     returned_count = models.Spec.count_customer_models(sub=sub)
 
     assert returned_count == expected_count
+
+
+@pytest.mark.models
+def test_count_customer_models_stored():
+    """
+    GIVEN database with a latest item and a model count item for a customer
+    WHEN count_customer_models on Spec is called with the sub
+    THEN the stored model count is returned.
+    """
+    sub = "sub 1"
+    factory.SpecFactory(
+        sub=sub,
+        updated_at_id=f"{models.Spec.UPDATED_AT_LATEST}#spec 1",
+        model_count=12,
+    ).save()
+    models.CustomerModelCount(
+        sub, models.CustomerModelCount.UPDATED_AT_ID, model_count=5
+    ).save()
+
+    returned_count = models.Spec.count_customer_models(sub=sub)
+
+    assert returned_count == 5
+
+
+@pytest.mark.parametrize("items, sub, expected_count", COUNT_CUSTOMER_MODELS_TESTS)
+@pytest.mark.models
+def test_reconcile_customer_model_count(items, sub, expected_count):
+    """
+    GIVEN items in the database, a stale model count item and sub
+    WHEN reconcile_customer_model_count on Spec is called with the sub
+    THEN the expected count is returned and stored.
+    """
+    for item in items:
+        item.save()
+    models.CustomerModelCount(
+        sub, models.CustomerModelCount.UPDATED_AT_ID, model_count=100
+    ).save()
+
+    returned_count = models.Spec.reconcile_customer_model_count(sub=sub)
+
+    assert returned_count == expected_count
+    assert models.Spec.count_customer_models(sub=sub) == expected_count
+
+
+def _add_to_model_count_on_query(
+    monkeypatch, *, times: int, model_count_changes: typing.Sequence[int] = (1,)
+) -> mock.MagicMock:
+    """
+    Update the model count item whenever the specs are queried up to times.
+
+    Each change is applied the same way as when a spec is written.
+
+    """
+    original_query = models.Spec.query
+
+    def query(*args, **kwargs):
+        """Update the model count item before querying."""
+        if mock_query.call_count <= times:
+            for model_count_change in model_count_changes:
+                models.CustomerModelCount(
+                    "sub 1", models.CustomerModelCount.UPDATED_AT_ID
+                ).update(
+                    actions=[
+                        models.CustomerModelCount.model_count.add(model_count_change),
+                        models.CustomerModelCount.sequence.add(1),
+                    ]
+                )
+        return original_query(*args, **kwargs)
+
+    mock_query = mock.MagicMock(side_effect=query)
+    monkeypatch.setattr(models.Spec, "query", mock_query)
+    return mock_query
+
+
+@pytest.mark.models
+def test_reconcile_customer_model_count_concurrent_update(monkeypatch):
+    """
+    GIVEN database with a latest item and a model count item that is updated
+        concurrently once
+    WHEN reconcile_customer_model_count on Spec is called
+    THEN the specs are queried again and the count of the latest items is stored.
+    """
+    sub = "sub 1"
+    factory.SpecFactory(
+        sub=sub,
+        updated_at_id=f"{models.Spec.UPDATED_AT_LATEST}#spec 1",
+        model_count=12,
+    ).save()
+    models.CustomerModelCount(
+        sub, models.CustomerModelCount.UPDATED_AT_ID, model_count=100
+    ).save()
+    mock_query = _add_to_model_count_on_query(monkeypatch, times=1)
+
+    returned_count = models.Spec.reconcile_customer_model_count(sub=sub)
+
+    assert returned_count == 12
+    assert mock_query.call_count == 2
+    count_item = models.CustomerModelCount.get(
+        sub, models.CustomerModelCount.UPDATED_AT_ID
+    )
+    assert count_item.model_count == 12
+
+
+@pytest.mark.models
+def test_reconcile_customer_model_count_concurrent_update_same_count(monkeypatch):
+    """
+    GIVEN database with a latest item and a model count item that is updated
+        concurrently once by a create and a delete that leave the model count the
+        same
+    WHEN reconcile_customer_model_count on Spec is called
+    THEN the specs are queried again and the count of the latest items is stored.
+    """
+    sub = "sub 1"
+    factory.SpecFactory(
+        sub=sub,
+        updated_at_id=f"{models.Spec.UPDATED_AT_LATEST}#spec 1",
+        model_count=12,
+    ).save()
+    models.CustomerModelCount(
+        sub, models.CustomerModelCount.UPDATED_AT_ID, model_count=100
+    ).save()
+    mock_query = _add_to_model_count_on_query(
+        monkeypatch, times=1, model_count_changes=(5, -5)
+    )
+
+    returned_count = models.Spec.reconcile_customer_model_count(sub=sub)
+
+    assert returned_count == 12
+    assert mock_query.call_count == 2
+    count_item = models.CustomerModelCount.get(
+        sub, models.CustomerModelCount.UPDATED_AT_ID
+    )
+    assert count_item.model_count == 12
+    assert count_item.sequence == 3
+
+
+@pytest.mark.models
+def test_reconcile_customer_model_count_sequence_missing():
+    """
+    GIVEN database with a latest item and a model count item without a sequence
+    WHEN reconcile_customer_model_count on Spec is called
+    THEN the count of the latest items is stored with a sequence.
+    """
+    sub = "sub 1"
+    factory.SpecFactory(
+        sub=sub,
+        updated_at_id=f"{models.Spec.UPDATED_AT_LATEST}#spec 1",
+        model_count=12,
+    ).save()
+    models.CustomerModelCount(
+        sub, models.CustomerModelCount.UPDATED_AT_ID, model_count=100
+    ).save()
+
+    returned_count = models.Spec.reconcile_customer_model_count(sub=sub)
+
+    assert returned_count == 12
+    count_item = models.CustomerModelCount.get(
+        sub, models.CustomerModelCount.UPDATED_AT_ID
+    )
+    assert count_item.model_count == 12
+    assert count_item.sequence == 1
+
+
+@pytest.mark.models
+def test_reconcile_all_customer_model_counts():
+    """
+    GIVEN database with latest items for multiple customers, a stale model count
+        item for one of them and a model count item for a customer without specs
+    WHEN reconcile_all_customer_model_counts on Spec is called
+    THEN the model count of each customer is rebuilt once.
+    """
+    factory.SpecFactory(
+        sub="sub 1",
+        updated_at_id=f"{models.Spec.UPDATED_AT_LATEST}#spec 1",
+        model_count=11,
+    ).save()
+    factory.SpecFactory(
+        sub="sub 1",
+        updated_at_id=f"{models.Spec.UPDATED_AT_LATEST}#spec 2",
+        model_count=12,
+    ).save()
+    factory.SpecFactory(sub="sub 1", updated_at_id="11#spec 1", model_count=13).save()
+    factory.SpecFactory(
+        sub="sub 2",
+        updated_at_id=f"{models.Spec.UPDATED_AT_LATEST}#spec 1",
+        model_count=21,
+    ).save()
+    models.CustomerModelCount(
+        "sub 2", models.CustomerModelCount.UPDATED_AT_ID, model_count=100
+    ).save()
+    models.CustomerModelCount(
+        "sub 3", models.CustomerModelCount.UPDATED_AT_ID, model_count=100
+    ).save()
+
+    returned_count = models.Spec.reconcile_all_customer_model_counts()
+
+    assert returned_count == 3
+    for sub, expected_model_count in (("sub 1", 23), ("sub 2", 21), ("sub 3", 0)):
+        count_item = models.CustomerModelCount.get(
+            sub, models.CustomerModelCount.UPDATED_AT_ID
+        )
+        assert count_item.model_count == expected_model_count
+        assert count_item.sequence == 1
+
+
+@pytest.mark.models
+def test_reconcile_customer_model_count_conflict(monkeypatch):
+    """
+    GIVEN database with a model count item that is always updated concurrently
+    WHEN reconcile_customer_model_count on Spec is called
+    THEN ConflictError is raised and the concurrent updates are kept.
+    """
+    sub = "sub 1"
+    models.CustomerModelCount(
+        sub, models.CustomerModelCount.UPDATED_AT_ID, model_count=100
+    ).save()
+    _add_to_model_count_on_query(monkeypatch, times=models.TRANSACTION_ATTEMPTS)
+
+    with pytest.raises(exceptions.ConflictError):
+        models.Spec.reconcile_customer_model_count(sub=sub)
+
+    count_item = models.CustomerModelCount.get(
+        sub, models.CustomerModelCount.UPDATED_AT_ID
+    )
+    assert count_item.model_count == 100 + models.TRANSACTION_ATTEMPTS
+
+
+@pytest.mark.models
+def test_reconcile_customer_model_count_error(monkeypatch):
+    """
+    GIVEN storing the model count item fails for a reason other than a condition
+    WHEN reconcile_customer_model_count on Spec is called
+    THEN the error is raised.
+    """
+    monkeypatch.setattr(
+        models.CustomerModelCount,
+        "save",
+        mock.MagicMock(side_effect=pynamodb_exceptions.PutError("failed")),
+    )
+
+    with pytest.raises(pynamodb_exceptions.PutError):
+        models.Spec.reconcile_customer_model_count(sub="sub 1")
@@ -4,12 +4,13 @@ import time
 from unittest import mock
 
 import pytest
-from open_alchemy.package_database import factory, models
+from open_alchemy.package_database import exceptions, factory, models
 from packaging import utils
+from pynamodb import exceptions as pynamodb_exceptions
 
 
 @pytest.mark.parametrize(
-    "sub, name, version, title, description, model_count",
+    "sub, name, version, title, description, content_hash, model_count",
     [
         pytest.param(
             "sub 1",
@@ -17,8 +18,9 @@ from packaging import utils
             "version 1",
             None,
             None,
+            None,
             11,
-            id="title description None",
+            id="title description content hash None",
         ),
         pytest.param(
             "sub 1",
@@ -26,21 +28,26 @@ from packaging import utils
             "version 1",
             "title 1",
             "description 1",
+            "content hash 1",
             11,
-            id="title description defined",
+            id="title description content hash defined",
         ),
     ],
 )
 @pytest.mark.models
-def test_create_update_item_empty(sub, name, version, title, description, model_count):
+def test_create_update_item_empty(
+    sub, name, version, title, description, content_hash, model_count
+):
     """
-    GIVEN empty database, sub, spec name, version, title, description and model count
+    GIVEN empty database, sub, spec name, version, title, description, content hash
+        and model count
     WHEN create_update_item is called on Spec with the sub, spec name, version
-        title, description and model count
-    THEN an item is created with the sub, spec name and id, version, title, description
-        and model count as well as updated_at with close to the current time and a
-        correct sort key value
+        title, description, content hash and model count
+    THEN an item is created with the sub, spec name and id, version, title,
+        description, content hash and model count as well as updated_at with close to
+        the current time and a correct sort key value
     AND another similar record with updated_at set to latest
+    AND the model count of the customer is updated
     """
     models.Spec.create_update_item(
         sub=sub,
@@ -48,6 +55,7 @@ def test_create_update_item_empty(sub, name, version, title, description, model_
         version=version,
         title=title,
         description=description,
+        content_hash=content_hash,
         model_count=model_count,
     )
 
@@ -66,6 +74,7 @@ def test_create_update_item_empty(sub, name, version, title, description, model_
     assert item.version == version
     assert item.title == title
     assert item.description == description
+    assert item.content_hash == content_hash
     assert isinstance(item.model_count, int)
     assert item.model_count == model_count
     assert not "." in item.updated_at
@@ -88,14 +97,21 @@ def test_create_update_item_empty(sub, name, version, title, description, model_
     assert item.version == version
     assert item.title == title
     assert item.description == description
+    assert item.content_hash == content_hash
     assert isinstance(item.model_count, int)
     assert item.model_count == model_count
     assert int(item.updated_at) == pytest.approx(time.time(), abs=10)
     assert item.updated_at_id == f"{models.Spec.UPDATED_AT_LATEST}#{item.id}"
     assert item.id_updated_at == f"{item.id}#{models.Spec.UPDATED_AT_LATEST}"
 
+    count_item = models.CustomerModelCount.get(
+        sub, models.CustomerModelCount.UPDATED_AT_ID
+    )
+    assert count_item.model_count == model_count
+
+    # 2 spec items and the model count item
     items = list(models.Spec.scan())
-    assert len(items) == 2
+    assert len(items) == 3
 
 
 @pytest.mark.models
@@ -106,6 +122,7 @@ def test_create_update_item_single():
     THEN an new item is created with the sub and spec id and updated_at with the
         current time
     AND another similar record with updated_at set to latest
+    AND the model count of the customer is updated
     """
     initial_item_name = "name 1"
     initial_item = factory.SpecFactory(
@@ -145,8 +162,14 @@ def test_create_update_item_single():
     assert item.name == name
     assert int(item.updated_at) == pytest.approx(time.time(), abs=10)
 
+    count_item = models.CustomerModelCount.get(
+        sub, models.CustomerModelCount.UPDATED_AT_ID
+    )
+    assert count_item.model_count == model_count
+
+    # initial item, 2 spec items and the model count item
     items = list(models.Spec.scan())
-    assert len(items) == 3
+    assert len(items) == 4
 
 
 @pytest.mark.models
@@ -156,7 +179,8 @@ def test_create_update_item_update(monkeypatch):
     WHEN create_update_item is called on Spec multiple times with the same
         sub and spec id but different versions and model counts at different times
     THEN a record for each version is added to the database
-    AND the latest record points to the last inserted record.
+    AND the latest record points to the last inserted record
+    AND the model count of the customer is the model count of the last version.
     """
     sub = "sub 1"
     name_1 = "name 1"
@@ -215,8 +239,14 @@ def test_create_update_item_update(monkeypatch):
     assert item.model_count == model_count_2
     assert item.version == version_2
 
+    count_item = models.CustomerModelCount.get(
+        sub, models.CustomerModelCount.UPDATED_AT_ID
+    )
+    assert count_item.model_count == model_count_2
+
+    # 3 spec items and the model count item
     items = list(models.Spec.scan())
-    assert len(items) == 3
+    assert len(items) == 4
 
     # Call again with different name by same canonical name
     name_2 = "NAME 1"
@@ -237,3 +267,198 @@ def test_create_update_item_update(monkeypatch):
     assert different_item.model_count == model_count_2
     assert different_item.version == version_2
     assert int(different_item.updated_at) == time_2
+
+
+@pytest.mark.models
+def test_create_update_item_model_count_missing():
+    """
+    GIVEN database with a latest record for a spec but no model count for the customer
+    WHEN create_update_item is called on Spec with the sub and a different spec name
+    THEN the model count of the customer includes the model count of both specs.
+    """
+    sub = "sub 1"
+    initial_item = factory.SpecFactory(
+        sub=sub,
+        updated_at_id=f"{models.Spec.UPDATED_AT_LATEST}#spec 1",
+        model_count=12,
+    )
+    initial_item.save()
+    model_count = 21
+
+    models.Spec.create_update_item(
+        sub=sub, name="name 2", version="version 2", model_count=model_count
+    )
+
+    count_item = models.CustomerModelCount.get(
+        sub, models.CustomerModelCount.UPDATED_AT_ID
+    )
+    assert count_item.model_count == 12 + model_count
+
+
+@pytest.mark.models
+def test_create_update_item_model_count_sequence():
+    """
+    GIVEN database with a model count item for the customer
+    WHEN create_update_item is called on Spec with the sub
+    THEN the sequence of the model count item is incremented.
+    """
+    sub = "sub 1"
+    models.CustomerModelCount(
+        sub, models.CustomerModelCount.UPDATED_AT_ID, model_count=0, sequence=3
+    ).save()
+
+    models.Spec.create_update_item(
+        sub=sub, name="name 1", version="version 1", model_count=21
+    )
+
+    count_item = models.CustomerModelCount.get(
+        sub, models.CustomerModelCount.UPDATED_AT_ID
+    )
+    assert count_item.model_count == 21
+    assert count_item.sequence == 4
+
+
+@pytest.mark.models
+def test_create_update_item_conflict(monkeypatch):
+    """
+    GIVEN database where the latest record is always changed concurrently
+    WHEN create_update_item is called on Spec
+    THEN ConflictError is raised and neither the items nor the model count of the
+        customer are changed.
+    """
+    sub = "sub 1"
+    name = "name 1"
+    models.Spec.create_update_item(
+        sub=sub, name=name, version="version 1", model_count=11
+    )
+    mock_get_latest_item = mock.MagicMock()
+    mock_get_latest_item.return_value = (
+        factory.SpecFactory(sub=sub, model_count=1),
+        True,
+    )
+    monkeypatch.setattr(models.Spec, "_get_latest_item", mock_get_latest_item)
+
+    with pytest.raises(exceptions.ConflictError):
+        models.Spec.create_update_item(
+            sub=sub, name=name, version="version 2", model_count=21
+        )
+
+    assert models.Spec.count_customer_models(sub=sub) == 11
+    assert mock_get_latest_item.call_count == models.TRANSACTION_ATTEMPTS - 1
+    versions = models.Spec.list_versions(sub=sub, name=name)
+    assert [version["version"] for version in versions] == ["version 1"]
+    assert models.Spec.get_latest_version(sub=sub, name=name) == "version 1"
+
+
+@pytest.mark.models
+def test_create_update_item_newer_latest():
+    """
+    GIVEN database with a latest record that is newer than the current time
+    WHEN create_update_item is called on Spec with the same sub and spec name
+    THEN the version record is written but the latest record and the model count of
+        the customer are not changed.
+    """
+    sub = "sub 1"
+    name = "name 1"
+    factory.SpecFactory(
+        sub=sub,
+        id=name,
+        name=name,
+        version="version 1",
+        updated_at=str(int(time.time()) + 1000),
+        updated_at_id=f"{models.Spec.UPDATED_AT_LATEST}#{name}",
+        id_updated_at=f"{name}#{models.Spec.UPDATED_AT_LATEST}",
+        model_count=11,
+    ).save()
+
+    models.Spec.create_update_item(
+        sub=sub, name=name, version="version 2", model_count=21
+    )
+
+    assert models.Spec.get_latest_version(sub=sub, name=name) == "version 1"
+    assert models.Spec.count_customer_models(sub=sub) == 11
+    versions = models.Spec.list_versions(sub=sub, name=name)
+    assert [version["version"] for version in versions] == ["version 2"]
+
+
+@pytest.mark.models
+def test_create_update_item_error(monkeypatch):
+    """
+    GIVEN database where writing the transaction fails for a reason other than a
+        condition
+    WHEN create_update_item is called on Spec
+    THEN the error is raised without retrying.
+    """
+    sub = "sub 1"
+    name = "name 1"
+    models.Spec.create_update_item(
+        sub=sub, name=name, version="version 1", model_count=11
+    )
+    mock_get_latest_item = mock.MagicMock(wraps=models.Spec._get_latest_item)
+    monkeypatch.setattr(models.Spec, "_get_latest_item", mock_get_latest_item)
+    monkeypatch.setattr(
+        models.Spec,
+        "_write_items",
+        mock.MagicMock(side_effect=pynamodb_exceptions.TransactWriteError("failed")),
+    )
+
+    with pytest.raises(pynamodb_exceptions.TransactWriteError):
+        models.Spec.create_update_item(
+            sub=sub, name=name, version="version 2", model_count=21
+        )
+
+    assert mock_get_latest_item.call_count == 0
+
+
+@pytest.mark.parametrize(
+    "create_previous, previous_model_count, expected_read_count",
+    [
+        pytest.param(False, None, 0, id="new spec"),
+        pytest.param(True, None, 1, id="existing spec not expected"),
+        pytest.param(True, 11, 0, id="existing spec expected"),
+        pytest.param(True, 12, 1, id="existing spec stale"),
+    ],
+)
+@pytest.mark.models
+def test_create_update_item_previous_spec_info(
+    monkeypatch, create_previous, previous_model_count, expected_read_count
+):
+    """
+    GIVEN database with or without a spec and the expected information about the
+        latest version of the spec
+    WHEN create_update_item is called on Spec with the expected information
+    THEN the latest item is only read if it is not as expected and the latest item
+        and the model count of the customer are updated.
+    """
+    sub = "sub 1"
+    name = "name 1"
+    models.CustomerModelCount(
+        sub, models.CustomerModelCount.UPDATED_AT_ID, model_count=0
+    ).save()
+    previous_spec_info = None
+    if create_previous:
+        models.Spec.create_update_item(
+            sub=sub, name=name, version="version 1", model_count=11
+        )
+    if previous_model_count is not None:
+        previous_spec_info = {
+            **models.Spec.get_item(sub=sub, name=name),
+            "model_count": previous_model_count,
+        }
+    mock_get_latest_item = mock.MagicMock(wraps=models.Spec._get_latest_item)
+    monkeypatch.setattr(models.Spec, "_get_latest_item", mock_get_latest_item)
+
+    models.Spec.create_update_item(
+        sub=sub,
+        name=name,
+        version="version 2",
+        model_count=21,
+        previous_spec_info=previous_spec_info,
+    )
+
+    assert mock_get_latest_item.call_count == expected_read_count
+    assert models.Spec.get_latest_version(sub=sub, name=name) == "version 2"
+    count_item = models.CustomerModelCount.get(
+        sub, models.CustomerModelCount.UPDATED_AT_ID
+    )
+    assert count_item.model_count == 21
@@ -61,3 +61,30 @@ def test_delete_all(items, sub, expected_count):
     models.Spec.delete_all(sub=sub)
 
     assert len(list(models.Spec.scan())) == expected_count
+
+
+@pytest.mark.parametrize("max_workers", [1, models.DELETE_MAX_WORKERS])
+@pytest.mark.models
+def test_delete_all_many(monkeypatch, max_workers):
+    """
+    GIVEN database with more items for a sub than fit into multiple batches and the
+        maximum number of workers
+    WHEN delete_all is called with the sub and progress
+    THEN all items are deleted, the number deleted is returned and progress is
+        reported after each batch.
+    """
+    monkeypatch.setattr(models, "DELETE_MAX_WORKERS", max_workers)
+    sub = "sub 1"
+    item_count = 3 * models.BATCH_WRITE_SIZE + 1
+    for _ in range(item_count):
+        factory.SpecFactory(sub=sub).save()
+    factory.SpecFactory(sub="sub 2").save()
+    progress_calls = []
+
+    returned_count = models.Spec.delete_all(sub=sub, progress=progress_calls.append)
+
+    assert returned_count == item_count
+    assert len(list(models.Spec.scan())) == 1
+    assert len(progress_calls) == 4
+    assert sorted(progress_calls) == progress_calls
+    assert progress_calls[-1] == item_count
@@ -1,7 +1,10 @@
 """Tests for the models."""
 
+from unittest import mock
+
 import pytest
-from open_alchemy.package_database import factory, models
+from open_alchemy.package_database import exceptions, factory, models
+from pynamodb import exceptions as pynamodb_exceptions
 
 DELETE_ITEM_TESTS = [
     pytest.param([], "sub 1", "name 1", 0, id="empty"),
@@ -158,3 +161,101 @@ def test_delete_item(items, sub, name, expected_item_count):
     models.Spec.delete_item(sub=sub, name=name)
 
     assert len(list(models.Spec.scan())) == expected_item_count
+
+
+@pytest.mark.models
+def test_delete_item_model_count():
+    """
+    GIVEN database with multiple specs for a customer
+    WHEN delete_item is called on Spec with the sub and spec name of one spec
+    THEN the model count of the customer no longer includes the deleted spec.
+    """
+    sub = "sub 1"
+    models.Spec.create_update_item(
+        sub=sub, name="name 1", version="version 1", model_count=11
+    )
+    models.Spec.create_update_item(
+        sub=sub, name="name 2", version="version 2", model_count=21
+    )
+
+    models.Spec.delete_item(sub=sub, name="name 1")
+
+    assert models.Spec.count_customer_models(sub=sub) == 21
+
+
+@pytest.mark.models
+def test_delete_item_model_count_missing():
+    """
+    GIVEN database with multiple latest items but no model count for a customer
+    WHEN delete_item is called on Spec with the sub and spec name of one spec
+    THEN the model count of the customer no longer includes the deleted spec.
+    """
+    sub = "sub 1"
+    for number, model_count in ((1, 12), (2, 22)):
+        factory.SpecFactory(
+            sub=sub,
+            id=f"name {number}",
+            updated_at_id=f"{models.Spec.UPDATED_AT_LATEST}#name {number}",
+            id_updated_at=f"name {number}#{models.Spec.UPDATED_AT_LATEST}",
+            model_count=model_count,
+        ).save()
+
+    models.Spec.delete_item(sub=sub, name="name 1")
+
+    count_item = models.CustomerModelCount.get(
+        sub, models.CustomerModelCount.UPDATED_AT_ID
+    )
+    assert count_item.model_count == 22
+
+
+@pytest.mark.models
+def test_delete_item_conflict(monkeypatch):
+    """
+    GIVEN database where the latest record is always changed concurrently
+    WHEN delete_item is called on Spec
+    THEN ConflictError is raised and the spec is not deleted.
+    """
+    sub = "sub 1"
+    name = "name 1"
+    models.Spec.create_update_item(
+        sub=sub, name=name, version="version 1", model_count=11
+    )
+    mock_get_latest_item = mock.MagicMock()
+    mock_get_latest_item.return_value = (
+        factory.SpecFactory(sub=sub, model_count=1),
+        True,
+    )
+    monkeypatch.setattr(models.Spec, "_get_latest_item", mock_get_latest_item)
+
+    with pytest.raises(exceptions.ConflictError):
+        models.Spec.delete_item(sub=sub, name=name)
+
+    assert models.Spec.count_customer_models(sub=sub) == 11
+    assert len(models.Spec.list_versions(sub=sub, name=name)) == 1
+
+
+@pytest.mark.models
+def test_delete_item_error(monkeypatch):
+    """
+    GIVEN database where writing the transaction fails for a reason other than a
+        condition
+    WHEN delete_item is called on Spec
+    THEN the error is raised without retrying.
+    """
+    sub = "sub 1"
+    name = "name 1"
+    models.Spec.create_update_item(
+        sub=sub, name=name, version="version 1", model_count=11
+    )
+    mock_get_latest_item = mock.MagicMock(wraps=models.Spec._get_latest_item)
+    monkeypatch.setattr(models.Spec, "_get_latest_item", mock_get_latest_item)
+    monkeypatch.setattr(
+        models.Spec,
+        "_write_items",
+        mock.MagicMock(side_effect=pynamodb_exceptions.TransactWriteError("failed")),
+    )
+
+    with pytest.raises(pynamodb_exceptions.TransactWriteError):
+        models.Spec.delete_item(sub=sub, name=name)
+
+    assert mock_get_latest_item.call_count == 1
@@ -5,28 +5,32 @@ from open_alchemy.package_database import factory, models
 
 
 @pytest.mark.parametrize(
-    "title, description, expected_spec_info",
+    "title, description, content_hash, expected_spec_info",
     [
-        pytest.param(None, None, {}, id="title description not defined"),
+        pytest.param(None, None, None, {}, id="title description not defined"),
         pytest.param(
             "title 1",
             "description 1",
+            "content hash 1",
             {
                 "title": "title 1",
                 "description": "description 1",
+                "content_hash": "content hash 1",
             },
             id="title description defined",
         ),
     ],
 )
 @pytest.mark.models
-def test_item_to_info(title, description, expected_spec_info):
+def test_item_to_info(title, description, content_hash, expected_spec_info):
     """
-    GIVEN title and description
-    WHEN Spec is constructed with the title and description
+    GIVEN title, description and content hash
+    WHEN Spec is constructed with the title, description and content hash
     THEN the expected spec info is returned.
     """
-    item = factory.SpecFactory(title=title, description=description)
+    item = factory.SpecFactory(
+        title=title, description=description, content_hash=content_hash
+    )
     expected_spec_info["name"] = item.name
     expected_spec_info["id"] = item.id
     expected_spec_info["version"] = item.version
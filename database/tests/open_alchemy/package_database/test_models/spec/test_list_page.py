@@ -0,0 +1,91 @@
+"""Tests for the models."""
+
+import pytest
+from open_alchemy.package_database import exceptions, factory, models
+
+
+def _save_latest(*, sub, names):
+    """Save latest items for the names and return the items."""
+    items = [
+        factory.SpecFactory(
+            sub=sub,
+            name=name,
+            id=name,
+            updated_at_id=f"{models.Spec.UPDATED_AT_LATEST}#{name}",
+        )
+        for name in names
+    ]
+    for item in items:
+        item.save()
+    return items
+
+
+@pytest.mark.models
+def test_list_page_empty():
+    """
+    GIVEN empty database
+    WHEN list_page is called on Spec
+    THEN no items and no cursor is returned.
+    """
+    returned_page = models.Spec.list_page(sub="sub 1", limit=2)
+
+    assert returned_page.items == []
+    assert returned_page.cursor is None
+
+
+@pytest.mark.models
+def test_list_page_all_pages():
+    """
+    GIVEN latest items for multiple subs and a version item
+    WHEN list_page is called on Spec until no cursor is returned
+    THEN all the latest items of the sub are returned in order across the pages.
+    """
+    sub = "sub 1"
+    items = _save_latest(sub=sub, names=["name 1", "name 2", "name 3"])
+    _save_latest(sub="sub 2", names=["name 4"])
+    factory.SpecFactory(sub=sub, updated_at_id="11#name 1").save()
+
+    first_page = models.Spec.list_page(sub=sub, limit=2)
+
+    assert first_page.items == list(map(models.Spec.item_to_info, items[:2]))
+    assert first_page.cursor is not None
+
+    second_page = models.Spec.list_page(sub=sub, limit=2, cursor=first_page.cursor)
+
+    assert second_page.items == list(map(models.Spec.item_to_info, items[2:]))
+    assert second_page.cursor is None
+
+
+@pytest.mark.models
+def test_list_page_cursor_other_sub():
+    """
+    GIVEN latest items for multiple subs and a cursor for the first sub
+    WHEN list_page is called on Spec with the second sub and the cursor
+    THEN only items of the second sub are returned.
+    """
+    _save_latest(sub="sub 1", names=["name 1", "name 2"])
+    items = _save_latest(sub="sub 2", names=["name 2", "name 3"])
+    cursor = models.Spec.list_page(sub="sub 1", limit=1).cursor
+
+    returned_page = models.Spec.list_page(sub="sub 2", limit=2, cursor=cursor)
+
+    assert returned_page.items == list(map(models.Spec.item_to_info, items))
+
+
+@pytest.mark.parametrize(
+    "cursor",
+    [
+        pytest.param("a", id="not base64"),
+        pytest.param(models.encode_cursor("11#name 1"), id="not latest"),
+        pytest.param("_w==", id="not utf-8"),
+    ],
+)
+@pytest.mark.models
+def test_list_page_invalid_cursor(cursor):
+    """
+    GIVEN invalid cursor
+    WHEN list_page is called on Spec with the cursor
+    THEN InvalidCursorError is raised.
+    """
+    with pytest.raises(exceptions.InvalidCursorError):
+        models.Spec.list_page(sub="sub 1", limit=1, cursor=cursor)
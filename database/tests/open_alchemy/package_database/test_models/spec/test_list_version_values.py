@@ -0,0 +1,34 @@
+"""Tests for the models."""
+
+import pytest
+from open_alchemy.package_database import factory, models
+
+
+@pytest.mark.models
+def test_list_version_values():
+    """
+    GIVEN versions of multiple specs including the latest items
+    WHEN list_version_values is called on Spec
+    THEN the versions of the spec are returned excluding the latest item.
+    """
+    sub = "sub 1"
+    for sub_, id_, updated_at, version in [
+        (sub, "name1", "11", "1"),
+        (sub, "name1", "12", "2"),
+        (sub, "name1", models.Spec.UPDATED_AT_LATEST, "2"),
+        (sub, "name2", "13", "3"),
+        ("sub 2", "name1", "14", "4"),
+    ]:
+        index_values = models.Spec.calc_index_values(updated_at=updated_at, id_=id_)
+        factory.SpecFactory(
+            sub=sub_,
+            id=id_,
+            updated_at=updated_at,
+            version=version,
+            updated_at_id=index_values.updated_at_id,
+            id_updated_at=index_values.id_updated_at,
+        ).save()
+
+    returned_versions = models.Spec.list_version_values(sub=sub, name="NAME1")
+
+    assert returned_versions == ["1", "2"]
@@ -0,0 +1,86 @@
+"""Tests for the models."""
+
+import pytest
+from open_alchemy.package_database import exceptions, factory, models
+
+
+def _save_versions(*, sub, id_, updated_ats):
+    """Save version items and the latest item for the spec and return the items."""
+    items = []
+    for updated_at in updated_ats + [models.Spec.UPDATED_AT_LATEST]:
+        index_values = models.Spec.calc_index_values(updated_at=updated_at, id_=id_)
+        item = factory.SpecFactory(
+            sub=sub,
+            id=id_,
+            name=id_,
+            updated_at=updated_at,
+            updated_at_id=index_values.updated_at_id,
+            id_updated_at=index_values.id_updated_at,
+        )
+        item.save()
+        items.append(item)
+    return items[:-1]
+
+
+@pytest.mark.models
+def test_list_versions_page_empty():
+    """
+    GIVEN empty database
+    WHEN list_versions_page is called on Spec
+    THEN no items and no cursor is returned.
+    """
+    returned_page = models.Spec.list_versions_page(sub="sub 1", name="name1", limit=2)
+
+    assert returned_page.items == []
+    assert returned_page.cursor is None
+
+
+@pytest.mark.models
+def test_list_versions_page_all_pages():
+    """
+    GIVEN versions of multiple specs including the latest items
+    WHEN list_versions_page is called on Spec until no cursor is returned
+    THEN the versions of the spec are returned newest first across the pages
+        excluding the latest item.
+    """
+    sub = "sub 1"
+    items = _save_versions(sub=sub, id_="name1", updated_ats=["11", "12", "13"])
+    _save_versions(sub=sub, id_="name2", updated_ats=["14"])
+    _save_versions(sub="sub 2", id_="name1", updated_ats=["15"])
+
+    first_page = models.Spec.list_versions_page(sub=sub, name="NAME1", limit=2)
+
+    assert first_page.items == list(map(models.Spec.item_to_info, items[:0:-1]))
+    assert first_page.cursor is not None
+
+    second_page = models.Spec.list_versions_page(
+        sub=sub, name="name1", limit=2, cursor=first_page.cursor
+    )
+
+    assert second_page.items == [models.Spec.item_to_info(items[0])]
+    assert second_page.cursor is None
+
+
+@pytest.mark.parametrize(
+    "cursor",
+    [
+        pytest.param("a", id="not base64"),
+        pytest.param(models.encode_cursor("name2#00000000000000000011"), id="other"),
+        pytest.param(
+            models.encode_cursor(f"name1#{models.Spec.UPDATED_AT_LATEST}"),
+            id="latest",
+        ),
+        pytest.param(models.encode_cursor("name1#11"), id="not padded"),
+    ],
+)
+@pytest.mark.models
+def test_list_versions_page_invalid_cursor(cursor):
+    """
+    GIVEN invalid cursor
+    WHEN list_versions_page is called on Spec with the cursor
+    THEN InvalidCursorError is raised.
+    """
+    with pytest.raises(exceptions.InvalidCursorError):
+        models.Spec.list_versions_page(
+            sub="sub 1", name="name1", limit=1, cursor=cursor
+        )
@@ -0,0 +1,27 @@
+"""Tests for the reconcile job."""
+
+import pytest
+from open_alchemy.package_database import factory, models, reconcile
+
+
+@pytest.mark.models
+def test_main(_clean_specs_table, capsys):
+    """
+    GIVEN database with a latest item and a stale model count item
+    WHEN main is called
+    THEN the model count is rebuilt and the number of customers is printed.
+    """
+    sub = "sub 1"
+    factory.SpecFactory(
+        sub=sub,
+        updated_at_id=f"{models.Spec.UPDATED_AT_LATEST}#spec 1",
+        model_count=12,
+    ).save()
+    models.CustomerModelCount(
+        sub, models.CustomerModelCount.UPDATED_AT_ID, model_count=100
+    ).save()
+
+    reconcile.main()
+
+    assert models.Spec.count_customer_models(sub=sub) == 12
+    assert capsys.readouterr().out == "rebuilt the model count of 1 customers\n"
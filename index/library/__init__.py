@@ -1,10 +1,28 @@
 """Library for the index application."""
 
 import base64
+import hashlib
+import hmac
+import secrets
 
 from open_alchemy import package_database, package_security
 
-from . import exceptions, types
+from . import cache, exceptions, types
+
+# Credentials that are deleted keep working for up to this many seconds in a warm
+# function container because neither cache below queries the database on a hit
+CACHE_TTL = 5
+# Users are cached by public key so that the many requests pip makes during an
+# install do not each query the database, the secret key is still checked
+USER_CACHE: cache.TTLCache[str, types.CredentialsAuthInfo] = cache.TTLCache(
+    maxsize=1024, ttl=CACHE_TTL
+)
+# Successful secret key checks are cached so that repeated requests skip the slow
+# secret key hash calculation, keyed by a digest that includes the stored hash
+VERIFIED_CACHE: cache.TTLCache[bytes, bool] = cache.TTLCache(
+    maxsize=1024, ttl=CACHE_TTL
+)
+_VERIFIED_CACHE_KEY = secrets.token_bytes(32)
 
 
 def parse_authorization_header(
@@ -57,6 +75,9 @@ def get_user(*, authorization: types.TAuthorization) -> types.CredentialsAuthInf
 
     Raises UnauthorizedError if the user does not exist.
 
+    Users that exist are cached for a short time, users that do not exist are not
+    cached.
+
     Args:
         authorization: The authorization for the request.
 
@@ -64,14 +85,50 @@ def get_user(*, authorization: types.TAuthorization) -> types.CredentialsAuthInf
         Information about the public key such as the user tied to it.
 
     """
+    auth_info = USER_CACHE.get(authorization.public_key)
+    if auth_info is not None:
+        return auth_info
+
     auth_info = package_database.get().get_user(public_key=authorization.public_key)
     if auth_info is None:
         raise exceptions.UnauthorizedError(
             f"no user with the public key, {authorization.public_key=}"
         )
+    USER_CACHE.set(authorization.public_key, auth_info)
     return auth_info
 
 
+def calculate_verified_cache_key(
+    *,
+    authorization: types.TAuthorization,
+    auth_info: types.CredentialsAuthInfo,
+) -> bytes:
+    """
+    Calculate the key for the cache of successful secret key checks.
+
+    Uses a HMAC with a random key generated when the function container starts so
+    that the secret key is not stored in the cache. The stored secret key hash is
+    included so that entries no longer match if the credentials change.
+
+    Args:
+        authorization: The authorization for the request.
+        auth_info: Authorization information about the user.
+
+    Returns:
+        The key for the cache.
+
+    """
+    mac = hmac.new(_VERIFIED_CACHE_KEY, digestmod=hashlib.sha256)
+    for value in (
+        authorization.public_key.encode(),
+        authorization.secret_key.encode(),
+        auth_info.secret_key_hash,
+    ):
+        mac.update(len(value).to_bytes(8, "big"))
+        mac.update(value)
+    return mac.digest()
+
+
 def authorize_user(
     *,
     authorization: types.TAuthorization,
@@ -82,11 +139,19 @@ def authorize_user(
 
     Raises UnauthorizedError is the secret key is not valid.
 
+    Successful checks are cached for a short time.
+
     Args:
         authorization: The authorization for the request.
         auth_info: Authorization information about the user.
 
     """
+    verified_cache_key = calculate_verified_cache_key(
+        authorization=authorization, auth_info=auth_info
+    )
+    if VERIFIED_CACHE.get(verified_cache_key) is not None:
+        return
+
     secret_key_hash = package_security.calculate_secret_key_hash(
         secret_key=authorization.secret_key, salt=auth_info.salt
     )
@@ -96,6 +161,7 @@ def authorize_user(
         raise exceptions.UnauthorizedError(
             "the hash of the secret key from the request does not match the stored hash"
         )
+    VERIFIED_CACHE.set(verified_cache_key, True)
 
 
 def calculate_request_type(*, uri: types.TUri) -> types.TRequestType:
@@ -144,7 +210,7 @@ def create_list_response_value(
     spec_id = uri[1:-1]
 
     try:
-        version_infos = package_database.get().list_spec_versions(
+        versions = package_database.get().list_spec_version_values(
             sub=auth_info.sub, name=spec_id
         )
     except package_database.exceptions.NotFoundError as exc:
@@ -160,14 +226,14 @@ def create_list_response_value(
 
     install_links = list(
         map(
-            lambda version_info: (
+            lambda version: (
                 f'<a href="https://'
                 f"{authorization.public_key}:{authorization.secret_key}"
                 f"@{host}/{spec_id}/"
-                f'{package_name(version_info["version"])}">'
-                f'{package_name(version_info["version"])}</a><br>'
+                f'{package_name(version)}">'
+                f"{package_name(version)}</a><br>"
             ),
-            version_infos,
+            versions,
         )
     )
     joined_install_links = "\n".join(install_links)
@@ -1,5 +1,6 @@
 """Shared fixtures."""
 
+import library
 import pytest
 
 
@@ -12,3 +13,15 @@ def use_service_secret(_service_secret):
 def override_stage(monkeypatch):
     """Overrides the STAGE environment variable."""
     monkeypatch.setenv("STAGE", "TEST")
+
+
+@pytest.fixture(autouse=True)
+def clear_caches():
+    """Clears the user and verified caches before and after each test."""
+    library.USER_CACHE.clear()
+    library.VERIFIED_CACHE.clear()
+
+    yield
+
+    library.USER_CACHE.clear()
+    library.VERIFIED_CACHE.clear()
@@ -0,0 +1,140 @@
+"""Tests for the cache."""
+
+import time
+from unittest import mock
+
+import pytest
+from library import cache
+
+
+def test_get_miss():
+    """
+    GIVEN empty cache
+    WHEN get is called
+    THEN None is returned and a miss is counted.
+    """
+    cache_instance = cache.TTLCache(maxsize=2, ttl=10)
+
+    assert cache_instance.get("key 1") is None
+
+    assert cache_instance.hits == 0
+    assert cache_instance.misses == 1
+
+
+def test_set_get():
+    """
+    GIVEN empty cache
+    WHEN set is called and then get is called with the same key
+    THEN the value is returned and a hit is counted.
+    """
+    cache_instance = cache.TTLCache(maxsize=2, ttl=10)
+
+    cache_instance.set("key 1", "value 1")
+
+    assert cache_instance.get("key 1") == "value 1"
+    assert cache_instance.hits == 1
+    assert cache_instance.misses == 0
+    assert len(cache_instance) == 1
+
+
+def test_get_expired(monkeypatch):
+    """
+    GIVEN cache with a value
+    WHEN get is called after the ttl has passed
+    THEN None is returned, a miss is counted and the entry is removed.
+    """
+    mock_monotonic = mock.MagicMock(return_value=100.0)
+    monkeypatch.setattr(time, "monotonic", mock_monotonic)
+    cache_instance = cache.TTLCache(maxsize=2, ttl=10)
+    cache_instance.set("key 1", "value 1")
+
+    mock_monotonic.return_value = 109.0
+    assert cache_instance.get("key 1") == "value 1"
+
+    mock_monotonic.return_value = 110.0
+    assert cache_instance.get("key 1") is None
+    assert cache_instance.hits == 1
+    assert cache_instance.misses == 1
+    assert len(cache_instance) == 0
+
+
+def test_set_evict():
+    """
+    GIVEN full cache where the first key was used most recently
+    WHEN set is called with a new key
+    THEN the least recently used key is evicted.
+    """
+    cache_instance = cache.TTLCache(maxsize=2, ttl=10)
+    cache_instance.set("key 1", "value 1")
+    cache_instance.set("key 2", "value 2")
+    cache_instance.get("key 1")
+
+    cache_instance.set("key 3", "value 3")
+
+    assert len(cache_instance) == 2
+    assert cache_instance.evictions == 1
+    assert cache_instance.get("key 2") is None
+    assert cache_instance.get("key 1") == "value 1"
+    assert cache_instance.get("key 3") == "value 3"
+
+
+def test_set_existing():
+    """
+    GIVEN full cache
+    WHEN set is called with an existing key
+    THEN the value is replaced and nothing is evicted.
+    """
+    cache_instance = cache.TTLCache(maxsize=2, ttl=10)
+    cache_instance.set("key 1", "value 1")
+    cache_instance.set("key 2", "value 2")
+
+    cache_instance.set("key 1", "value 3")
+
+    assert cache_instance.evictions == 0
+    assert cache_instance.get("key 1") == "value 3"
+    assert cache_instance.get("key 2") == "value 2"
+
+
+def test_delete():
+    """
+    GIVEN cache with a value
+    WHEN delete is called with the key and a key that does not exist
+    THEN the value is removed.
+    """
+    cache_instance = cache.TTLCache(maxsize=2, ttl=10)
+    cache_instance.set("key 1", "value 1")
+
+    cache_instance.delete("key 1")
+    cache_instance.delete("key 2")
+
+    assert cache_instance.get("key 1") is None
+
+
+def test_clear():
+    """
+    GIVEN cache with values and counters
+    WHEN clear is called
+    THEN the values are removed and the counters are reset.
+    """
+    cache_instance = cache.TTLCache(maxsize=1, ttl=10)
+    cache_instance.set("key 1", "value 1")
+    cache_instance.set("key 2", "value 2")
+    cache_instance.get("key 2")
+    cache_instance.get("key 1")
+
+    cache_instance.clear()
+
+    assert len(cache_instance) == 0
+    assert cache_instance.hits == 0
+    assert cache_instance.misses == 0
+    assert cache_instance.evictions == 0
+
+
+def test_init_invalid_maxsize():
+    """
+    GIVEN maxsize of zero
+    WHEN the cache is constructed
+    THEN AssertionError is raised.
+    """
+    with pytest.raises(AssertionError):
+        cache.TTLCache(maxsize=0, ttl=10)
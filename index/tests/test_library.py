@@ -93,6 +93,50 @@ def test_get_user(_clean_credentials_table):
     assert returned_user.secret_key_hash == credentials.secret_key_hash
 
 
+def test_get_user_cache(_clean_credentials_table, monkeypatch):
+    """
+    GIVEN database with credentials
+    WHEN get_user is called multiple times
+    THEN the database is only queried once and the user is returned each time.
+    """
+    credentials = factory.CredentialsFactory()
+    credentials.save()
+    authorization = types.TAuthorization(
+        public_key=credentials.public_key, secret_key="secret key 1"
+    )
+    mock_get_user = mock.MagicMock(wraps=package_database.get().get_user)
+    monkeypatch.setattr(package_database.get(), "get_user", mock_get_user)
+
+    returned_user_1 = library.get_user(authorization=authorization)
+    returned_user_2 = library.get_user(authorization=authorization)
+
+    assert returned_user_1 == returned_user_2
+    assert returned_user_2.sub == credentials.sub
+    mock_get_user.assert_called_once_with(public_key=credentials.public_key)
+    assert library.USER_CACHE.hits == 1
+    assert library.USER_CACHE.misses == 1
+
+
+def test_get_user_error_not_cached(_clean_credentials_table):
+    """
+    GIVEN empty database
+    WHEN get_user is called, credentials are created and get_user is called again
+    THEN UnauthorizedError is raised and then the user is returned.
+    """
+    credentials = factory.CredentialsFactory()
+    authorization = types.TAuthorization(
+        public_key=credentials.public_key, secret_key="secret key 1"
+    )
+
+    with pytest.raises(exceptions.UnauthorizedError):
+        library.get_user(authorization=authorization)
+    credentials.save()
+
+    returned_user = library.get_user(authorization=authorization)
+
+    assert returned_user.sub == credentials.sub
+
+
 def test_authorize_user_error():
     """
     GIVEN invalid authorization
@@ -131,6 +175,97 @@ def test_authorize_user():
     library.authorize_user(authorization=authorization, auth_info=auth_info)
 
 
+def test_authorize_user_cache(monkeypatch):
+    """
+    GIVEN valid authorization
+    WHEN authorize_user is called multiple times
+    THEN the secret key hash is only calculated once.
+    """
+    secret_key = "secret key 1"
+    salt = b"salt 1"
+    secret_key_hash = package_security.calculate_secret_key_hash(
+        secret_key=secret_key, salt=salt
+    )
+    authorization = types.TAuthorization(
+        public_key="public key 1", secret_key=secret_key
+    )
+    auth_info = types.CredentialsAuthInfo(
+        sub="sub 1", secret_key_hash=secret_key_hash, salt=salt
+    )
+    mock_calculate_secret_key_hash = mock.MagicMock(
+        wraps=package_security.calculate_secret_key_hash
+    )
+    monkeypatch.setattr(
+        package_security, "calculate_secret_key_hash", mock_calculate_secret_key_hash
+    )
+
+    library.authorize_user(authorization=authorization, auth_info=auth_info)
+    library.authorize_user(authorization=authorization, auth_info=auth_info)
+
+    mock_calculate_secret_key_hash.assert_called_once()
+    assert library.VERIFIED_CACHE.hits == 1
+
+
+def test_authorize_user_cache_different_secret_key():
+    """
+    GIVEN valid authorization that has been checked
+    WHEN authorize_user is called with a different secret key
+    THEN UnauthorizedError is raised.
+    """
+    secret_key = "secret key 1"
+    salt = b"salt 1"
+    secret_key_hash = package_security.calculate_secret_key_hash(
+        secret_key=secret_key, salt=salt
+    )
+    auth_info = types.CredentialsAuthInfo(
+        sub="sub 1", secret_key_hash=secret_key_hash, salt=salt
+    )
+    library.authorize_user(
+        authorization=types.TAuthorization(
+            public_key="public key 1", secret_key=secret_key
+        ),
+        auth_info=auth_info,
+    )
+
+    with pytest.raises(exceptions.UnauthorizedError):
+        library.authorize_user(
+            authorization=types.TAuthorization(
+                public_key="public key 1", secret_key="secret key 2"
+            ),
+            auth_info=auth_info,
+        )
+
+
+def test_authorize_user_cache_different_secret_key_hash():
+    """
+    GIVEN valid authorization that has been checked
+    WHEN authorize_user is called with different stored credentials
+    THEN UnauthorizedError is raised.
+    """
+    secret_key = "secret key 1"
+    salt = b"salt 1"
+    secret_key_hash = package_security.calculate_secret_key_hash(
+        secret_key=secret_key, salt=salt
+    )
+    authorization = types.TAuthorization(
+        public_key="public key 1", secret_key=secret_key
+    )
+    library.authorize_user(
+        authorization=authorization,
+        auth_info=types.CredentialsAuthInfo(
+            sub="sub 1", secret_key_hash=secret_key_hash, salt=salt
+        ),
+    )
+
+    with pytest.raises(exceptions.UnauthorizedError):
+        library.authorize_user(
+            authorization=authorization,
+            auth_info=types.CredentialsAuthInfo(
+                sub="sub 1", secret_key_hash=b"secret key hash 2", salt=salt
+            ),
+        )
+
+
 CALCULATE_REQUEST_TYPE_ERROR_TESTS = [
     pytest.param("", id="no /"),
     pytest.param("/", id="single /"),
@@ -367,3 +502,32 @@ def test_process(_clean_credentials_table):
     authorization_value = f"Basic {token}"
 
     library.process(uri=uri, authorization_value=authorization_value)
+
+
+def test_process_deleted_credentials(_clean_credentials_table, monkeypatch):
+    """
+    GIVEN valid authorization value that has been processed
+    WHEN the credentials are deleted and process is called after the cache time to
+        live
+    THEN UnauthorizedError is raised.
+    """
+    mock_monotonic = mock.MagicMock(return_value=100.0)
+    monkeypatch.setattr(time, "monotonic", mock_monotonic)
+    secret_key = "secret key 1"
+    salt = b"salt 1"
+    secret_key_hash = package_security.calculate_secret_key_hash(
+        secret_key=secret_key, salt=salt
+    )
+    spec_id = "spec 1"
+    uri = f"/{spec_id}/{spec_id}-version 1.tar.gz"
+    credentials = factory.CredentialsFactory(secret_key_hash=secret_key_hash, salt=salt)
+    credentials.save()
+    token = base64.b64encode(f"{credentials.public_key}:{secret_key}".encode()).decode()
+    authorization_value = f"Basic {token}"
+    library.process(uri=uri, authorization_value=authorization_value)
+
+    package_database.get().delete_credentials(sub=credentials.sub, id_=credentials.id)
+    mock_monotonic.return_value = 100.0 + library.CACHE_TTL
+
+    with pytest.raises(exceptions.UnauthorizedError):
+        library.process(uri=uri, authorization_value=authorization_value)
@@ -37,6 +37,7 @@ export class ApiStack extends cdk.Stack {
     const specTable = dynamodb.Table.fromTableAttributes(this, 'SpecTable', {
       tableName: CONFIG.database.spec.tableName,
       localIndexes: [CONFIG.database.spec.localSecondaryIndexName],
+      globalIndexes: [CONFIG.database.spec.versionGlobalSecondaryIndexName],
     });
     const credentialsTable = dynamodb.Table.fromTableAttributes(
       this,
@@ -74,6 +75,7 @@ export class ApiStack extends cdk.Stack {
         PACKAGE_STORAGE_BUCKET_NAME: CONFIG.storage.bucketName,
         DEFAULT_CREDENTIALS_ID: CONFIG.api.defaultCredentialsId,
         FREE_TIER_MODEL_COUNT: '10',
+        SPEC_MAX_SIZE: '1048576',
       },
       logRetention: logs.RetentionDays.ONE_WEEK,
       timeout: cdk.Duration.seconds(10),
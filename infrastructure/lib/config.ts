@@ -6,7 +6,7 @@ export const CONFIG = {
     recordName: 'package.api',
     throttlingBurstLimit: 200,
     throttlingRateLimit: 100,
-    additionalAllowHeaders: ['x-language'],
+    additionalAllowHeaders: ['x-language', 'if-none-match'],
     defaultCredentialsId: 'default',
   },
   web: {
@@ -22,6 +22,7 @@ export const CONFIG = {
     spec: {
       tableName: 'package.specs',
       localSecondaryIndexName: 'idUpdatedAt',
+      versionGlobalSecondaryIndexName: 'idUpdatedAtVersion',
     },
     credentials: {
       tableName: 'package.credentials',
@@ -28,6 +28,16 @@ export class DatabaseStack extends cdk.Stack {
       },
       projectionType: dynamodb.ProjectionType.ALL,
     });
+    specsTable.addGlobalSecondaryIndex({
+      indexName: CONFIG.database.spec.versionGlobalSecondaryIndexName,
+      partitionKey: { ...sub },
+      sortKey: {
+        name: 'id_updated_at',
+        type: dynamodb.AttributeType.STRING,
+      },
+      projectionType: dynamodb.ProjectionType.INCLUDE,
+      nonKeyAttributes: ['version'],
+    });
 
     // Database for the credentials
     const credentialsTable = new dynamodb.Table(this, 'CredentialsTable', {
@@ -48,6 +48,7 @@ export class IndexStack extends cdk.Stack {
     const specTable = dynamodb.Table.fromTableAttributes(this, 'SpecTable', {
       tableName: CONFIG.database.spec.tableName,
       localIndexes: [CONFIG.database.spec.localSecondaryIndexName],
+      globalIndexes: [CONFIG.database.spec.versionGlobalSecondaryIndexName],
     });
     const credentialsTable = dynamodb.Table.fromTableAttributes(
       this,
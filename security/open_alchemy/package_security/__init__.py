@@ -5,7 +5,7 @@ import hashlib
 import hmac
 import secrets
 
-from . import config, types
+from . import clients, config, types
 
 
 def _generate_salt() -> types.TSalt:
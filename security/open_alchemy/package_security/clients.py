@@ -0,0 +1,46 @@
+"""AWS clients that are shared by everything running in a Lambda container."""
+
+import threading
+import typing
+
+import boto3
+from botocore import config as botocore_config
+
+# The defaults wait up to 60 seconds to connect and read, which is longer than the
+# functions run, and keep 10 connections which limits concurrent requests
+CONFIG = botocore_config.Config(
+    connect_timeout=2,
+    read_timeout=5,
+    retries={"mode": "standard", "max_attempts": 3},
+    max_pool_connections=32,
+)
+
+_CLIENTS: typing.Dict[str, typing.Any] = {}
+# Creating clients is not thread safe
+_LOCK = threading.Lock()
+
+
+def get(service_name: str) -> typing.Any:
+    """
+    Retrieve the client for an AWS service.
+
+    The client is created the first time it is retrieved and then re-used so that its
+    connections are kept across invocations of a warm container.
+
+    Args:
+        service_name: The name of the service, for example, s3.
+
+    Returns:
+        The client for the service.
+
+    """
+    with _LOCK:
+        if service_name not in _CLIENTS:
+            _CLIENTS[service_name] = boto3.client(service_name, config=CONFIG)
+        return _CLIENTS[service_name]
+
+
+def clear() -> None:
+    """Remove all clients so that they are created again."""
+    with _LOCK:
+        _CLIENTS.clear()
@@ -3,9 +3,7 @@
 import dataclasses
 import typing
 
-import boto3
-
-_SECRETS_MANAGER_CLIENT = boto3.client("secretsmanager")
+from . import clients
 
 
 @dataclasses.dataclass
@@ -26,7 +24,7 @@ class TConfig:
         """Retrieve the service secret if not defined else return it."""
         if self._service_secret is None:
             # Retrieve from AWS
-            response = _SECRETS_MANAGER_CLIENT.get_secret_value(
+            response = clients.get("secretsmanager").get_secret_value(
                 SecretId=self.service_secret_name
             )
 
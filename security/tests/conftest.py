@@ -1,6 +1,7 @@
 """Common fixtures."""
 
 import pytest
+from open_alchemy.package_security import clients
 
 pytest_plugins = (  # pylint: disable=invalid-name
     "open_alchemy.package_security.pytest_plugin"
@@ -10,3 +11,13 @@ pytest_plugins = (  # pylint: disable=invalid-name
 @pytest.fixture(scope="session", autouse=True)
 def use_service_secret(_service_secret):
     """Automatically use the _service_secret fixture."""
+
+
+@pytest.fixture(autouse=True)
+def clear_clients():
+    """Clears the shared clients before and after each test."""
+    clients.clear()
+
+    yield
+
+    clients.clear()
@@ -0,0 +1,47 @@
+"""Tests for clients."""
+
+from open_alchemy.package_security import clients
+
+
+def test_get():
+    """
+    GIVEN service name
+    WHEN get is called with the service name multiple times
+    THEN the same client is returned which uses the shared configuration.
+    """
+    client = clients.get("s3")
+
+    assert client.meta.service_model.service_name == "s3"
+    assert client.meta.config.connect_timeout == clients.CONFIG.connect_timeout
+    assert client.meta.config.read_timeout == clients.CONFIG.read_timeout
+    assert client.meta.config.retries == clients.CONFIG.retries
+    assert (
+        client.meta.config.max_pool_connections == clients.CONFIG.max_pool_connections
+    )
+    assert clients.get("s3") is client
+
+
+def test_get_different_services():
+    """
+    GIVEN different service names
+    WHEN get is called with each service name
+    THEN different clients are returned.
+    """
+    s3_client = clients.get("s3")
+    secretsmanager_client = clients.get("secretsmanager")
+
+    assert s3_client is not secretsmanager_client
+    assert secretsmanager_client.meta.service_model.service_name == "secretsmanager"
+
+
+def test_clear():
+    """
+    GIVEN client that has been retrieved
+    WHEN clear is called and the client is retrieved again
+    THEN a new client is returned.
+    """
+    client = clients.get("s3")
+
+    clients.clear()
+
+    assert clients.get("s3") is not client
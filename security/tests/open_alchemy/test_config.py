@@ -4,7 +4,7 @@ from unittest import mock
 
 import pytest
 from botocore import stub
-from open_alchemy.package_security import config
+from open_alchemy.package_security import clients, config
 
 SERVICE_SECRET_ERROR_TESTS = [
     pytest.param(None, id="secretsmanager response not dict"),
@@ -26,7 +26,7 @@ def test_service_secret_error(monkeypatch, return_value):
     mock_get_secret_value = mock.MagicMock()
     mock_get_secret_value.return_value = return_value
     monkeypatch.setattr(
-        config._SECRETS_MANAGER_CLIENT, "get_secret_value", mock_get_secret_value
+        clients.get("secretsmanager"), "get_secret_value", mock_get_secret_value
     )
 
     config_instance = config._get()
@@ -44,7 +44,7 @@ def test_service_secret_not_set():
     config_instance = config._get()
     secret_string = "secret string 1"
 
-    stubber = stub.Stubber(config._SECRETS_MANAGER_CLIENT)
+    stubber = stub.Stubber(clients.get("secretsmanager"))
     expected_params = {"SecretId": config_instance.service_secret_name}
     stubber.add_response(
         "get_secret_value", {"SecretString": secret_string}, expected_params
@@ -71,7 +71,7 @@ def test_service_secret_set(monkeypatch):
     service_secret = b"service secret 1"
     mock_get_secret_value = mock.MagicMock()
     monkeypatch.setattr(
-        config._SECRETS_MANAGER_CLIENT, "get_secret_value", mock_get_secret_value
+        clients.get("secretsmanager"), "get_secret_value", mock_get_secret_value
     )
 
     config_instance = config._get()